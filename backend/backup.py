@@ -0,0 +1,167 @@
+"""
+Backup - Cópias de segurança e exportação/restauração em JSON Lines
+A cópia usa a API de backup online do SQLite em passos de poucas páginas,
+então o app continua lendo e gravando enquanto ela roda; o arquivo só
+aparece com o nome final depois de completo.
+
+A exportação grava um registro JSON por linha (labels, conteúdos, revisões e
+preferências) lendo o banco com cursores, e a restauração lê o arquivo com
+um gerador: nenhum dos dois carrega os dados inteiros na memória.
+"""
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from connection_pool import MEMORY
+from importer import iter_json_lines
+
+
+# Páginas copiadas por passo do backup online (páginas de 4 KiB = 1 MiB)
+BACKUP_PAGES_PER_STEP = 256
+# Pausa entre passos, para as escritas do app passarem na frente
+BACKUP_STEP_PAUSE = 0.002
+# Escritas de outras conexões fazem o SQLite recomeçar a cópia; depois de
+# tantos recomeços, o restante é copiado em um passo só
+BACKUP_MAX_RESTARTS = 3
+# Cópias automáticas mantidas em <data_dir>/backups
+BACKUP_KEEP = 7
+
+
+class _BackupRestarted(Exception):
+    """Interrompe a cópia em passos para refazê-la de uma vez."""
+
+
+def backup_dir(db) -> Optional[Path]:
+    """Pasta das cópias automáticas (None para um banco em memória, sem pasta)."""
+    return db.data_dir / 'backups' if db.data_dir is not None else None
+
+
+def latest_backup(db) -> Optional[Path]:
+    """Cópia automática mais recente (ou None)."""
+    folder = backup_dir(db)
+    if folder is None:
+        return None
+    backups = sorted(folder.glob('study_data-*.db'))
+    return backups[-1] if backups else None
+
+
+def backup_database(db, target: Optional[str] = None, pages: int = BACKUP_PAGES_PER_STEP,
+                    progress: Optional[Callable[[int, int], None]] = None,
+                    keep: int = BACKUP_KEEP) -> Dict:
+    """Copia o banco com a API de backup online do SQLite.
+
+    Args:
+        db: DataManager de origem
+        target: Arquivo de destino (padrão: <data_dir>/backups/study_data-<data>.db,
+            mantendo só as `keep` cópias mais recentes; obrigatório para
+            um banco em memória)
+        pages: Páginas por passo
+        progress: Chamado com (páginas copiadas, total) após cada passo
+
+    Returns:
+        {'path', 'bytes', 'pages', 'seconds'} ou {'error': ...}
+    """
+    automatic = target is None
+    if automatic and backup_dir(db) is None:
+        return {'error': 'Banco em memória: informe o arquivo de destino do backup'}
+    if automatic:
+        backup_dir(db).mkdir(parents=True, exist_ok=True)
+        target = backup_dir(db) / f"study_data-{datetime.now().strftime('%Y%m%d-%H%M%S')}.db"
+    target = Path(target)
+    partial = target.with_name(target.name + '.partial')
+
+    started = time.perf_counter()
+    restarts = 0
+    copied = {'remaining': None, 'total': 0}
+
+    def step(status, remaining, total):
+        nonlocal restarts
+        if copied['remaining'] is not None and remaining > copied['remaining']:
+            restarts += 1
+            if restarts > BACKUP_MAX_RESTARTS:
+                raise _BackupRestarted()
+        copied.update(remaining=remaining, total=total)
+        if progress:
+            progress(total - remaining, total)
+        if remaining:
+            time.sleep(BACKUP_STEP_PAUSE)
+
+    try:
+        if db.db_path == MEMORY:
+            # Um sqlite3.connect(':memory:') abriria outro banco, vazio: a
+            # cópia sai de uma conexão do pool (close() a devolve)
+            source = db._pool.acquire()
+        else:
+            source = sqlite3.connect(str(db.db_path))
+        try:
+            dest = sqlite3.connect(str(partial))
+            try:
+                try:
+                    source.backup(dest, pages=pages, progress=step)
+                except _BackupRestarted:
+                    # Em WAL um passo único só segura um snapshot de leitura:
+                    # as escritas do app continuam
+                    source.backup(dest, pages=-1)
+            finally:
+                dest.close()
+        finally:
+            source.close()
+        os.replace(partial, target)
+    except (OSError, sqlite3.Error) as error:
+        partial.unlink(missing_ok=True)
+        return {'error': f'Não foi possível criar o backup: {error}'}
+
+    if automatic:
+        for old in sorted(backup_dir(db).glob('study_data-*.db'))[:-keep]:
+            old.unlink(missing_ok=True)
+
+    return {
+        'path': str(target),
+        'bytes': target.stat().st_size,
+        'pages': copied['total'],
+        'seconds': time.perf_counter() - started
+    }
+
+
+def export_jsonl(db, path: str, progress: Optional[Callable[[int], None]] = None) -> Dict:
+    """Exporta o banco inteiro para JSON Lines (ver DataManager.iter_export_records).
+
+    Grava em um arquivo temporário e renomeia no fim.
+
+    Returns:
+        Contagem de registros por tipo ou {'error': ...}
+    """
+    path = Path(path)
+    partial = path.with_name(path.name + '.partial')
+    counts: Dict[str, int] = {}
+    try:
+        with open(partial, 'w', encoding='utf-8', newline='\n') as file:
+            for record in db.iter_export_records():
+                file.write(json.dumps(record, ensure_ascii=False))
+                file.write('\n')
+                counts[record['type']] = counts.get(record['type'], 0) + 1
+                if progress and sum(counts.values()) % 10000 == 0:
+                    progress(sum(counts.values()))
+        os.replace(partial, path)
+    except (OSError, sqlite3.Error) as error:
+        partial.unlink(missing_ok=True)
+        return {'error': f'Não foi possível exportar: {error}'}
+    return counts
+
+
+def restore_jsonl(db, path: str, chunk_size: int = 5000,
+                  progress: Optional[Callable[[int], None]] = None) -> Dict:
+    """Restaura uma exportação de export_jsonl em um banco vazio.
+
+    Returns:
+        Contagem de registros por tipo ou {'error': ...}
+    """
+    try:
+        with open(path, encoding='utf-8') as file:
+            return db.restore_records(iter_json_lines(file), chunk_size, progress)
+    except (OSError, ValueError) as error:
+        return {'error': f'Não foi possível restaurar: {error}'}
@@ -0,0 +1,739 @@
+"""
+Benchmark - Latência e vazão dos métodos do DataManager e do Backend
+Gera bancos sintéticos em uma pasta temporária (nunca toca no banco real).
+
+Uso:
+    python benchmark.py                               # 1k e 100k conteúdos
+    python benchmark.py --sizes 1000000 --repeat 20   # banco grande
+    python benchmark.py --json atual.json             # salva os resultados
+    python benchmark.py --compare base.json           # aponta regressões
+    python benchmark.py --migration --sizes 1000000   # migração de um banco antigo
+    python benchmark.py --startup --sizes 100000      # abertura do app (processo novo)
+    python benchmark.py --backup --sizes 200000       # backup, exportação e restauração
+    python benchmark.py --payload --sizes 100000      # tamanho das respostas (lista x colunar)
+    python benchmark.py --engines --sizes 10000       # SQLite (arquivo e memória) x MemoryStorage
+
+Leituras do DataManager são medidas com o cache limpo (custo do SQLite);
+as do Backend passam pelo cache, como no app.
+"""
+import argparse
+import json
+import random
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import backup
+import columnar
+import migrations
+from data_manager import DataManager
+from encoding import sql_date, to_day
+from main import Backend
+from scheduler import SCHEDULERS, LoadBalancer
+from storage import MemoryStorage, Storage
+
+
+REVIEW_TYPES = ['next_day', 'one_week', 'one_month', 'three_months']
+
+WORDS = [
+    'Equação', 'Função', 'Matriz', 'Vetor', 'Limite', 'Derivada', 'Integral',
+    'Célula', 'Genética', 'Ecologia', 'Newton', 'Óptica', 'Ondas', 'Átomo',
+    'Ligação', 'Reação', 'Revolução', 'Império', 'República', 'Clima', 'Relevo',
+    'Verbo', 'Sintaxe', 'Crase', 'Barroco', 'Modernismo', 'Probabilidade',
+]
+
+
+# ==================== GERAÇÃO ====================
+
+def generate_database(data_dir: Path, contents: int, labels: int = 20, days: int = 365,
+                      completion: float = 0.8, seed: int = 42) -> Backend:
+    """Cria um banco sintético e retorna um Backend apontando para ele.
+
+    Args:
+        data_dir: Pasta do banco
+        contents: Quantidade de conteúdos
+        labels: Quantidade de labels
+        days: Conteúdos são criados ao longo dos últimos `days` dias
+        completion: Fração das revisões já vencidas que foram completadas
+        seed: Semente (bancos com os mesmos parâmetros são idênticos)
+    """
+    backend = Backend(data_dir)
+    backend._cancel_timers()  # Arquivamento e backup só quando um caso medir isso
+    rng = random.Random(seed)
+    now = datetime.now()
+
+    def items():
+        for i in range(contents):
+            created_at = now - timedelta(seconds=rng.random() * days * 86400)
+            yield {
+                'title': f'{rng.choice(WORDS)} {rng.choice(WORDS)} {i}',
+                'label': f'Label {i % labels}',
+                'created_at': created_at.isoformat()
+            }
+
+    backend.db.create_contents_bulk(items(), chunk_size=5000)
+
+    # Revisões já vencidas são completadas com probabilidade `completion`
+    # (hash determinístico do id, para o banco ser reproduzível)
+    conn = backend.db._get_connection()
+    conn.execute(f'''
+        UPDATE reviews
+        SET completed = 1, completed_at = {sql_date('scheduled_day')} || 'T20:00:00'
+        WHERE scheduled_day < ? AND (id * 2654435761) % 1000 < ?
+    ''', (to_day(now), int(completion * 1000)))
+    conn.commit()
+    conn.close()
+    backend.db._cache.clear()
+
+    return backend
+
+
+# Esquema da versão 0 (antes das migrações): datas ISO e tipos em texto
+LEGACY_SCHEMA = '''
+    CREATE TABLE labels (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL UNIQUE,
+        color TEXT NOT NULL,
+        created_at TEXT NOT NULL
+    );
+    CREATE TABLE contents (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        label_id INTEGER NOT NULL,
+        created_at TEXT NOT NULL,
+        FOREIGN KEY (label_id) REFERENCES labels(id)
+    );
+    CREATE TABLE reviews (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        content_id INTEGER NOT NULL,
+        review_type TEXT NOT NULL,
+        scheduled_date TEXT NOT NULL,
+        completed INTEGER DEFAULT 0,
+        completed_at TEXT,
+        FOREIGN KEY (content_id) REFERENCES contents(id) ON DELETE CASCADE
+    );
+    CREATE INDEX idx_reviews_date ON reviews(scheduled_date, completed);
+    CREATE INDEX idx_reviews_content ON reviews(content_id);
+'''
+
+
+def generate_legacy_database(data_dir: Path, contents: int, labels: int = 20, days: int = 365,
+                             completion: float = 0.8, seed: int = 42) -> Path:
+    """Cria um banco no esquema da versão 0 e retorna o caminho do arquivo.
+
+    Mesmos parâmetros de generate_database; as revisões seguem as mesmas
+    regras de agendamento do app.
+    """
+    data_dir.mkdir(parents=True, exist_ok=True)
+    db_path = data_dir / 'study_data.db'
+    rng = random.Random(seed)
+    now = datetime.now()
+    today = now.date().isoformat()
+    offsets = (('next_day', 1), ('one_week', 7), ('one_month', 30), ('three_months', 90))
+
+    def content_rows():
+        for i in range(contents):
+            created_at = now - timedelta(seconds=rng.random() * days * 86400)
+            yield (i + 1, f'{rng.choice(WORDS)} {rng.choice(WORDS)} {i}', i % labels + 1,
+                   created_at.isoformat())
+
+    def review_rows():
+        review_id = 0
+        for content_id, _, _, created_at in content_rows():
+            created = datetime.fromisoformat(created_at)
+            for review_type, offset in offsets:
+                review_id += 1
+                scheduled = (created + timedelta(days=offset)).date().isoformat()
+                done = scheduled < today and (review_id * 2654435761) % 1000 < completion * 1000
+                yield (review_id, content_id, review_type, scheduled, int(done),
+                       f'{scheduled}T20:00:00' if done else None)
+
+    conn = sqlite3.connect(db_path)
+    conn.executescript(LEGACY_SCHEMA)
+    conn.executemany(
+        'INSERT INTO labels (id, name, color, created_at) VALUES (?, ?, ?, ?)',
+        ((i + 1, f'Label {i}', '#123456', now.isoformat()) for i in range(labels))
+    )
+    conn.executemany('INSERT INTO contents (id, title, label_id, created_at) VALUES (?, ?, ?, ?)',
+                     content_rows())
+    rng.seed(seed)  # review_rows percorre os mesmos conteúdos de novo
+    conn.executemany(
+        'INSERT INTO reviews (id, content_id, review_type, scheduled_date, completed, completed_at) '
+        'VALUES (?, ?, ?, ?, ?, ?)',
+        review_rows()
+    )
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+# ==================== MEDIÇÃO ====================
+
+def percentile(samples: List[float], q: float) -> float:
+    """Percentil por vizinho mais próximo de uma lista ordenada."""
+    return samples[min(len(samples) - 1, round(q * (len(samples) - 1)))]
+
+
+def measure(run: Callable[[], object], setup: Optional[Callable[[], None]] = None,
+            repeat: int = 50, budget: float = 2.0) -> Dict:
+    """Executa `run` até `repeat` vezes (ou até estourar `budget` segundos).
+
+    `setup` roda antes de cada execução, fora da medição.
+
+    Returns:
+        {'calls', 'p50_ms', 'p99_ms', 'ops_per_sec'}
+    """
+    samples = []
+    started = time.perf_counter()
+    while len(samples) < repeat:
+        if setup:
+            setup()
+        t0 = time.perf_counter()
+        run()
+        samples.append(time.perf_counter() - t0)
+        if len(samples) >= 3 and time.perf_counter() - started > budget:
+            break
+
+    samples.sort()
+    total = sum(samples)
+    return {
+        'calls': len(samples),
+        'p50_ms': percentile(samples, 0.50) * 1000,
+        'p99_ms': percentile(samples, 0.99) * 1000,
+        'ops_per_sec': len(samples) / total if total else float('inf')
+    }
+
+
+def build_cases(backend: Backend, seed: int = 7) -> List[tuple]:
+    """Monta a lista de (nome, run, setup) cobrindo DataManager e Backend."""
+    db = backend.db
+    rng = random.Random(seed)
+
+    today = datetime.now().date()
+    month_start = today.replace(day=1).isoformat()
+    month_end = (today.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+    month_end = month_end.isoformat()
+
+    label_ids = [label['id'] for label in db.get_all_labels()]
+    stats = db.get_statistics()
+    max_content = max(stats['total_contents'], 1)
+    first_page = db.list_contents(limit=50)
+    cursor = first_page.get('next_cursor')
+    # Sincronização típica: as últimas ~200 alterações
+    recent_version = max(db.get_changes_since(0)['version'] - 200, 0)
+
+    counter = iter(range(10 ** 9))
+    created_contents = []
+    created_labels = []
+
+    def random_content():
+        return rng.randint(1, max_content)
+
+    def random_date():
+        return (today + timedelta(days=rng.randint(-120, 90))).isoformat()
+
+    def new_content():
+        content = db.create_content(f'Benchmark {next(counter)}', rng.choice(label_ids))
+        created_contents.append(content['id'])
+
+    def new_label():
+        label = db.create_label(f'Benchmark {next(counter)}', '#123456')
+        created_labels.append(label['id'])
+
+    def delete_created_content():
+        if created_contents:
+            db.delete_content(created_contents.pop())
+
+    def delete_created_label():
+        if created_labels:
+            db.delete_label(created_labels.pop())
+
+    def bulk_100():
+        db.create_contents_bulk(
+            {'title': f'Bulk {next(counter)}', 'label_id': rng.choice(label_ids)}
+            for _ in range(100)
+        )
+
+    def bulk_100_balanced():
+        db.load_balancer = LoadBalancer(daily_cap=50)
+        try:
+            bulk_100()
+        finally:
+            db.load_balancer = None
+
+    def random_pairs(count=80):
+        return [[random_content(), rng.choice(REVIEW_TYPES)] for _ in range(count)]
+
+    # Cliques simultâneos: 64 chamadas vindas de 16 threads, como o pywebview faz
+    pool = ThreadPoolExecutor(max_workers=16)
+
+    def concurrently(call, calls=64):
+        list(pool.map(lambda _: call(random_content(), rng.choice(REVIEW_TYPES)), range(calls)))
+
+    def flip_scheduler():
+        # Alterna entre fixo e SM-2 para que todo reagendamento grave as datas
+        db.scheduler = SCHEDULERS['sm2' if db.scheduler.name == 'fixed' else 'fixed']
+
+    clear = db._cache.clear
+
+    return [
+        # Leituras sem cache (custo do SQLite)
+        ('DataManager.get_all_labels', db.get_all_labels, clear),
+        ('DataManager.get_all_contents', db.get_all_contents, clear),
+        ('DataManager.list_contents', lambda: db.list_contents(limit=50), clear),
+        ('DataManager.list_contents[cursor]', lambda: db.list_contents(cursor=cursor, limit=50), clear),
+        ('DataManager.list_contents[label]',
+         lambda: db.list_contents(limit=50, label_id=rng.choice(label_ids)), clear),
+        ('DataManager.get_content_by_id', lambda: db.get_content_by_id(random_content()), clear),
+        ('DataManager.search_contents', lambda: db.search_contents(rng.choice(WORDS)[:4]), None),
+        ('DataManager.get_reviews_by_date', lambda: db.get_reviews_by_date(random_date()), None),
+        ('DataManager.get_reviews_by_range', lambda: db.get_reviews_by_range(month_start, month_end), None),
+        ('DataManager.get_review_summary', lambda: db.get_review_summary(month_start, month_end), None),
+        ('DataManager.get_statistics', db.get_statistics, None),
+        ('DataManager.get_changes_since', lambda: db.get_changes_since(recent_version), None),
+        ('DataManager.get_review_forecast[90]', lambda: db.get_review_forecast(90), None),
+        # Escritas
+        ('DataManager.create_label', new_label, None),
+        ('DataManager.update_label',
+         lambda: db.update_label(created_labels[-1], f'Renomeada {next(counter)}', '#654321'), None),
+        ('DataManager.delete_label', delete_created_label, None),
+        ('DataManager.create_content', new_content, None),
+        ('DataManager.create_contents_bulk[100]', bulk_100, None),
+        ('DataManager.create_contents_bulk[100, balanced]', bulk_100_balanced, None),
+        ('DataManager.update_content',
+         lambda: db.update_content(created_contents[-1], f'Editado {next(counter)}', rng.choice(label_ids)),
+         None),
+        ('DataManager.delete_content', delete_created_content, None),
+        ('DataManager.mark_review_completed',
+         lambda: db.mark_review_completed(random_content(), rng.choice(REVIEW_TYPES)), None),
+        ('DataManager.unmark_review_completed',
+         lambda: db.unmark_review_completed(random_content(), rng.choice(REVIEW_TYPES)), None),
+        ('DataManager.mark_reviews_completed[80]', lambda: db.mark_reviews_completed(random_pairs()), None),
+        ('DataManager.unmark_reviews_completed[80]', lambda: db.unmark_reviews_completed(random_pairs()), None),
+        ('DataManager.mark_reviews_completed_by_date',
+         lambda: db.mark_reviews_completed_by_date(random_date()), None),
+        ('DataManager.unmark_reviews_completed_by_date',
+         lambda: db.unmark_reviews_completed_by_date(random_date()), None),
+        ('DataManager.mark_review_completed[64x16 threads]',
+         lambda: concurrently(db.mark_review_completed), None),
+        ('DataManager.compact_change_log', db.compact_change_log, None),
+        ('DataManager.reschedule_reviews', db.reschedule_reviews, flip_scheduler),
+        # Backend (com cache, como o app usa)
+        ('Backend.get_labels', backend.get_labels, None),
+        ('Backend.get_contents', backend.get_contents, None),
+        ('Backend.get_contents_page', lambda: backend.get_contents_page(None, 50), None),
+        ('Backend.get_content', lambda: backend.get_content(random_content()), None),
+        ('Backend.search_contents', lambda: backend.search_contents(rng.choice(WORDS)[:4]), None),
+        ('Backend.get_reviews_today', backend.get_reviews_today, None),
+        ('Backend.get_reviews_by_date', lambda: backend.get_reviews_by_date(random_date()), None),
+        ('Backend.get_reviews_by_range', lambda: backend.get_reviews_by_range(month_start, month_end), None),
+        ('Backend.get_review_summary', lambda: backend.get_review_summary(month_start, month_end), None),
+        ('Backend.get_statistics', backend.get_statistics, None),
+        ('Backend.get_cache_stats', backend.get_cache_stats, None),
+        ('Backend.get_import_progress', backend.get_import_progress, None),
+        ('Backend.get_changes_since', lambda: backend.get_changes_since(recent_version), None),
+        ('Backend.get_schedulers', backend.get_schedulers, None),
+        ('Backend.get_review_forecast', backend.get_review_forecast, None),
+        ('Backend.create_label',
+         lambda: created_labels.append(backend.create_label(f'Backend {next(counter)}', '#ABCDEF')['id']),
+         None),
+        ('Backend.update_label',
+         lambda: backend.update_label(created_labels[-1], f'Backend {next(counter)}', '#FEDCBA'), None),
+        ('Backend.delete_label', lambda: created_labels and backend.delete_label(created_labels.pop()), None),
+        ('Backend.create_content',
+         lambda: created_contents.append(
+             backend.create_content(f'Backend {next(counter)}', rng.choice(label_ids))['id']
+         ), None),
+        ('Backend.import_contents',
+         lambda: backend.import_contents([
+             {'title': f'Import {next(counter)}', 'label_id': rng.choice(label_ids)} for _ in range(100)
+         ]), None),
+        ('Backend.update_content',
+         lambda: backend.update_content(created_contents[-1], f'Backend {next(counter)}', rng.choice(label_ids)),
+         None),
+        ('Backend.delete_content',
+         lambda: created_contents and backend.delete_content(created_contents.pop()), None),
+        ('Backend.mark_review_completed',
+         lambda: backend.mark_review_completed(random_content(), rng.choice(REVIEW_TYPES)), None),
+        ('Backend.unmark_review_completed',
+         lambda: backend.unmark_review_completed(random_content(), rng.choice(REVIEW_TYPES)), None),
+        ('Backend.mark_review_completed[64x16 threads]',
+         lambda: concurrently(backend.mark_review_completed), None),
+        ('Backend.mark_reviews_completed[80]', lambda: backend.mark_reviews_completed(random_pairs()), None),
+        ('Backend.unmark_reviews_completed[80]', lambda: backend.unmark_reviews_completed(random_pairs()), None),
+        ('Backend.mark_reviews_completed_by_date',
+         lambda: backend.mark_reviews_completed_by_date(random_date()), None),
+        ('Backend.unmark_reviews_completed_by_date',
+         lambda: backend.unmark_reviews_completed_by_date(random_date()), None),
+        # Por último: arquivar muda o tamanho das tabelas ativas para os casos seguintes
+        ('DataManager.archive_completed', db.archive_completed, None),
+        ('DataManager.get_all_contents[archived]', db.get_all_contents, clear),
+        ('DataManager.get_all_contents[include_archived]',
+         lambda: db.get_all_contents(include_archived=True), clear),
+        ('DataManager.get_reviews_by_range[archived]',
+         lambda: db.get_reviews_by_range(month_start, month_end), None),
+    ]
+
+
+def run_benchmark(size: int, repeat: int, budget: float, workdir: Path) -> Dict[str, Dict]:
+    """Gera um banco de `size` conteúdos e mede todos os casos."""
+    data_dir = workdir / f'db_{size}'
+
+    t0 = time.perf_counter()
+    backend = generate_database(data_dir, size)
+    elapsed = time.perf_counter() - t0
+    print(f'\n== {size:,} conteúdos (gerado em {elapsed:.1f}s) ==')
+
+    results = {}
+    try:
+        for name, run, setup in build_cases(backend):
+            results[name] = measure(run, setup, repeat, budget)
+            print_row(name, results[name])
+    finally:
+        backend._shutdown()
+    return results
+
+
+def _reviews_bytes(db_path: Path) -> Optional[int]:
+    """Bytes ocupados por reviews e idx_reviews_date (None sem o dbstat)."""
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute('VACUUM')
+        return conn.execute(
+            "SELECT SUM(pgsize) FROM dbstat WHERE name IN ('reviews', 'idx_reviews_date')"
+        ).fetchone()[0]
+    except sqlite3.OperationalError:
+        return None
+    finally:
+        conn.close()
+
+
+def run_migration_benchmark(size: int, workdir: Path) -> Dict:
+    """Mede a migração de um banco da versão 0 com `size` conteúdos."""
+    data_dir = workdir / f'legacy_{size}'
+    db_path = generate_legacy_database(data_dir, size)
+    bytes_before = _reviews_bytes(db_path)
+
+    conn = sqlite3.connect(db_path)
+    t0 = time.perf_counter()
+    migrations.migrate(conn)
+    migrate_s = time.perf_counter() - t0
+    conn.close()
+
+    # Primeira abertura depois da migração: índices, estatísticas e busca
+    t0 = time.perf_counter()
+    DataManager(data_dir).close()
+    open_s = time.perf_counter() - t0
+
+    result = {
+        'reviews': size * 4,
+        'migrate_s': migrate_s,
+        'first_open_s': open_s,
+        'reviews_per_sec': size * 4 / migrate_s if migrate_s else float('inf'),
+        'bytes_before': bytes_before,
+        'bytes_after': _reviews_bytes(db_path),
+    }
+    print(f"\n== migração de {size:,} conteúdos ({result['reviews']:,} revisões) ==")
+    print(f"migração {migrate_s:.2f}s ({result['reviews_per_sec']:,.0f} revisões/s), "
+          f"primeira abertura {open_s:.2f}s")
+    if bytes_before and result['bytes_after']:
+        print(f"reviews + idx_reviews_date: {bytes_before / 2**20:.1f} MB -> "
+              f"{result['bytes_after'] / 2**20:.1f} MB")
+    return result
+
+
+# Roda em um processo novo: do início do processo até a primeira resposta
+# de get_statistics, como na abertura do app (sem a janela)
+STARTUP_SCRIPT = '''
+import json, sys, time
+spawned, data_dir = float(sys.argv[1]), sys.argv[2]
+t0 = time.time()
+from main import Backend
+t1 = time.time()
+backend = Backend(data_dir)
+t2 = time.time()
+backend.get_statistics()
+t3 = time.time()
+backend._shutdown()
+print(json.dumps({
+    'interpreter_ms': (t0 - spawned) * 1000,
+    'import_ms': (t1 - t0) * 1000,
+    'backend_ms': (t2 - t1) * 1000,
+    'first_stats_ms': (t3 - t2) * 1000,
+    'total_ms': (t3 - spawned) * 1000,
+}))
+'''
+
+
+def measure_startup(data_dir: Path) -> Dict:
+    """Abre o app em um processo novo e retorna os tempos de cada etapa."""
+    completed = subprocess.run(
+        [sys.executable, '-c', STARTUP_SCRIPT, repr(time.time()), str(data_dir)],
+        cwd=Path(__file__).parent, capture_output=True, text=True, check=True
+    )
+    return json.loads(completed.stdout)
+
+
+def run_startup_benchmark(size: int, repeat: int, workdir: Path) -> Dict:
+    """Mede a primeira abertura (cria o banco) e aberturas seguintes (banco pronto)."""
+    results = {'cold': measure_startup(workdir / f'startup_empty_{size}')}
+
+    data_dir = workdir / f'startup_{size}'
+    generate_database(data_dir, size)._shutdown()
+    runs = [measure_startup(data_dir) for _ in range(max(repeat, 1))]
+    results['warm'] = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+
+    print(f'\n== abertura com {size:,} conteúdos (mediana de {len(runs)}) ==')
+    for name, timings in results.items():
+        print(f"{name:<5} total {timings['total_ms']:7.1f} ms | interpretador "
+              f"{timings['interpreter_ms']:6.1f} | imports {timings['import_ms']:6.1f} | "
+              f"Backend() {timings['backend_ms']:6.1f} | 1º get_statistics {timings['first_stats_ms']:6.1f}")
+    return results
+
+
+def run_backup_benchmark(size: int, workdir: Path) -> Dict:
+    """Mede backup online (com escritas concorrentes), exportação e restauração."""
+    backend = generate_database(workdir / f'backup_{size}', size)
+    db = backend.db
+    label_id = db.get_all_labels()[0]['id']
+    results = {}
+    try:
+        # Latência das escritas do app enquanto o backup copia o banco
+        latencies = []
+        stop = threading.Event()
+
+        def write():
+            while not stop.is_set():
+                t0 = time.perf_counter()
+                backend.create_content('Durante o backup', label_id)
+                latencies.append(time.perf_counter() - t0)
+                time.sleep(0.005)
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        try:
+            results['backup'] = backup.backup_database(db, workdir / f'backup_{size}.db')
+        finally:
+            stop.set()
+            writer.join()
+        latencies.sort()
+        results['backup']['writes'] = len(latencies)
+        results['backup']['write_p99_ms'] = percentile(latencies, 0.99) * 1000 if latencies else 0.0
+
+        export_path = workdir / f'export_{size}.jsonl'
+        t0 = time.perf_counter()
+        results['export'] = backup.export_jsonl(db, export_path)
+        results['export_seconds'] = time.perf_counter() - t0
+        results['export_bytes'] = export_path.stat().st_size
+    finally:
+        backend._shutdown()
+
+    target = DataManager(workdir / f'restore_{size}')
+    t0 = time.perf_counter()
+    results['restore'] = backup.restore_jsonl(target, export_path)
+    results['restore_seconds'] = time.perf_counter() - t0
+    target.close()
+
+    mb = results['backup']['bytes'] / 2 ** 20
+    print(f'\n== backup/exportação com {size:,} conteúdos ==')
+    print(f"backup     {results['backup']['seconds']:6.2f} s ({mb:.0f} MB) | "
+          f"{results['backup']['writes']} escritas durante, p99 {results['backup']['write_p99_ms']:.1f} ms")
+    print(f"exportação {results['export_seconds']:6.2f} s ({results['export_bytes'] / 2 ** 20:.0f} MB)")
+    print(f"restauração {results['restore_seconds']:5.2f} s ({results['restore']})")
+    return results
+
+
+def run_payload_benchmark(size: int, workdir: Path) -> Dict:
+    """Compara o JSON das listagens grandes em lista de dicts e no formato colunar."""
+    backend = generate_database(workdir / f'payload_{size}', size)
+    today = datetime.now().date()
+    calls = {
+        'get_contents': lambda fmt: backend.get_contents(False, fmt),
+        'get_reviews_by_range (30 dias)': lambda fmt: backend.get_reviews_by_range(
+            today.isoformat(), (today + timedelta(days=30)).isoformat(), fmt
+        ),
+    }
+    results = {}
+    print(f'\n== respostas com {size:,} conteúdos ==')
+    try:
+        for name, call in calls.items():
+            entry = {}
+            call(False)  # Aquece o cache do DataManager (get_contents guarda as duas formas)
+            call(True)
+            for fmt in (False, True):
+                t0 = time.perf_counter()
+                text = json.dumps(call(fmt))  # O pywebview serializa com json.dumps
+                encode_seconds = time.perf_counter() - t0
+                # Só o parse: na UI, decodeColumnar roda depois do JSON.parse
+                t0 = time.perf_counter()
+                payload = json.loads(text)
+                parse_seconds = time.perf_counter() - t0
+                rows = columnar.decode_rows(payload) if fmt else payload
+                entry['columnar' if fmt else 'rows'] = {
+                    'bytes': len(text.encode('utf-8')),
+                    'encode_ms': encode_seconds * 1000,
+                    'parse_ms': parse_seconds * 1000,
+                    'items': len(rows)
+                }
+            results[name] = entry
+            plain, packed = entry['rows'], entry['columnar']
+            print(f"{name:<32} {plain['items']:>8} itens | "
+                  f"{plain['bytes'] / 2 ** 20:7.2f} MB -> {packed['bytes'] / 2 ** 20:6.2f} MB "
+                  f"({plain['bytes'] / max(packed['bytes'], 1):.1f}x) | "
+                  f"gerar {plain['encode_ms']:.0f} -> {packed['encode_ms']:.0f} ms | "
+                  f"parse {plain['parse_ms']:.0f} -> {packed['parse_ms']:.0f} ms")
+    finally:
+        backend._shutdown()
+    return results
+
+
+# Armazenamentos comparados por --engines
+ENGINES: Dict[str, Callable[[Path], Storage]] = {
+    'sqlite': lambda data_dir: DataManager(data_dir),
+    'sqlite-memory': lambda data_dir: DataManager(':memory:'),
+    'memory': lambda data_dir: MemoryStorage(),
+}
+
+
+def run_engine_benchmark(size: int, repeat: int, budget: float, workdir: Path) -> Dict[str, Dict]:
+    """Mede os métodos da interface Storage em cada armazenamento de ENGINES.
+
+    Os dados entram pela própria interface (create_content um a um), com
+    as datas de criação de hoje; as leituras do DataManager são medidas
+    com o cache limpo.
+    """
+    rng = random.Random(7)
+    today = datetime.now().date()
+    results = {}
+    for engine, factory in ENGINES.items():
+        storage = factory(workdir / f'engine_{engine}_{size}')
+        try:
+            t0 = time.perf_counter()
+            labels = [storage.create_label(f'Label {i}', '#6B7280')['id'] for i in range(20)]
+            ids = [
+                storage.create_content(f'{rng.choice(WORDS)} {i}', rng.choice(labels))['id']
+                for i in range(size)
+            ]
+            print(f'\n== {engine}: {size:,} conteúdos (gerado em {time.perf_counter() - t0:.1f}s) ==')
+
+            setup = storage._cache.clear if isinstance(storage, DataManager) else None
+            cases = [
+                ('get_statistics', storage.get_statistics),
+                ('get_reviews_by_date (amanhã)',
+                 lambda: storage.get_reviews_by_date((today + timedelta(days=1)).isoformat())),
+                ('get_reviews_by_range (30 dias)',
+                 lambda: storage.get_reviews_by_range(today.isoformat(), (today + timedelta(days=30)).isoformat())),
+                ('get_review_summary (90 dias)',
+                 lambda: storage.get_review_summary(today.isoformat(), (today + timedelta(days=90)).isoformat())),
+                ('get_content_by_id', lambda: storage.get_content_by_id(rng.choice(ids))),
+                ('mark/unmark_review_completed', lambda: _toggle_review(storage, rng.choice(ids))),
+                ('get_all_contents', storage.get_all_contents),
+            ]
+            for name, run in cases:
+                key = f'{engine}.{name}'
+                results[key] = measure(run, setup, repeat, budget)
+                print_row(key, results[key])
+        finally:
+            storage.close()
+    return results
+
+
+def _toggle_review(storage: Storage, content_id: int):
+    storage.mark_review_completed(content_id, 'one_week')
+    storage.unmark_review_completed(content_id, 'one_week')
+
+
+# ==================== RELATÓRIO ====================
+
+def print_row(name: str, result: Dict):
+    """Imprime uma linha da tabela de resultados."""
+    print(f"{name:<44} {result['calls']:>5} {result['p50_ms']:>10.3f} "
+          f"{result['p99_ms']:>10.3f} {result['ops_per_sec']:>12.1f}")
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Lista os casos cujo p50 piorou mais que `tolerance` em relação à base."""
+    regressions = []
+    for size, cases in current.items():
+        for name, result in cases.items():
+            base = baseline.get(size, {}).get(name)
+            if base and result['p50_ms'] > base['p50_ms'] * (1 + tolerance):
+                regressions.append(
+                    f"{size} {name}: p50 {base['p50_ms']:.3f}ms -> {result['p50_ms']:.3f}ms"
+                )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark do backend do MethodJS')
+    parser.add_argument('--sizes', default='1000,100000',
+                        help='Tamanhos dos bancos (conteúdos), separados por vírgula')
+    parser.add_argument('--repeat', type=int, default=50, help='Execuções por caso')
+    parser.add_argument('--budget', type=float, default=2.0,
+                        help='Tempo máximo (s) por caso; mínimo de 3 execuções')
+    parser.add_argument('--json', help='Salva os resultados neste arquivo')
+    parser.add_argument('--compare', help='Compara com resultados salvos e falha se houver regressão')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Piora relativa do p50 tolerada no --compare')
+    parser.add_argument('--keep', action='store_true', help='Não apaga os bancos gerados')
+    parser.add_argument('--migration', action='store_true',
+                        help='Mede a migração de bancos da versão 0 em vez dos métodos')
+    parser.add_argument('--backup', action='store_true',
+                        help='Mede backup online, exportação e restauração')
+    parser.add_argument('--payload', action='store_true',
+                        help='Compara o tamanho das listagens em lista de dicts e colunar')
+    parser.add_argument('--engines', action='store_true',
+                        help='Compara os armazenamentos da interface Storage (SQLite e memória)')
+    parser.add_argument('--startup', action='store_true',
+                        help='Mede a abertura do app (processo novo até o 1º get_statistics)')
+    args = parser.parse_args(argv)
+
+    workdir = Path(tempfile.mkdtemp(prefix='methodjs_bench_'))
+    special = args.migration or args.startup or args.backup or args.payload
+    if not special:
+        print(f"{'método':<44} {'n':>5} {'p50 (ms)':>10} {'p99 (ms)':>10} {'ops/s':>12}")
+
+    results = {}
+    try:
+        for size in (int(s) for s in args.sizes.split(',')):
+            if args.migration:
+                results[str(size)] = run_migration_benchmark(size, workdir)
+            elif args.backup:
+                results[str(size)] = run_backup_benchmark(size, workdir)
+            elif args.startup:
+                results[str(size)] = run_startup_benchmark(size, args.repeat, workdir)
+            elif args.payload:
+                results[str(size)] = run_payload_benchmark(size, workdir)
+            elif args.engines:
+                results[str(size)] = run_engine_benchmark(size, args.repeat, args.budget, workdir)
+            else:
+                results[str(size)] = run_benchmark(size, args.repeat, args.budget, workdir)
+    finally:
+        if args.keep:
+            print(f'\nBancos mantidos em {workdir}')
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2), encoding='utf-8')
+
+    if args.compare and not special:
+        baseline = json.loads(Path(args.compare).read_text(encoding='utf-8'))
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f'REGRESSÃO {line}')
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+Cache - Cache LRU em memória para leituras do DataManager
+As chaves são tuplas cujo primeiro item é o namespace (ex.: ('content', 42)),
+o que permite invalidar uma entrada ou um namespace inteiro.
+"""
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Tuple, TypeVar
+
+
+T = TypeVar('T')
+
+
+class LRUCache:
+    """Cache LRU thread-safe com contadores de acerto/erro.
+
+    Os valores são compartilhados entre chamadas: quem lê não deve modificá-los.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        """Cria o cache.
+
+        Args:
+            maxsize: Quantidade máxima de entradas antes de descartar a menos usada
+        """
+        self.maxsize = maxsize
+        self._data: 'OrderedDict[Tuple[Hashable, ...], object]' = OrderedDict()
+        self._lock = threading.Lock()
+        # Incrementada a cada invalidação: uma leitura que começou antes de
+        # uma escrita não pode gravar no cache um valor já desatualizado
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_load(self, key: Tuple[Hashable, ...], loader: Callable[[], T]) -> T:
+        """Retorna o valor em cache ou o carrega com `loader` e guarda.
+
+        Valores None não são guardados (ex.: conteúdo inexistente).
+        """
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            generation = self._generation
+
+        value = loader()
+
+        if value is not None:
+            with self._lock:
+                if generation == self._generation:
+                    self._data[key] = value
+                    self._data.move_to_end(key)
+                    while len(self._data) > self.maxsize:
+                        self._data.popitem(last=False)
+                        self.evictions += 1
+        return value
+
+    def invalidate(self, *keys: Tuple[Hashable, ...]):
+        """Remove entradas específicas."""
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                self._data.pop(key, None)
+
+    def invalidate_namespace(self, *namespaces: str):
+        """Remove todas as entradas dos namespaces informados."""
+        with self._lock:
+            self._generation += 1
+            for key in [key for key in self._data if key[0] in namespaces]:
+                del self._data[key]
+
+    def clear(self):
+        """Remove todas as entradas."""
+        with self._lock:
+            self._generation += 1
+            self._data.clear()
+
+    def stats(self) -> Dict:
+        """Retorna os contadores do cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
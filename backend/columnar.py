@@ -0,0 +1,173 @@
+"""
+Columnar - Formato colunar compacto para listas grandes enviadas à UI
+Em uma lista de dicts, a maior parte do JSON que o pywebview serializa são
+os nomes das chaves, repetidos em cada linha (e em cada revisão aninhada).
+Aqui a lista vira um array por coluna, com os nomes uma vez só:
+
+    {
+        'format': 'columnar/1',
+        'length': 2,
+        'columns': ['id', 'title', 'label', 'reviews.next_day.scheduled_date', ...],
+        'data': [[7, 6], ['Derivadas', 'Limites'], [0, 0], [19733, -1], ...],
+        'labels': [[3, 'Matemática', '#FF0000']],
+        'deltas': ['reviews.next_day.scheduled_date'],
+        'enums': {},
+        'optional': ['archived'],
+        'missing': {}
+    }
+
+- Dicts aninhados viram colunas com o caminho separado por '.'.
+- label_id, label_name e label_color viram a coluna 'label', um índice na
+  tabela 'labels' (cada label aparece uma vez).
+- Datas (YYYY-MM-DD) em 'deltas' viram dias desde 1970-01-01: o primeiro
+  valor é absoluto e os seguintes, a diferença para o anterior não nulo.
+- Textos de poucos valores (review_type) viram índices na lista de 'enums'.
+- Em 'optional', null significa chave ausente na linha; em 'missing' estão
+  as linhas sem a chave nas colunas que também têm null de verdade.
+
+O decodificador da UI é decodeColumnar em src/lib/api.ts; decode_rows faz o
+mesmo em Python (testes e benchmark).
+"""
+from typing import Dict, List, Optional
+
+from encoding import from_day, to_day
+
+
+FORMAT = 'columnar/1'
+
+# Chaves trocadas pela coluna 'label'
+LABEL_KEYS = ('label_id', 'label_name', 'label_color')
+
+# Campos de data (sem hora) codificados como diferença de dias
+DATE_FIELDS = frozenset({'scheduled_date'})
+
+# Campos de poucos valores distintos, trocados por índices
+ENUM_FIELDS = frozenset({'review_type'})
+
+_ABSENT = object()
+
+
+def encode_rows(rows: List[Dict]) -> Dict:
+    """Codifica uma lista de dicts no formato colunar (ver o docstring do módulo)."""
+    flat = [_flatten(row) for row in rows]
+
+    labels: List[list] = []
+    label_index: Dict[tuple, int] = {}
+    if any(LABEL_KEYS[0] in row for row in flat):
+        for row in flat:
+            if LABEL_KEYS[0] not in row:
+                continue
+            key = tuple(row.pop(name, None) for name in LABEL_KEYS)
+            if key not in label_index:
+                label_index[key] = len(labels)
+                labels.append(list(key))
+            row['label'] = label_index[key]
+
+    columns: Dict[str, None] = {}  # Ordem da primeira aparição
+    for row in flat:
+        columns.update(dict.fromkeys(row))
+
+    data = []
+    deltas = []
+    enums = {}
+    optional = []
+    missing = {}
+    for name in columns:
+        values = [row.get(name, _ABSENT) for row in flat]
+        absent = [index for index, value in enumerate(values) if value is _ABSENT]
+        if absent:
+            if any(value is None for value in values):
+                missing[name] = absent
+            else:
+                optional.append(name)
+            values = [None if value is _ABSENT else value for value in values]
+        if name.rsplit('.', 1)[-1] in DATE_FIELDS:
+            values = _delta_encode(values)
+            deltas.append(name)
+        elif name.rsplit('.', 1)[-1] in ENUM_FIELDS:
+            table = list(dict.fromkeys(value for value in values if value is not None))
+            positions = {value: index for index, value in enumerate(table)}
+            values = [None if value is None else positions[value] for value in values]
+            enums[name] = table
+        data.append(values)
+
+    return {
+        'format': FORMAT,
+        'length': len(rows),
+        'columns': list(columns),
+        'data': data,
+        'labels': labels,
+        'deltas': deltas,
+        'enums': enums,
+        'optional': optional,
+        'missing': missing
+    }
+
+
+def decode_rows(payload: Dict) -> List[Dict]:
+    """Desfaz encode_rows."""
+    if payload.get('format') != FORMAT:
+        raise ValueError(f"Formato desconhecido: {payload.get('format')}")
+
+    deltas = set(payload['deltas'])
+    optional = set(payload['optional'])
+    missing = {name: set(rows) for name, rows in payload['missing'].items()}
+    rows = [{} for _ in range(payload['length'])]
+
+    for name, values in zip(payload['columns'], payload['data']):
+        if name in deltas:
+            values = _delta_decode(values)
+        elif name in payload['enums']:
+            table = payload['enums'][name]
+            values = [None if value is None else table[value] for value in values]
+        path = name.split('.')
+        for index, value in enumerate(values):
+            if (value is None and name in optional) or index in missing.get(name, ()):
+                continue
+            if name == 'label':
+                rows[index].update(zip(LABEL_KEYS, payload['labels'][value]))
+                continue
+            target = rows[index]
+            for key in path[:-1]:
+                target = target.setdefault(key, {})
+            target[path[-1]] = value
+    return rows
+
+
+def _flatten(row: Dict, prefix: str = '', flat: Optional[Dict] = None) -> Dict:
+    if flat is None:
+        flat = {}
+    for key, value in row.items():
+        if value.__class__ is dict and value:
+            _flatten(value, f'{prefix}{key}.', flat)
+        else:
+            flat[prefix + key] = value
+    return flat
+
+
+def _delta_encode(values: List[Optional[str]]) -> List[Optional[int]]:
+    encoded = []
+    previous = 0
+    days: Dict[str, int] = {}  # Poucas datas distintas: converte cada uma uma vez
+    for value in values:
+        if value is None:
+            encoded.append(None)
+            continue
+        day = days.get(value)
+        if day is None:
+            day = days[value] = to_day(value)
+        encoded.append(day - previous)
+        previous = day
+    return encoded
+
+
+def _delta_decode(values: List[Optional[int]]) -> List[Optional[str]]:
+    decoded = []
+    previous = 0
+    for value in values:
+        if value is None:
+            decoded.append(None)
+            continue
+        previous += value
+        decoded.append(from_day(previous))
+    return decoded
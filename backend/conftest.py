@@ -0,0 +1,14 @@
+"""
+Fixtures compartilhadas pelos testes do backend
+"""
+import pytest
+
+from data_manager import DataManager
+
+
+@pytest.fixture
+def db():
+    """DataManager com o banco em memória."""
+    manager = DataManager(':memory:')
+    yield manager
+    manager.close()
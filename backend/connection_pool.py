@@ -0,0 +1,161 @@
+"""
+Connection Pool - Reuso de conexões SQLite entre chamadas do Backend
+O pywebview executa cada chamada do js_api em uma thread nova, então o pool
+guarda conexões ociosas (não por thread) e as entrega a quem pedir.
+"""
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+
+
+# Caminho que abre um banco em memória (testes e benchmarks)
+MEMORY = ':memory:'
+
+
+# Aplicados uma única vez, quando a conexão é aberta
+PRAGMAS: Tuple[Tuple[str, object], ...] = (
+    ('journal_mode', 'WAL'),
+    ('synchronous', 'NORMAL'),
+    ('cache_size', -20000),      # Negativo = KiB (~20 MB de page cache)
+    ('mmap_size', 268435456),    # 256 MB mapeados em memória
+    ('busy_timeout', 5000),      # ms esperando o lock de escrita
+    ('temp_store', 'MEMORY'),
+)
+
+
+class PooledConnection(sqlite3.Connection):
+    """Conexão cujo close() devolve ao pool em vez de fechar de fato.
+
+    Assim o código existente (que sempre chama conn.close()) continua igual.
+    """
+
+    _pool = None
+
+    def close(self):
+        """Devolve a conexão ao pool (ou fecha, se não pertencer a um)."""
+        if self._pool is None:
+            super().close()
+        else:
+            self._pool.release(self)
+
+    def _close(self):
+        """Fecha a conexão de verdade."""
+        sqlite3.Connection.close(self)
+
+
+class ConnectionPool:
+    """Pool pequeno de conexões SQLite já configuradas."""
+
+    def __init__(self, db_path: str, max_idle: int = 4):
+        """Cria o pool.
+
+        Com db_path = MEMORY, todas as conexões do pool veem o mesmo banco em
+        memória (cada ':memory:' comum seria um banco separado). O banco usa
+        o VFS memdb, que tem locks como os de um arquivo: um leitor espera
+        (busy_timeout) enquanto outra conexão grava. Uma conexão extra o
+        mantém vivo até close_all().
+
+        Args:
+            db_path: Caminho do arquivo do banco, ou MEMORY
+            max_idle: Máximo de conexões ociosas mantidas abertas
+        """
+        self.db_path = str(db_path)
+        self.max_idle = max_idle
+        self._idle: List[PooledConnection] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self._uri: Optional[str] = None
+        self._anchor: Optional[sqlite3.Connection] = None
+        if self.db_path == MEMORY:
+            self._uri = f'file:/methodjs-{uuid.uuid4().hex}?vfs=memdb'
+            self._anchor = sqlite3.connect(self._uri, uri=True, check_same_thread=False)
+
+    def _open(self) -> PooledConnection:
+        """Abre uma conexão nova e aplica os PRAGMAs."""
+        conn = sqlite3.connect(
+            self._uri or self.db_path,
+            factory=PooledConnection,
+            check_same_thread=False,  # Conexões circulam entre threads do pywebview
+            uri=self._uri is not None
+        )
+        conn.row_factory = sqlite3.Row  # Permite acessar colunas por nome
+        for name, value in PRAGMAS:
+            conn.execute(f'PRAGMA {name} = {value}')
+        conn._pool = self
+        return conn
+
+    def acquire(self) -> PooledConnection:
+        """Retorna uma conexão ociosa do pool ou abre uma nova."""
+        with self._lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError('Pool de conexões fechado')
+            if self._idle:
+                return self._idle.pop()  # LIFO: a mais recente tem o cache mais quente
+        return self._open()
+
+    def release(self, conn: PooledConnection):
+        """Devolve uma conexão ao pool, descartando transações abertas."""
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            if not self._closed and len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn._close()
+
+    def close_all(self):
+        """Fecha todas as conexões ociosas e impede novas aquisições.
+
+        Conexões em uso são fechadas quando forem devolvidas.
+        """
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            anchor, self._anchor = self._anchor, None
+        for conn in idle:
+            conn._close()
+        if anchor is not None:
+            anchor.close()  # Banco em memória: some quando a última conexão fechar
+
+    @property
+    def idle_count(self) -> int:
+        """Quantidade de conexões ociosas no pool."""
+        return len(self._idle)
+
+
+class SessionConnection:
+    """Conexão emprestada a uma sessão de várias operações.
+
+    Repassa tudo à conexão real, exceto commit() e close(): quem abriu a
+    sessão decide quando confirmar a transação e devolver a conexão.
+    """
+
+    def __init__(self, conn: PooledConnection, write: bool):
+        self._conn = conn
+        self.write = write
+        self._savepoints = 0
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def commit(self):
+        """Ignorado: a sessão confirma tudo ao final."""
+
+    def close(self):
+        """Ignorado: a sessão devolve a conexão ao final."""
+
+    @contextmanager
+    def savepoint(self):
+        """Isola uma operação: se ela falhar, só ela é desfeita."""
+        self._savepoints += 1
+        name = f'op_{self._savepoints}'
+        self._conn.execute(f'SAVEPOINT {name}')
+        try:
+            yield
+        except BaseException:
+            self._conn.execute(f'ROLLBACK TO {name}')
+            self._conn.execute(f'RELEASE {name}')
+            raise
+        self._conn.execute(f'RELEASE {name}')
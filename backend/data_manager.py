@@ -4,34 +4,152 @@ Sistema de revisão espaçada: Dia seguinte, 1 semana, 1 mês, 3 meses
 """
 import sqlite3
 import os
+import json
+import re
+import threading
 from pathlib import Path
+from collections import Counter
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from contextlib import contextmanager
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
 
+import migrations
+from cache import LRUCache
+from connection_pool import MEMORY, ConnectionPool, SessionConnection
+from encoding import EPOCH_JULIAN_DAY, REVIEW_TYPE_CODES, REVIEW_TYPES, from_day, sql_date, to_day
+from scheduler import DEFAULT_SCHEDULER, LoadBalancer, ReviewColumns, Scheduler, get_scheduler
+from storage import Storage, validate_range
 
-class DataManager:
+
+# Cor das labels criadas automaticamente na importação
+DEFAULT_LABEL_COLOR = '#6B7280'
+
+# Entradas mantidas em change_log pela compactação
+CHANGE_LOG_KEEP = 10000
+
+# Conteúdos com todas as revisões completas há mais que isso vão para o arquivo
+ARCHIVE_AFTER_DAYS = 30
+
+# Fração do intervalo que o balanceamento de carga pode deslocar uma revisão
+LOAD_BALANCE_TOLERANCE = 0.1
+
+# Maior horizonte aceito por get_review_forecast (dias)
+MAX_FORECAST_DAYS = 366
+
+# Versão do formato de iter_export_records / restore_records
+EXPORT_FORMAT = 1
+
+# Revisão das tabelas, índices e triggers criados por _create_tables.
+# Aumente ao mudar qualquer um deles: bancos com o carimbo antigo refazem o DDL.
+DDL_REVISION = 5
+SCHEMA_STAMP = f'{migrations.SCHEMA_VERSION}.{DDL_REVISION}'
+
+
+def default_data_dir() -> Path:
+    """Pasta dos dados: METHODJS_DATA_DIR, se definida, ou Documents/MethodJS do usuário."""
+    configured = os.environ.get('METHODJS_DATA_DIR')
+    return Path(configured).expanduser() if configured else Path.home() / "Documents" / "MethodJS"
+
+
+class DataManager(Storage):
     """Gerencia o banco de dados SQLite para conteúdos e labels."""
     
-    def __init__(self):
-        """Inicializa o DataManager e cria o banco se não existir."""
-        # Pasta Documents/MethodJS
-        self.data_dir = Path.home() / "Documents" / "MethodJS"
-        self.data_dir.mkdir(parents=True, exist_ok=True)
+    def __init__(self, data_dir: Optional[Path] = None, scheduler: Optional[Scheduler] = None):
+        """Inicializa o DataManager e cria o banco se não existir.
         
-        self.db_path = self.data_dir / "study_data.db"
-        self._create_tables()
+        Args:
+            data_dir: Pasta do banco (padrão: default_data_dir()), ou ':memory:'
+                para um banco em memória, sem pasta (testes e benchmarks)
+            scheduler: Algoritmo de agendamento (padrão: o salvo no banco)
+        """
+        if str(data_dir) == MEMORY:
+            self.data_dir = None
+            self.db_path = MEMORY
+        else:
+            self.data_dir = Path(data_dir) if data_dir else default_data_dir()
+            self.data_dir.mkdir(parents=True, exist_ok=True)
+            self.db_path = self.data_dir / "study_data.db"
+        self._pool = ConnectionPool(self.db_path)
+        self._cache = LRUCache()
+        self._local = threading.local()  # Sessão aberta em cada thread
+        if not self._schema_is_current():
+            self._create_tables()
+        self._load_settings(scheduler)
+    
+    def _load_settings(self, scheduler: Optional[Scheduler] = None):
+        """Aplica as preferências salvas no banco (agendador e balanceamento)."""
+        self.scheduler = scheduler or get_scheduler(self._get_setting('scheduler', DEFAULT_SCHEDULER))
+        daily_cap = int(self._get_setting('load_balance_cap', '0'))
+        self.load_balancer = LoadBalancer(daily_cap, LOAD_BALANCE_TOLERANCE) if daily_cap > 0 else None
     
     def _get_connection(self):
-        """Retorna uma conexão com o banco."""
-        conn = sqlite3.connect(str(self.db_path))
-        conn.row_factory = sqlite3.Row  # Permite acessar colunas por nome
-        return conn
+        """Retorna uma conexão do pool (conn.close() a devolve ao pool).
+        
+        Dentro de session(), retorna a conexão da sessão.
+        """
+        session = getattr(self._local, 'session', None)
+        if session is not None:
+            return session
+        return self._pool.acquire()
+    
+    @contextmanager
+    def session(self, write: bool = False) -> Iterator[SessionConnection]:
+        """Executa várias operações na mesma conexão e transação.
+        
+        Leituras veem um único snapshot do banco. Com write=True a transação
+        já começa com o lock de escrita e tudo é confirmado de uma vez no
+        final; use session.savepoint() para isolar falhas de cada operação.
+        Se algo escapar do bloco, a sessão inteira é desfeita.
+        """
+        if getattr(self._local, 'session', None) is not None:
+            raise RuntimeError('Já existe uma sessão aberta nesta thread')
+        
+        conn = self._get_connection()
+        session = SessionConnection(conn, write)
+        try:
+            conn.execute('BEGIN IMMEDIATE' if write else 'BEGIN')
+            self._local.session = session
+            yield session
+            conn.commit()
+        finally:
+            self._local.session = None
+            conn.close()  # Desfaz a transação se ela não foi confirmada
+            if write:
+                # Leituras de outras threads durante a sessão podem ter
+                # guardado no cache o estado anterior ao commit
+                self._cache.clear()
+    
+    def _cached(self, key: tuple, loader: Callable):
+        """Lê pelo cache, exceto dentro de sessões de escrita (dados não confirmados)."""
+        session = getattr(self._local, 'session', None)
+        if session is not None and session.write:
+            return loader()
+        return self._cache.get_or_load(key, loader)
+    
+    def close(self):
+        """Fecha todas as conexões com o banco."""
+        self._pool.close_all()
+    
+    def get_cache_stats(self) -> Dict:
+        """Retorna os contadores do cache de leituras."""
+        return self._cache.stats()
+    
+    def _invalidate_contents(self, content_id: Optional[int] = None):
+        """Invalida as listagens de conteúdos e, se informado, um conteúdo."""
+        self._cache.invalidate_namespace('contents')
+        if content_id is not None:
+            self._cache.invalidate(('content', content_id))
     
     def _create_tables(self):
-        """Cria as tabelas se não existirem."""
+        """Cria as tabelas se não existirem e migra bancos antigos."""
         conn = self._get_connection()
         cursor = conn.cursor()
         
+        # Bancos de versões anteriores são convertidos antes de qualquer
+        # outra coisa; os índices e triggers são recriados logo abaixo
+        migrations.migrate(conn)
+        
         # Tabela de Labels
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS labels (
@@ -53,13 +171,15 @@ class DataManager:
             )
         ''')
         
-        # Tabela de Revisões
+        # Tabela de Revisões (datas em dias desde 1970-01-01, tipos em
+        # códigos de review_types; ver encoding.py)
+        migrations.create_review_types(cursor)
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS reviews (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 content_id INTEGER NOT NULL,
-                review_type TEXT NOT NULL,
-                scheduled_date TEXT NOT NULL,
+                review_type INTEGER NOT NULL,
+                scheduled_day INTEGER NOT NULL,
                 completed INTEGER DEFAULT 0,
                 completed_at TEXT,
                 FOREIGN KEY (content_id) REFERENCES contents(id) ON DELETE CASCADE
@@ -67,12 +187,297 @@ class DataManager:
         ''')
         
         # Índices para performance
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_reviews_date ON reviews(scheduled_date, completed)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_reviews_content ON reviews(content_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_reviews_date ON reviews(scheduled_day, completed)')
+        # Pendentes em ordem de dia (e id, implícito no índice): get_overdue_reviews
+        # pula o histórico completo em vez de filtrá-lo
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_reviews_pending ON reviews(completed, scheduled_day)')
+        # As marcações buscam a revisão exata (content_id, review_type); o índice
+        # antigo só por content_id fica redundante
+        cursor.execute('DROP INDEX IF EXISTS idx_reviews_content')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_reviews_content_type ON reviews(content_id, review_type)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_contents_created ON contents(created_at)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_contents_label ON contents(label_id, created_at)')
+        
+        # Estatísticas materializadas, mantidas exatas pelos triggers abaixo
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'stats'")
+        stats_is_new = cursor.fetchone() is None
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS stats (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            ) WITHOUT ROWID
+        ''')
+        
+        # Revisões pendentes por dia (só dias com pendências)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS review_pending_by_day (
+                scheduled_day INTEGER PRIMARY KEY,
+                pending INTEGER NOT NULL
+            ) WITHOUT ROWID
+        ''')
+        
+        # Marcador de carga em massa: só tem linha dentro da transação de
+        # create_contents_bulk (ou de reschedule_reviews), que desliga os
+        # triggers de INSERT (e de UPDATE em reviews) e faz a manutenção em
+        # lote (outras conexões nunca veem essa linha)
+        cursor.execute('CREATE TABLE IF NOT EXISTS bulk_load (active INTEGER PRIMARY KEY)')
+        
+        # Preferências do app (ex.: algoritmo de agendamento)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS settings (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            ) WITHOUT ROWID
+        ''')
+        
+        # Log de alterações: cada linha tocada ganha uma versão crescente.
+        # Mudanças em reviews são registradas no conteúdo dono delas.
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'change_log'")
+        change_log_is_new = cursor.fetchone() is None
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS change_log (
+                version INTEGER PRIMARY KEY AUTOINCREMENT,
+                entity TEXT NOT NULL,
+                row_id INTEGER NOT NULL
+            )
+        ''')
+        
+        if change_log_is_new:
+            cursor.execute('SELECT EXISTS (SELECT 1 FROM labels) OR EXISTS (SELECT 1 FROM contents)')
+            if cursor.fetchone()[0]:
+                # Dados anteriores ao log: quem pedir a versão 0 precisa reler tudo
+                cursor.execute("INSERT INTO sqlite_sequence (name, seq) VALUES ('change_log', 1)")
+        
+        # Arquivo: conteúdos já revisados por completo saem de contents e
+        # reviews (ver archive_completed), mantendo as mesmas colunas e ids
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS archived_contents (
+                id INTEGER PRIMARY KEY,
+                title TEXT NOT NULL,
+                label_id INTEGER NOT NULL,
+                created_at TEXT NOT NULL,
+                archived_at TEXT NOT NULL
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS archived_reviews (
+                id INTEGER PRIMARY KEY,
+                content_id INTEGER NOT NULL,
+                review_type INTEGER NOT NULL,
+                scheduled_day INTEGER NOT NULL,
+                completed INTEGER DEFAULT 0,
+                completed_at TEXT
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_archived_reviews_content ON archived_reviews(content_id)')
+        # (scheduled_day, completed, content_id) acompanha idx_reviews_date nas consultas
+        # por dia e entrega content_id em ordem para o DISTINCT de unmark_*_by_date
+        cursor.execute('DROP INDEX IF EXISTS idx_archived_reviews_date')
+        cursor.execute(
+            'CREATE INDEX IF NOT EXISTS idx_archived_reviews_day '
+            'ON archived_reviews(scheduled_day, completed, content_id)'
+        )
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_archived_contents_label ON archived_contents(label_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_archived_contents_created ON archived_contents(created_at)')
+        
+        self._create_stats_triggers(cursor)
+        self._create_change_log_triggers(cursor)
+        
+        # Revisões órfãs: delete_content não as apagava antes da revisão 5
+        # do DDL (sem PRAGMA foreign_keys o ON DELETE CASCADE não age)
+        cursor.execute('DELETE FROM reviews WHERE content_id NOT IN (SELECT id FROM contents)')
+        orphans = cursor.rowcount
+        
+        if stats_is_new or orphans > 0:
+            # Banco já existente (ou com órfãs que os contadores incluíam):
+            # calcula os contadores do zero
+            self._rebuild_statistics(cursor)
+        else:
+            # Contadores do arquivo, em bancos anteriores a ele
+            cursor.execute('''
+                INSERT OR IGNORE INTO stats (key, value) VALUES
+                    ('archived_contents', (SELECT COUNT(*) FROM archived_contents)),
+                    ('archived_reviews', (SELECT COUNT(*) FROM archived_reviews))
+            ''')
+        
+        # Índice de busca textual nos títulos (FTS5 sobre a tabela contents)
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'contents_fts'")
+        fts_is_new = cursor.fetchone() is None
+        
+        cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS contents_fts USING fts5(
+                title,
+                content='contents',
+                content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+        ''')
+        self._create_fts_triggers(cursor)
+        
+        if fts_is_new:
+            cursor.execute("INSERT INTO contents_fts (contents_fts) VALUES ('rebuild')")
+        
+        cursor.execute('''
+            INSERT INTO settings (key, value) VALUES ('schema_stamp', ?)
+            ON CONFLICT (key) DO UPDATE SET value = excluded.value
+        ''', (SCHEMA_STAMP,))
         
         conn.commit()
         conn.close()
     
+    def _schema_is_current(self) -> bool:
+        """Diz se o banco já está no esquema atual (abertura rápida, sem DDL)."""
+        conn = self._get_connection()
+        try:
+            if migrations.get_version(conn) != migrations.SCHEMA_VERSION:
+                return False
+            row = conn.execute("SELECT value FROM settings WHERE key = 'schema_stamp'").fetchone()
+            return row is not None and row['value'] == SCHEMA_STAMP
+        except sqlite3.OperationalError:
+            return False  # Banco novo ou anterior à tabela settings
+        finally:
+            conn.close()
+    
+    def _create_trigger(self, cursor, name: str, definition: str):
+        """(Re)cria um trigger, garantindo que a definição esteja atualizada."""
+        cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+        cursor.execute(f'CREATE TRIGGER {name} {definition}')
+    
+    def _create_stats_triggers(self, cursor):
+        """Cria os triggers que mantêm `stats` e `review_pending_by_day`."""
+        for table, key in (
+            ('labels', 'total_labels'),
+            ('contents', 'total_contents'),
+            ('archived_contents', 'archived_contents'),
+            ('archived_reviews', 'archived_reviews'),
+        ):
+            self._create_trigger(cursor, f'trg_stats_{table}_insert', f'''
+                AFTER INSERT ON {table} WHEN NOT EXISTS (SELECT 1 FROM bulk_load)
+                BEGIN
+                    UPDATE stats SET value = value + 1 WHERE key = '{key}';
+                END
+            ''')
+            self._create_trigger(cursor, f'trg_stats_{table}_delete', f'''
+                AFTER DELETE ON {table}
+                BEGIN
+                    UPDATE stats SET value = value - 1 WHERE key = '{key}';
+                END
+            ''')
+        
+        # Somar e subtrair a contribuição de uma linha de reviews
+        add_review = '''
+            UPDATE stats SET value = value + 1 WHERE key = 'total_reviews';
+            UPDATE stats SET value = value + 1 WHERE key = 'completed_reviews' AND NEW.completed = 1;
+            INSERT INTO review_pending_by_day (scheduled_day, pending)
+                SELECT NEW.scheduled_day, 1 WHERE NEW.completed = 0
+                ON CONFLICT (scheduled_day) DO UPDATE SET pending = pending + 1;
+        '''
+        remove_review = '''
+            UPDATE stats SET value = value - 1 WHERE key = 'total_reviews';
+            UPDATE stats SET value = value - 1 WHERE key = 'completed_reviews' AND OLD.completed = 1;
+            UPDATE review_pending_by_day SET pending = pending - 1
+                WHERE scheduled_day = OLD.scheduled_day AND OLD.completed = 0;
+            DELETE FROM review_pending_by_day
+                WHERE scheduled_day = OLD.scheduled_day AND pending = 0;
+        '''
+        
+        self._create_trigger(cursor, 'trg_stats_reviews_insert', f'''
+            AFTER INSERT ON reviews WHEN NOT EXISTS (SELECT 1 FROM bulk_load)
+            BEGIN {add_review} END
+        ''')
+        self._create_trigger(cursor, 'trg_stats_reviews_delete', f'''
+            AFTER DELETE ON reviews
+            BEGIN {remove_review} END
+        ''')
+        self._create_trigger(cursor, 'trg_stats_reviews_update', f'''
+            AFTER UPDATE OF scheduled_day, completed ON reviews WHEN NOT EXISTS (SELECT 1 FROM bulk_load)
+            BEGIN {remove_review} {add_review} END
+        ''')
+    
+    def _create_change_log_triggers(self, cursor):
+        """Cria os triggers que registram em change_log as linhas alteradas."""
+        def log(entity: str, row_id: str) -> str:
+            # Não repete a última entrada (ex.: as quatro revisões de um conteúdo novo)
+            return f'''
+                INSERT INTO change_log (entity, row_id)
+                SELECT '{entity}', {row_id}
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM change_log
+                    WHERE version = (SELECT MAX(version) FROM change_log)
+                      AND entity = '{entity}' AND row_id = {row_id}
+                );
+            '''
+        
+        for table, entity, column, bulk in (
+            ('labels', 'labels', 'id', False),
+            ('contents', 'contents', 'id', True),
+            ('reviews', 'contents', 'content_id', True),
+        ):
+            # Inserções da carga em massa (e o reagendamento em lote) são
+            # registrados por quem ligou o bulk_load
+            when = 'WHEN NOT EXISTS (SELECT 1 FROM bulk_load)' if bulk else ''
+            update_when = when if table == 'reviews' else ''
+            self._create_trigger(cursor, f'trg_log_{table}_insert', f'''
+                AFTER INSERT ON {table} {when}
+                BEGIN {log(entity, f'NEW.{column}')} END
+            ''')
+            self._create_trigger(cursor, f'trg_log_{table}_update', f'''
+                AFTER UPDATE ON {table} {update_when}
+                BEGIN {log(entity, f'NEW.{column}')} END
+            ''')
+            self._create_trigger(cursor, f'trg_log_{table}_delete', f'''
+                AFTER DELETE ON {table}
+                BEGIN {log(entity, f'OLD.{column}')} END
+            ''')
+    
+    def _create_fts_triggers(self, cursor):
+        """Cria os triggers que mantêm contents_fts em sincronia com contents."""
+        self._create_trigger(cursor, 'trg_fts_contents_insert', '''
+            AFTER INSERT ON contents WHEN NOT EXISTS (SELECT 1 FROM bulk_load)
+            BEGIN
+                INSERT INTO contents_fts (rowid, title) VALUES (NEW.id, NEW.title);
+            END
+        ''')
+        self._create_trigger(cursor, 'trg_fts_contents_delete', '''
+            AFTER DELETE ON contents
+            BEGIN
+                INSERT INTO contents_fts (contents_fts, rowid, title) VALUES ('delete', OLD.id, OLD.title);
+            END
+        ''')
+        self._create_trigger(cursor, 'trg_fts_contents_update', '''
+            AFTER UPDATE OF title ON contents
+            BEGIN
+                INSERT INTO contents_fts (contents_fts, rowid, title) VALUES ('delete', OLD.id, OLD.title);
+                INSERT INTO contents_fts (rowid, title) VALUES (NEW.id, NEW.title);
+            END
+        ''')
+    
+    def _rebuild_statistics(self, cursor):
+        """Recalcula do zero as tabelas de estatísticas (varre as tabelas)."""
+        cursor.execute('DELETE FROM stats')
+        cursor.execute('''
+            INSERT INTO stats (key, value) VALUES
+                ('total_contents', (SELECT COUNT(*) FROM contents)),
+                ('total_labels', (SELECT COUNT(*) FROM labels)),
+                ('completed_reviews', (SELECT COUNT(*) FROM reviews WHERE completed = 1)),
+                ('total_reviews', (SELECT COUNT(*) FROM reviews)),
+                ('archived_contents', (SELECT COUNT(*) FROM archived_contents)),
+                ('archived_reviews', (SELECT COUNT(*) FROM archived_reviews))
+        ''')
+        self._rebuild_pending_by_day(cursor)
+    
+    def _rebuild_pending_by_day(self, cursor):
+        """Recalcula review_pending_by_day a partir de reviews."""
+        cursor.execute('DELETE FROM review_pending_by_day')
+        cursor.execute('''
+            INSERT INTO review_pending_by_day (scheduled_day, pending)
+            SELECT scheduled_day, COUNT(*) FROM reviews
+            WHERE completed = 0
+            GROUP BY scheduled_day
+        ''')
+    
     # ==================== LABELS ====================
     
     def create_label(self, name: str, color: str) -> Dict:
@@ -89,6 +494,7 @@ class DataManager:
             )
             conn.commit()
             label_id = cursor.lastrowid
+            self._cache.invalidate(('labels',))
             
             return {
                 'id': label_id,
@@ -102,7 +508,11 @@ class DataManager:
             conn.close()
     
     def get_all_labels(self) -> List[Dict]:
-        """Retorna todas as labels."""
+        """Retorna todas as labels (com cache)."""
+        return self._cached(('labels',), self._load_all_labels)
+    
+    def _load_all_labels(self) -> List[Dict]:
+        """Lê todas as labels do banco."""
         conn = self._get_connection()
         cursor = conn.cursor()
         
@@ -117,10 +527,14 @@ class DataManager:
         conn = self._get_connection()
         cursor = conn.cursor()
         
-        cursor.execute(
-            'UPDATE labels SET name = ?, color = ? WHERE id = ?',
-            (name, color, label_id)
-        )
+        try:
+            cursor.execute(
+                'UPDATE labels SET name = ?, color = ? WHERE id = ?',
+                (name, color, label_id)
+            )
+        except sqlite3.IntegrityError:
+            conn.close()
+            return {'error': 'Label já existe'}
         conn.commit()
         
         if cursor.rowcount == 0:
@@ -128,6 +542,8 @@ class DataManager:
             return {'error': 'Label não encontrada'}
         
         conn.close()
+        # Nome e cor da label aparecem em todos os conteúdos dela
+        self._cache.invalidate_namespace('labels', 'contents', 'content')
         return {'success': True}
     
     def delete_label(self, label_id: int) -> Dict:
@@ -135,8 +551,11 @@ class DataManager:
         conn = self._get_connection()
         cursor = conn.cursor()
         
-        # Verifica se há conteúdos com essa label
-        cursor.execute('SELECT COUNT(*) as count FROM contents WHERE label_id = ?', (label_id,))
+        # Verifica se há conteúdos com essa label (inclusive arquivados)
+        cursor.execute('''
+            SELECT (SELECT COUNT(*) FROM contents WHERE label_id = ?)
+                 + (SELECT COUNT(*) FROM archived_contents WHERE label_id = ?) as count
+        ''', (label_id, label_id))
         count = cursor.fetchone()['count']
         
         if count > 0:
@@ -146,19 +565,46 @@ class DataManager:
         cursor.execute('DELETE FROM labels WHERE id = ?', (label_id,))
         conn.commit()
         conn.close()
+        self._cache.invalidate(('labels',))
         
         return {'success': True}
     
     # ==================== CONTENTS ====================
     
     def _calculate_review_dates(self, created_at: datetime) -> Dict[str, str]:
-        """Calcula as datas de revisão baseado na data de criação."""
-        return {
-            'next_day': (created_at + timedelta(days=1)).date().isoformat(),
-            'one_week': (created_at + timedelta(weeks=1)).date().isoformat(),
-            'one_month': (created_at + timedelta(days=30)).date().isoformat(),
-            'three_months': (created_at + timedelta(days=90)).date().isoformat()
-        }
+        """Calcula as datas de revisão baseado na data de criação (ver scheduler.py)."""
+        days = self.scheduler.initial_days(to_day(created_at))
+        return {review_type: from_day(day) for review_type, day in zip(REVIEW_TYPES, days)}
+    
+    def _balance_review_dates(self, cursor, created_at: datetime,
+                              review_dates: Dict[str, str]) -> Dict[str, str]:
+        """Aplica o balanceamento de carga às datas de _calculate_review_dates."""
+        created_day = to_day(created_at)
+        days = [to_day(date) for date in review_dates.values()]
+        window = self.load_balancer.window(created_day, days[-1])
+        load = self._pending_load(cursor, days[0] - window, days[-1] + window)
+        placed = self.load_balancer.place(created_day, days, load)
+        return {review_type: from_day(day) for review_type, day in zip(review_dates, placed)}
+    
+    @staticmethod
+    def _pending_load(cursor, first: Optional[int] = None, last: Optional[int] = None) -> Dict[int, int]:
+        """Revisões pendentes por dia (review_pending_by_day), opcionalmente num intervalo."""
+        if first is None:
+            cursor.execute('SELECT scheduled_day, pending FROM review_pending_by_day')
+        else:
+            cursor.execute(
+                'SELECT scheduled_day, pending FROM review_pending_by_day WHERE scheduled_day BETWEEN ? AND ?',
+                (first, last)
+            )
+        return {row[0]: row[1] for row in cursor.fetchall()}
+    
+    @staticmethod
+    def _review_days(review_dates: Dict[str, str]) -> List[tuple]:
+        """Converte as datas de _calculate_review_dates em (código, dia)."""
+        return [
+            (REVIEW_TYPE_CODES[review_type], to_day(scheduled_date))
+            for review_type, scheduled_date in review_dates.items()
+        ]
     
     def create_content(self, title: str, label_id: int) -> Dict:
         """Cria um novo conteúdo e agenda as revisões."""
@@ -178,14 +624,17 @@ class DataManager:
             
             # Calcula e agenda as revisões
             review_dates = self._calculate_review_dates(created_at)
+            if self.load_balancer is not None:
+                review_dates = self._balance_review_dates(cursor, created_at, review_dates)
             
-            for review_type, scheduled_date in review_dates.items():
+            for review_type, scheduled_day in self._review_days(review_dates):
                 cursor.execute(
-                    'INSERT INTO reviews (content_id, review_type, scheduled_date) VALUES (?, ?, ?)',
-                    (content_id, review_type, scheduled_date)
+                    'INSERT INTO reviews (content_id, review_type, scheduled_day) VALUES (?, ?, ?)',
+                    (content_id, review_type, scheduled_day)
                 )
             
             conn.commit()
+            self._invalidate_contents()
             
             return {
                 'id': content_id,
@@ -197,87 +646,397 @@ class DataManager:
         finally:
             conn.close()
     
-    def get_all_contents(self) -> List[Dict]:
-        """Retorna todos os conteúdos com suas labels e status de revisão."""
+    def create_contents_bulk(self, items: Iterable[Dict], chunk_size: int = 1000,
+                             progress: Optional[Callable[[int], None]] = None) -> Dict:
+        """Cria muitos conteúdos de uma vez e agenda as revisões.
+        
+        Os itens são gravados em transações de `chunk_size` conteúdos com
+        executemany. Se a importação for interrompida, os lotes já
+        confirmados permanecem no banco.
+        
+        Args:
+            items: Dicts com 'title' e 'label_id' ou 'label' (nome da label,
+                criada se não existir, com 'label_color' opcional). 'created_at'
+                (ISO) é opcional; o padrão é agora.
+            chunk_size: Conteúdos por transação
+            progress: Chamado com o total criado após cada lote
+        
+        Returns:
+            {'created': int, 'labels_created': int, 'errors': [{'index', 'error'}]}
+        """
+        now = datetime.now()
+        created = 0
+        labels_created = 0
+        errors = []
+        review_days_by_day = {}  # Datas de revisão só dependem do dia de criação
+        balancer = self.load_balancer
+        
         conn = self._get_connection()
         cursor = conn.cursor()
         
-        cursor.execute('''
+        try:
+            cursor.execute('SELECT id, name FROM labels')
+            label_ids = {row['name']: row['id'] for row in cursor.fetchall()}
+            # Com balanceamento, a carga de todos os dias é lida uma vez e
+            # atualizada em memória a cada conteúdo importado
+            load = self._pending_load(cursor) if balancer is not None else None
+            
+            for chunk in self._chunked(enumerate(items), chunk_size):
+                # IMMEDIATE: garante ids sequenciais até o commit do lote
+                # (numa sessão de escrita a transação já começou assim)
+                if not conn.in_transaction:
+                    cursor.execute('BEGIN IMMEDIATE')
+                cursor.execute('''
+                    SELECT MAX(
+                        COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'contents'), 0),
+                        COALESCE((SELECT MAX(id) FROM contents), 0)
+                    )
+                ''')
+                next_id = cursor.fetchone()[0] + 1
+                
+                content_rows = []
+                review_rows = []
+                for index, item in chunk:
+                    if not isinstance(item, dict):
+                        errors.append({'index': index, 'error': 'Item inválido'})
+                        continue
+                    
+                    title = (item.get('title') or '').strip()
+                    if not title:
+                        errors.append({'index': index, 'error': 'Título vazio'})
+                        continue
+                    
+                    label_id = item.get('label_id')
+                    if label_id is None:
+                        name = (item.get('label') or '').strip()
+                        if not name:
+                            errors.append({'index': index, 'error': 'Label não informada'})
+                            continue
+                        label_id = label_ids.get(name)
+                        if label_id is None:
+                            cursor.execute(
+                                'INSERT INTO labels (name, color, created_at) VALUES (?, ?, ?)',
+                                (name, item.get('label_color') or DEFAULT_LABEL_COLOR, now.isoformat())
+                            )
+                            label_id = label_ids[name] = cursor.lastrowid
+                            labels_created += 1
+                    
+                    try:
+                        created_at = (
+                            datetime.fromisoformat(item['created_at'])
+                            if item.get('created_at') else now
+                        )
+                    except (TypeError, ValueError):
+                        errors.append({'index': index, 'error': 'Data de criação inválida'})
+                        continue
+                    
+                    review_days = review_days_by_day.get(created_at.date())
+                    if review_days is None:
+                        review_days = self._review_days(self._calculate_review_dates(created_at))
+                        review_days_by_day[created_at.date()] = review_days
+                    if balancer is not None:
+                        placed = balancer.place(to_day(created_at), [day for _, day in review_days], load)
+                        review_days = [(code, day) for (code, _), day in zip(review_days, placed)]
+                    
+                    content_id = next_id + len(content_rows)
+                    content_rows.append((content_id, title, label_id, created_at.isoformat()))
+                    review_rows.extend(
+                        (content_id, review_type, scheduled_day)
+                        for review_type, scheduled_day in review_days
+                    )
+                
+                cursor.execute('INSERT INTO bulk_load (active) VALUES (1)')
+                cursor.executemany(
+                    'INSERT INTO contents (id, title, label_id, created_at) VALUES (?, ?, ?, ?)',
+                    content_rows
+                )
+                cursor.executemany(
+                    'INSERT INTO reviews (content_id, review_type, scheduled_day) VALUES (?, ?, ?)',
+                    review_rows
+                )
+                cursor.execute('DELETE FROM bulk_load')
+                self._after_bulk_insert(cursor, content_rows, review_rows)
+                conn.commit()
+                
+                created += len(content_rows)
+                if progress:
+                    progress(created)
+        finally:
+            conn.close()
+            self._invalidate_contents()
+            self._cache.invalidate(('labels',))
+        
+        if created:
+            self._compact_change_log_if_large()
+        return {'created': created, 'labels_created': labels_created, 'errors': errors}
+    
+    def _after_bulk_insert(self, cursor, content_rows: List[tuple], review_rows: List[tuple]):
+        """Faz em lote o que os triggers de INSERT fariam linha a linha.
+        
+        Args:
+            content_rows: Tuplas (id, title, label_id, created_at) inseridas
+            review_rows: Tuplas (content_id, review_type, scheduled_day) inseridas
+        """
+        cursor.executemany(
+            'INSERT INTO contents_fts (rowid, title) VALUES (?, ?)',
+            ((content_id, title) for content_id, title, _, _ in content_rows)
+        )
+        cursor.execute(
+            "UPDATE stats SET value = value + ? WHERE key = 'total_contents'",
+            (len(content_rows),)
+        )
+        cursor.execute(
+            "UPDATE stats SET value = value + ? WHERE key = 'total_reviews'",
+            (len(review_rows),)
+        )
+        # Revisões novas nascem pendentes
+        pending_by_day = Counter(scheduled_day for _, _, scheduled_day in review_rows)
+        cursor.executemany('''
+            INSERT INTO review_pending_by_day (scheduled_day, pending) VALUES (?, ?)
+            ON CONFLICT (scheduled_day) DO UPDATE SET pending = pending + excluded.pending
+        ''', pending_by_day.items())
+        if content_rows:
+            # Os ids do lote são consecutivos
+            cursor.execute('''
+                INSERT INTO change_log (entity, row_id)
+                SELECT 'contents', id FROM contents WHERE id BETWEEN ? AND ? ORDER BY id
+            ''', (content_rows[0][0], content_rows[-1][0]))
+    
+    @staticmethod
+    def _chunked(iterable: Iterable, size: int) -> Iterator[List]:
+        """Agrupa um iterável em listas de até `size` itens."""
+        iterator = iter(iterable)
+        while True:
+            chunk = list(islice(iterator, size))
+            if not chunk:
+                return
+            yield chunk
+    
+    def _query_contents(self, cursor, where: str = '', params: tuple = (),
+                        limit: Optional[int] = None, joins: str = '',
+                        order_by: str = 'c.created_at DESC, c.id DESC',
+                        archived: bool = False) -> List[Dict]:
+        """Busca conteúdos, labels e as quatro revisões em uma única consulta.
+        
+        As revisões de cada conteúdo vêm agregadas em um objeto JSON por uma
+        subconsulta correlacionada (idx_reviews_content_type), evitando o N+1.
+        
+        Args:
+            where: Cláusula WHERE sobre `c` (contents) e `l` (labels)
+            params: Parâmetros da cláusula WHERE
+            limit: Quantidade máxima de conteúdos
+            joins: JOINs extras (ex.: com contents_fts na busca)
+            order_by: Ordenação dos conteúdos
+            archived: Lê do arquivo (os itens vêm com 'archived': True)
+        """
+        contents, reviews = ('archived_contents', 'archived_reviews') if archived else ('contents', 'reviews')
+        sql = f'''
             SELECT 
                 c.id, c.title, c.created_at,
-                l.id as label_id, l.name as label_name, l.color as label_color
-            FROM contents c
+                l.id as label_id, l.name as label_name, l.color as label_color,
+                (
+                    SELECT json_group_object(t.name, json_object(
+                        'scheduled_date', {sql_date('r.scheduled_day')},
+                        'completed', r.completed,
+                        'completed_at', r.completed_at
+                    ))
+                    FROM {reviews} r
+                    JOIN review_types t ON t.id = r.review_type
+                    WHERE r.content_id = c.id
+                ) as reviews_json
+            FROM {contents} c
             JOIN labels l ON c.label_id = l.id
-            ORDER BY c.created_at DESC
-        ''')
+            {joins}
+            {where}
+            ORDER BY {order_by}
+        '''
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params = (*params, limit)
         
-        contents = []
-        for row in cursor.fetchall():
-            content = dict(row)
-            
-            # Busca as revisões do conteúdo
-            cursor.execute('''
-                SELECT review_type, scheduled_date, completed, completed_at
-                FROM reviews
-                WHERE content_id = ?
-                ORDER BY scheduled_date
-            ''', (content['id'],))
+        cursor.execute(sql, params)
+        rows = [self._content_from_row(row) for row in cursor.fetchall()]
+        if archived:
+            for content in rows:
+                content['archived'] = True
+        return rows
+    
+    def _content_from_row(self, row: sqlite3.Row) -> Dict:
+        """Converte uma linha de _query_contents no formato da API."""
+        content = dict(row)
+        reviews = json.loads(content.pop('reviews_json') or '{}')
+        for review in reviews.values():
+            review['completed'] = bool(review['completed'])
+        content['reviews'] = reviews
+        return content
+    
+    def get_all_contents(self, include_archived: bool = False, columnar: bool = False):
+        """Retorna todos os conteúdos com suas labels e status de revisão (com cache).
+        
+        Args:
+            include_archived: Inclui os conteúdos arquivados, na mesma ordenação
+            columnar: Retorna a lista no formato colunar de columnar.encode_rows
+                (também em cache, invalidado junto com a lista)
+        """
+        if columnar:
+            from columnar import encode_rows
+            key = ('contents', 'all', 'columnar', include_archived)
+            return self._cached(key, lambda: encode_rows(self.get_all_contents(include_archived)))
+        if include_archived:
+            return self._cached(('contents', 'all', 'archived'), self._load_all_contents_with_archive)
+        return self._cached(('contents', 'all'), self._load_all_contents)
+    
+    def _load_all_contents(self) -> List[Dict]:
+        """Lê todos os conteúdos do banco."""
+        conn = self._get_connection()
+        try:
+            return self._query_contents(conn.cursor())
+        finally:
+            conn.close()
+    
+    def _load_all_contents_with_archive(self) -> List[Dict]:
+        """Lê os conteúdos ativos e os arquivados."""
+        conn = self._get_connection()
+        try:
+            contents = self._query_contents(conn.cursor()) + self._query_contents(conn.cursor(), archived=True)
+        finally:
+            conn.close()
+        contents.sort(key=lambda content: (content['created_at'], content['id']), reverse=True)
+        return contents
+    
+    def list_contents(self, cursor: Optional[str] = None, limit: int = 50,
+                      label_id: Optional[int] = None, date_from: Optional[str] = None,
+                      date_to: Optional[str] = None) -> Dict:
+        """Retorna uma página de conteúdos (mais recentes primeiro).
+        
+        Paginação por cursor (keyset): a próxima página começa logo após o
+        último item da anterior, sem OFFSET, então o custo não cresce com a
+        posição na lista.
+        
+        Args:
+            cursor: Valor de 'next_cursor' da página anterior (None = primeira)
+            limit: Tamanho da página (1 a 500)
+            label_id: Filtra por label
+            date_from: Data de criação mínima (YYYY-MM-DD, inclusiva)
+            date_to: Data de criação máxima (YYYY-MM-DD, inclusiva)
+        
+        Returns:
+            {'items': [...], 'next_cursor': str ou None}
+        """
+        if not isinstance(limit, int) or not 1 <= limit <= 500:
+            return {'error': 'O limite deve estar entre 1 e 500'}
+        
+        conditions = []
+        params = []
+        
+        if cursor is not None:
+            try:
+                cursor_created_at, cursor_id = cursor.rsplit('|', 1)
+                params.extend([cursor_created_at, int(cursor_id)])
+            except (AttributeError, ValueError):  # AttributeError: cursor não é texto
+                return {'error': 'Cursor inválido'}
+            conditions.append('(c.created_at, c.id) < (?, ?)')
+        
+        if label_id is not None:
+            conditions.append('c.label_id = ?')
+            params.append(label_id)
+        
+        if date_from is not None:
+            conditions.append('c.created_at >= ?')
+            params.append(date_from)
+        
+        if date_to is not None:
+            # created_at tem hora, então compara com o início do dia seguinte
+            try:
+                next_day = datetime.fromisoformat(date_to) + timedelta(days=1)
+            except (TypeError, ValueError):
+                return {'error': 'Data inválida'}
+            conditions.append('c.created_at < ?')
+            params.append(next_day.date().isoformat())
+        
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        
+        def load():
+            conn = self._get_connection()
+            try:
+                # Busca um item a mais só para saber se existe próxima página
+                items = self._query_contents(conn.cursor(), where, tuple(params), limit + 1)
+            finally:
+                conn.close()
             
-            reviews = {}
-            for review_row in cursor.fetchall():
-                review = dict(review_row)
-                reviews[review['review_type']] = {
-                    'scheduled_date': review['scheduled_date'],
-                    'completed': bool(review['completed']),
-                    'completed_at': review['completed_at']
-                }
+            next_cursor = None
+            if len(items) > limit:
+                items = items[:limit]
+                last = items[-1]
+                next_cursor = f"{last['created_at']}|{last['id']}"
             
-            content['reviews'] = reviews
-            contents.append(content)
+            return {'items': items, 'next_cursor': next_cursor}
         
-        conn.close()
-        return contents
+        key = ('contents', 'page', cursor, limit, label_id, date_from, date_to)
+        return self._cached(key, load)
+    
+    def get_content_by_id(self, content_id: int, include_archived: bool = False) -> Optional[Dict]:
+        """Retorna um conteúdo específico (com cache).
+        
+        Args:
+            include_archived: Procura também no arquivo (sem cache)
+        """
+        content = self._cached(
+            ('content', content_id),
+            lambda: self._load_content(content_id)
+        )
+        if content is None and include_archived:
+            content = self._load_content(content_id, archived=True)
+        return content
     
-    def get_content_by_id(self, content_id: int) -> Optional[Dict]:
-        """Retorna um conteúdo específico."""
+    def _load_content(self, content_id: int, archived: bool = False) -> Optional[Dict]:
+        """Lê um conteúdo do banco."""
         conn = self._get_connection()
-        cursor = conn.cursor()
+        try:
+            contents = self._query_contents(conn.cursor(), 'WHERE c.id = ?', (content_id,), archived=archived)
+        finally:
+            conn.close()
+        return contents[0] if contents else None
+    
+    def search_contents(self, query: str, limit: int = 20,
+                        label_id: Optional[int] = None) -> List[Dict]:
+        """Busca conteúdos pelo título, do mais relevante ao menos relevante.
         
-        cursor.execute('''
-            SELECT 
-                c.id, c.title, c.created_at,
-                l.id as label_id, l.name as label_name, l.color as label_color
-            FROM contents c
-            JOIN labels l ON c.label_id = l.id
-            WHERE c.id = ?
-        ''', (content_id,))
+        Cada palavra da busca casa por prefixo ("newt" encontra "Newton") e
+        acentos são ignorados ("equacao" encontra "Equação").
         
-        row = cursor.fetchone()
-        if not row:
-            conn.close()
-            return None
+        Args:
+            query: Texto digitado pelo usuário
+            limit: Quantidade máxima de resultados (1 a 500)
+            label_id: Restringe a busca a uma label
+        """
+        if not isinstance(limit, int) or not 1 <= limit <= 500:
+            return {'error': 'O limite deve estar entre 1 e 500'}
+        if query is not None and not isinstance(query, str):
+            return {'error': 'A busca deve ser um texto'}
         
-        content = dict(row)
+        # Cada termo vira uma frase entre aspas com '*' (prefixo), o que
+        # também neutraliza a sintaxe do FTS5 digitada pelo usuário
+        terms = re.findall(r'\w+', query or '')
+        if not terms:
+            return []
+        match = ' '.join(f'"{term}"*' for term in terms)
         
-        # Busca as revisões
-        cursor.execute('''
-            SELECT review_type, scheduled_date, completed, completed_at
-            FROM reviews
-            WHERE content_id = ?
-        ''', (content_id,))
-        
-        reviews = {}
-        for review_row in cursor.fetchall():
-            review = dict(review_row)
-            reviews[review['review_type']] = {
-                'scheduled_date': review['scheduled_date'],
-                'completed': bool(review['completed']),
-                'completed_at': review['completed_at']
-            }
+        where = 'WHERE contents_fts MATCH ?'
+        params = [match]
+        if label_id is not None:
+            where += ' AND c.label_id = ?'
+            params.append(label_id)
         
-        content['reviews'] = reviews
-        conn.close()
-        return content
+        conn = self._get_connection()
+        try:
+            return self._query_contents(
+                conn.cursor(), where, tuple(params), limit,
+                joins='JOIN contents_fts ON contents_fts.rowid = c.id',
+                order_by='contents_fts.rank'
+            )
+        finally:
+            conn.close()
     
     def update_content(self, content_id: int, title: str, label_id: int) -> Dict:
         """Atualiza um conteúdo (não altera as datas de revisão)."""
@@ -288,6 +1047,11 @@ class DataManager:
             'UPDATE contents SET title = ?, label_id = ? WHERE id = ?',
             (title, label_id, content_id)
         )
+        if cursor.rowcount == 0:
+            cursor.execute(
+                'UPDATE archived_contents SET title = ?, label_id = ? WHERE id = ?',
+                (title, label_id, content_id)
+            )
         conn.commit()
         
         if cursor.rowcount == 0:
@@ -295,6 +1059,7 @@ class DataManager:
             return {'error': 'Conteúdo não encontrado'}
         
         conn.close()
+        self._invalidate_contents(content_id)
         return {'success': True}
     
     def delete_content(self, content_id: int) -> Dict:
@@ -302,7 +1067,13 @@ class DataManager:
         conn = self._get_connection()
         cursor = conn.cursor()
         
+        # As revisões saem explicitamente: o ON DELETE CASCADE só vale com
+        # PRAGMA foreign_keys ligado, e elas contariam em stats e nas pendências
+        cursor.execute('DELETE FROM reviews WHERE content_id = ?', (content_id,))
         cursor.execute('DELETE FROM contents WHERE id = ?', (content_id,))
+        if cursor.rowcount == 0:
+            cursor.execute('DELETE FROM archived_reviews WHERE content_id = ?', (content_id,))
+            cursor.execute('DELETE FROM archived_contents WHERE id = ?', (content_id,))
         conn.commit()
         
         if cursor.rowcount == 0:
@@ -310,6 +1081,7 @@ class DataManager:
             return {'error': 'Conteúdo não encontrado'}
         
         conn.close()
+        self._invalidate_contents(content_id)
         return {'success': True}
     
     # ==================== REVIEWS ====================
@@ -320,34 +1092,260 @@ class DataManager:
         Args:
             date: Data no formato ISO (YYYY-MM-DD). Se None, usa a data de hoje.
         """
-        if date is None:
-            date = datetime.now().date().isoformat()
+        try:
+            day = to_day(date if date is not None else datetime.now())
+        except (TypeError, ValueError):
+            return {'error': 'Data inválida'}
         
         conn = self._get_connection()
         cursor = conn.cursor()
         
-        cursor.execute('''
+        cursor.execute(f'''
+            {self._reviews_select()} WHERE r.scheduled_day = ?
+            UNION ALL
+            {self._reviews_select(archived=True)} WHERE r.scheduled_day = ?
+            ORDER BY completed ASC, title
+        ''', (day, day))
+        
+        reviews = self._review_rows(cursor.fetchall())
+        
+        conn.close()
+        return reviews
+    
+    @staticmethod
+    def _reviews_select(archived: bool = False) -> str:
+        """SELECT (sem WHERE) das revisões com conteúdo e label, no formato da API.
+        
+        A última coluna, scheduled_day, serve só para ordenar pelo índice (a
+        data formatada é uma expressão) e sai do resultado em _review_rows.
+        
+        Com archived=True lê do arquivo: as consultas por dia juntam as duas
+        partes com UNION ALL, e o calendário continua mostrando o histórico.
+        """
+        contents, reviews = ('archived_contents', 'archived_reviews') if archived else ('contents', 'reviews')
+        return f'''
             SELECT 
                 c.id as content_id, c.title, c.created_at,
                 l.id as label_id, l.name as label_name, l.color as label_color,
-                r.id as review_id, r.review_type, r.scheduled_date, 
-                r.completed, r.completed_at
+                r.id as review_id, t.name as review_type,
+                {sql_date('r.scheduled_day')} as scheduled_date,
+                r.completed, r.completed_at,
+                r.scheduled_day
+            FROM {reviews} r
+            JOIN review_types t ON t.id = r.review_type
+            JOIN {contents} c ON r.content_id = c.id
+            JOIN labels l ON c.label_id = l.id
+        '''
+    
+    @staticmethod
+    def _review_rows(rows) -> List[Dict]:
+        """Linhas de _reviews_select no formato da API (sem scheduled_day)."""
+        reviews = []
+        for row in rows:
+            review = dict(row)
+            del review['scheduled_day']
+            reviews.append(review)
+        return reviews
+    
+    _validate_range = staticmethod(validate_range)
+    
+    def get_reviews_by_range(self, start: str, end: str) -> List[Dict]:
+        """Retorna as revisões agendadas entre duas datas (inclusivas).
+        
+        Mesmo formato de get_reviews_by_date, ordenado por data. Usa uma
+        varredura de intervalo em idx_reviews_date (e outra no arquivo).
+        
+        Args:
+            start: Data inicial (YYYY-MM-DD)
+            end: Data final (YYYY-MM-DD)
+        """
+        error = self._validate_range(start, end)
+        if error:
+            return error
+        
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        days = (to_day(start), to_day(end))
+        cursor.execute(f'''
+            {self._reviews_select()} WHERE r.scheduled_day BETWEEN ? AND ?
+            UNION ALL
+            {self._reviews_select(archived=True)} WHERE r.scheduled_day BETWEEN ? AND ?
+            ORDER BY scheduled_day, completed ASC, title
+        ''', days + days)
+        
+        reviews = self._review_rows(cursor.fetchall())
+        
+        conn.close()
+        return reviews
+    
+    def get_review_summary(self, start: str, end: str) -> Dict[str, Dict]:
+        """Retorna a contagem de revisões pendentes e completas por dia.
+        
+        Dias sem revisões não aparecem no resultado.
+        
+        Args:
+            start: Data inicial (YYYY-MM-DD)
+            end: Data final (YYYY-MM-DD)
+        
+        Returns:
+            {'YYYY-MM-DD': {'pending': int, 'completed': int}, ...}
+        """
+        error = self._validate_range(start, end)
+        if error:
+            return error
+        
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        # O JOIN com contents mantém a contagem igual à de get_reviews_by_range
+        # (revisões arquivadas sempre têm o conteúdo no arquivo). Cada parte
+        # agrupa na ordem do seu índice, sem ordenação temporária, e os dias
+        # presentes nas duas são somados aqui.
+        days = (to_day(start), to_day(end))
+        cursor.execute('''
+            SELECT r.scheduled_day, SUM(r.completed = 0) as pending, SUM(r.completed = 1) as completed
             FROM reviews r
             JOIN contents c ON r.content_id = c.id
-            JOIN labels l ON c.label_id = l.id
-            WHERE r.scheduled_date = ?
-            ORDER BY r.completed ASC, c.title
-        ''', (date,))
+            WHERE r.scheduled_day BETWEEN ? AND ?
+            GROUP BY r.scheduled_day
+            UNION ALL
+            SELECT scheduled_day, SUM(completed = 0), SUM(completed = 1)
+            FROM archived_reviews
+            WHERE scheduled_day BETWEEN ? AND ?
+            GROUP BY scheduled_day
+        ''', days + days)
         
-        reviews = []
+        summary = {}
         for row in cursor.fetchall():
-            reviews.append(dict(row))
+            day = summary.setdefault(from_day(row['scheduled_day']), {'pending': 0, 'completed': 0})
+            day['pending'] += row['pending']
+            day['completed'] += row['completed']
+        summary = dict(sorted(summary.items()))
         
         conn.close()
-        return reviews
+        return summary
+    
+    def get_review_forecast(self, days: int = 30) -> Dict:
+        """Retorna quantas revisões pendentes vencem em cada um dos próximos dias.
+        
+        Lê review_pending_by_day (a contagem por dia já mantida pelos
+        triggers) em uma varredura de intervalo.
+        
+        Args:
+            days: Quantidade de dias a partir de hoje (1 a MAX_FORECAST_DAYS)
+        
+        Returns:
+            {'overdue': int, 'days': [{'date', 'pending'}] (um por dia, inclusive
+            os vazios), 'peak': {'date', 'pending'} ou None, 'daily_cap': int ou None}
+        """
+        if not isinstance(days, int) or not 1 <= days <= MAX_FORECAST_DAYS:
+            return {'error': f'O número de dias deve estar entre 1 e {MAX_FORECAST_DAYS}'}
+        
+        today = to_day(datetime.now())
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute(
+                'SELECT COALESCE(SUM(pending), 0) FROM review_pending_by_day WHERE scheduled_day < ?',
+                (today,)
+            )
+            overdue = cursor.fetchone()[0]
+            load = self._pending_load(cursor, today, today + days - 1)
+        finally:
+            conn.close()
+        
+        forecast = [
+            {'date': from_day(day), 'pending': load.get(day, 0)}
+            for day in range(today, today + days)
+        ]
+        peak = max(forecast, key=lambda entry: entry['pending'])
+        return {
+            'overdue': overdue,
+            'days': forecast,
+            'peak': peak if peak['pending'] else None,
+            'daily_cap': self.load_balancer.daily_cap if self.load_balancer else None
+        }
+    
+    def get_overdue_reviews(self, cursor: Optional[str] = None, limit: int = 50,
+                            label_id: Optional[int] = None) -> Dict:
+        """Retorna uma página das revisões pendentes até hoje (as mais antigas primeiro).
+        
+        São as revisões contadas em pending_today. Paginação por cursor
+        (keyset) sobre (scheduled_day, id), na ordem de idx_reviews_pending.
+        
+        Args:
+            cursor: Valor de 'next_cursor' da página anterior (None = primeira)
+            limit: Tamanho da página (1 a 500)
+            label_id: Filtra por label
+        
+        Returns:
+            {'items': [...], 'next_cursor': str ou None, 'total': int ou None}.
+            'total' só vem na primeira página: sem filtro é lido de
+            review_pending_by_day; com label, é contado no mesmo intervalo do índice.
+        """
+        if not isinstance(limit, int) or not 1 <= limit <= 500:
+            return {'error': 'O limite deve estar entre 1 e 500'}
+        
+        today = to_day(datetime.now())
+        conditions = ['r.completed = 0', 'r.scheduled_day <= ?']
+        params = [today]
+        
+        if cursor is not None:
+            parts = cursor.split('|') if isinstance(cursor, str) else []
+            try:
+                cursor_day, cursor_id = (int(part) for part in parts)
+            except ValueError:  # Também com mais ou menos que duas partes
+                return {'error': 'Cursor inválido'}
+            conditions.append('(r.scheduled_day, r.id) > (?, ?)')
+            params.extend([cursor_day, cursor_id])
+        
+        if label_id is not None:
+            conditions.append('c.label_id = ?')
+            params.append(label_id)
+        
+        where = ' AND '.join(conditions)
+        conn = self._get_connection()
+        db_cursor = conn.cursor()
+        try:
+            # Um item a mais só para saber se existe próxima página
+            db_cursor.execute(f'''
+                {self._reviews_select()} WHERE {where}
+                ORDER BY r.scheduled_day, r.id
+                LIMIT ?
+            ''', (*params, limit + 1))
+            rows = db_cursor.fetchall()
+            
+            total = None
+            if cursor is None and label_id is None:
+                db_cursor.execute(
+                    'SELECT COALESCE(SUM(pending), 0) FROM review_pending_by_day WHERE scheduled_day <= ?',
+                    (today,)
+                )
+                total = db_cursor.fetchone()[0]
+            elif cursor is None:
+                db_cursor.execute(f'''
+                    SELECT COUNT(*) FROM reviews r
+                    JOIN contents c ON r.content_id = c.id
+                    WHERE {where}
+                ''', params)
+                total = db_cursor.fetchone()[0]
+        finally:
+            conn.close()
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = f"{rows[-1]['scheduled_day']}|{rows[-1]['review_id']}"
+        
+        return {'items': self._review_rows(rows), 'next_cursor': next_cursor, 'total': total}
     
     def mark_review_completed(self, content_id: int, review_type: str) -> Dict:
-        """Marca uma revisão específica como completa."""
+        """Marca uma revisão específica como completa.
+        
+        Marcar de novo uma revisão arquivada (sempre completa) não a tira do
+        arquivo: retorna sucesso com o completed_at já gravado.
+        """
         conn = self._get_connection()
         cursor = conn.cursor()
         
@@ -356,16 +1354,21 @@ class DataManager:
         cursor.execute('''
             UPDATE reviews 
             SET completed = 1, completed_at = ?
-            WHERE content_id = ? AND review_type = ?
+            WHERE content_id = ? AND review_type = (SELECT id FROM review_types WHERE name = ?)
         ''', (completed_at, content_id, review_type))
+        updated = cursor.rowcount
         
         conn.commit()
         
-        if cursor.rowcount == 0:
+        if updated == 0:
+            archived_at = self._archived_completed_at(cursor, content_id, review_type)
             conn.close()
+            if archived_at is not None:
+                return {'success': True, 'completed_at': archived_at}
             return {'error': 'Revisão não encontrada'}
         
         conn.close()
+        self._invalidate_contents(content_id)
         return {'success': True, 'completed_at': completed_at}
     
     def unmark_review_completed(self, content_id: int, review_type: str) -> Dict:
@@ -373,11 +1376,14 @@ class DataManager:
         conn = self._get_connection()
         cursor = conn.cursor()
         
-        cursor.execute('''
+        unmark = '''
             UPDATE reviews 
             SET completed = 0, completed_at = NULL
-            WHERE content_id = ? AND review_type = ?
-        ''', (content_id, review_type))
+            WHERE content_id = ? AND review_type = (SELECT id FROM review_types WHERE name = ?)
+        '''
+        cursor.execute(unmark, (content_id, review_type))
+        if cursor.rowcount == 0 and self._restore_archived(cursor, [content_id]):
+            cursor.execute(unmark, (content_id, review_type))
         
         conn.commit()
         
@@ -386,43 +1392,716 @@ class DataManager:
             return {'error': 'Revisão não encontrada'}
         
         conn.close()
+        self._invalidate_contents(content_id)
         return {'success': True}
     
-    def get_statistics(self) -> Dict:
-        """Retorna estatísticas gerais do sistema."""
+    def mark_reviews_completed(self, pairs: List) -> List[Dict]:
+        """Marca várias revisões como completas em uma única transação.
+        
+        Args:
+            pairs: Lista de [content_id, review_type] ou {'content_id', 'review_type'}
+        
+        Returns:
+            Um resultado por item, na mesma ordem: o de mark_review_completed
+            mais 'content_id' e 'review_type', ou {'error': ...}
+        """
+        return self._set_reviews_completed(pairs, True)
+    
+    def unmark_reviews_completed(self, pairs: List) -> List[Dict]:
+        """Desmarca várias revisões em uma única transação (ver mark_reviews_completed)."""
+        return self._set_reviews_completed(pairs, False)
+    
+    def _set_reviews_completed(self, pairs: List, completed: bool) -> List[Dict]:
+        """Marca ou desmarca uma lista de revisões com um único commit."""
+        completed_at = datetime.now().isoformat() if completed else None
+        results = []
+        touched = set()
+        
         conn = self._get_connection()
         cursor = conn.cursor()
+        own_transaction = not conn.in_transaction
+        try:
+            if own_transaction:
+                cursor.execute('BEGIN IMMEDIATE')
+            
+            for pair in pairs:
+                if isinstance(pair, dict):
+                    pair = (pair.get('content_id'), pair.get('review_type'))
+                if not isinstance(pair, (list, tuple)) or len(pair) != 2:
+                    results.append({'error': 'Item inválido'})
+                    continue
+                
+                content_id, review_type = pair
+                if isinstance(content_id, bool) or not isinstance(content_id, int) or not isinstance(review_type, str):
+                    results.append({'error': 'Item inválido'})
+                    continue
+                
+                update = '''
+                    UPDATE reviews 
+                    SET completed = ?, completed_at = ?
+                    WHERE content_id = ? AND review_type = (SELECT id FROM review_types WHERE name = ?)
+                '''
+                params = (int(completed), completed_at, content_id, review_type)
+                cursor.execute(update, params)
+                if cursor.rowcount == 0 and not completed and self._restore_archived(cursor, [content_id]):
+                    cursor.execute(update, params)
+                
+                if cursor.rowcount == 0:
+                    archived_at = self._archived_completed_at(cursor, content_id, review_type) if completed else None
+                    if archived_at is None:
+                        results.append({'error': 'Revisão não encontrada'})
+                    else:
+                        results.append({'success': True, 'content_id': content_id,
+                                        'review_type': review_type, 'completed_at': archived_at})
+                    continue
+                
+                touched.add(content_id)
+                result = {'success': True, 'content_id': content_id, 'review_type': review_type}
+                if completed:
+                    result['completed_at'] = completed_at
+                results.append(result)
+            
+            conn.commit()
+        finally:
+            conn.close()
+        
+        if touched:
+            self._invalidate_contents()
+            self._cache.invalidate(*(('content', content_id) for content_id in touched))
+        return results
+    
+    def mark_reviews_completed_by_date(self, date: str = None) -> Dict:
+        """Marca como completas todas as revisões pendentes de um dia.
+        
+        Args:
+            date: Data no formato ISO (YYYY-MM-DD). Se None, usa a data de hoje.
         
-        # Total de conteúdos
-        cursor.execute('SELECT COUNT(*) as count FROM contents')
-        total_contents = cursor.fetchone()['count']
+        Returns:
+            {'updated': int, 'reviews': [{'content_id', 'review_type'}], 'completed_at': str}
+        """
+        return self._set_reviews_completed_by_date(date, True)
+    
+    def unmark_reviews_completed_by_date(self, date: str = None) -> Dict:
+        """Desmarca todas as revisões completas de um dia (ver mark_reviews_completed_by_date)."""
+        return self._set_reviews_completed_by_date(date, False)
+    
+    def _set_reviews_completed_by_date(self, date: Optional[str], completed: bool) -> Dict:
+        """Marca ou desmarca as revisões de um dia com um único commit."""
+        try:
+            day = to_day(date if date is not None else datetime.now())
+        except (TypeError, ValueError):
+            return {'error': 'Data inválida'}
+        
+        completed_at = datetime.now().isoformat() if completed else None
+        
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        own_transaction = not conn.in_transaction
+        try:
+            if own_transaction:
+                cursor.execute('BEGIN IMMEDIATE')
+            
+            if not completed:
+                # Desmarcar revisões arquivadas devolve os conteúdos às tabelas ativas
+                cursor.execute(
+                    'SELECT DISTINCT content_id FROM archived_reviews WHERE scheduled_day = ? AND completed = 1',
+                    (day,)
+                )
+                self._restore_archived(cursor, [row[0] for row in cursor.fetchall()])
+            
+            # Mesmas revisões que get_reviews_by_date mostra para o dia
+            cursor.execute('''
+                SELECT r.id, r.content_id, t.name as review_type
+                FROM reviews r
+                JOIN review_types t ON t.id = r.review_type
+                JOIN contents c ON r.content_id = c.id
+                WHERE r.scheduled_day = ? AND r.completed = ?
+                ORDER BY r.id
+            ''', (day, int(not completed)))
+            rows = cursor.fetchall()
+            
+            cursor.executemany(
+                'UPDATE reviews SET completed = ?, completed_at = ? WHERE id = ?',
+                ((int(completed), completed_at, row['id']) for row in rows)
+            )
+            conn.commit()
+        finally:
+            conn.close()
         
-        # Total de labels
-        cursor.execute('SELECT COUNT(*) as count FROM labels')
-        total_labels = cursor.fetchone()['count']
+        if rows:
+            self._invalidate_contents()
+            self._cache.invalidate(*(('content', row['content_id']) for row in rows))
         
-        # Revisões pendentes hoje
-        today = datetime.now().date().isoformat()
+        result = {
+            'updated': len(rows),
+            'reviews': [
+                {'content_id': row['content_id'], 'review_type': row['review_type']}
+                for row in rows
+            ]
+        }
+        if completed:
+            result['completed_at'] = completed_at
+        return result
+    
+    def get_statistics(self) -> Dict:
+        """Retorna estatísticas gerais do sistema.
+        
+        Lê os contadores mantidos por triggers em vez de varrer as tabelas.
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT key, value FROM stats')
+        stats = {row['key']: row['value'] for row in cursor.fetchall()}
+        
+        # Revisões pendentes até hoje
         cursor.execute('''
-            SELECT COUNT(*) as count FROM reviews 
-            WHERE scheduled_date <= ? AND completed = 0
-        ''', (today,))
+            SELECT COALESCE(SUM(pending), 0) as count FROM review_pending_by_day
+            WHERE scheduled_day <= ?
+        ''', (to_day(datetime.now()),))
         pending_today = cursor.fetchone()['count']
         
-        # Revisões completadas
-        cursor.execute('SELECT COUNT(*) as count FROM reviews WHERE completed = 1')
-        completed_reviews = cursor.fetchone()['count']
+        conn.close()
+        
+        return self.statistics_from(stats, pending_today)
+    
+    @staticmethod
+    def statistics_from(stats: Dict[str, int], pending_today: int) -> Dict:
+        """Monta o resultado de get_statistics a partir da tabela stats.
+        
+        Chaves ausentes (banco de uma versão anterior) contam como zero.
+        """
+        stats = Counter(stats)
+        # Os totais contam também o arquivo (só tem revisões completas)
+        return {
+            'total_contents': stats['total_contents'] + stats['archived_contents'],
+            'total_labels': stats['total_labels'],
+            'pending_today': pending_today,
+            'completed_reviews': stats['completed_reviews'] + stats['archived_reviews'],
+            'total_reviews': stats['total_reviews'] + stats['archived_reviews'],
+            'archived_contents': stats['archived_contents']
+        }
+    
+    # ==================== SCHEDULING ====================
+    
+    def _get_setting(self, key: str, default: str) -> str:
+        """Lê uma preferência salva no banco."""
+        conn = self._get_connection()
+        row = conn.execute('SELECT value FROM settings WHERE key = ?', (key,)).fetchone()
+        conn.close()
+        return row['value'] if row else default
+    
+    def set_scheduler(self, name: str) -> Dict:
+        """Escolhe (e salva) o algoritmo usado para agendar conteúdos novos.
         
-        # Total de revisões
-        cursor.execute('SELECT COUNT(*) as count FROM reviews')
-        total_reviews = cursor.fetchone()['count']
+        Revisões já agendadas só mudam com reschedule_reviews().
+        """
+        try:
+            scheduler = get_scheduler(name)
+        except KeyError:
+            return {'error': f'Agendador desconhecido: {name}'}
         
+        conn = self._get_connection()
+        conn.execute('''
+            INSERT INTO settings (key, value) VALUES ('scheduler', ?)
+            ON CONFLICT (key) DO UPDATE SET value = excluded.value
+        ''', (name,))
+        conn.commit()
         conn.close()
+        self.scheduler = scheduler
+        return {'success': True, 'scheduler': name}
+    
+    def set_load_balancing(self, daily_cap: Optional[int]) -> Dict:
+        """Liga (com o limite diário) ou desliga (None ou 0) o balanceamento de carga.
         
+        Vale para conteúdos criados daqui em diante, um a um ou importados.
+        """
+        if daily_cap is None:
+            daily_cap = 0
+        if not isinstance(daily_cap, int) or daily_cap < 0:
+            return {'error': 'O limite diário deve ser um inteiro positivo'}
+        
+        conn = self._get_connection()
+        conn.execute('''
+            INSERT INTO settings (key, value) VALUES ('load_balance_cap', ?)
+            ON CONFLICT (key) DO UPDATE SET value = excluded.value
+        ''', (str(daily_cap),))
+        conn.commit()
+        conn.close()
+        self.load_balancer = LoadBalancer(daily_cap, LOAD_BALANCE_TOLERANCE) if daily_cap else None
+        return {'success': True, 'daily_cap': daily_cap or None}
+    
+    def reschedule_reviews(self) -> Dict:
+        """Recalcula com o agendador atual as datas de todas as revisões pendentes.
+        
+        Lê as revisões em colunas em uma única consulta, calcula as novas
+        datas em uma passada e grava só as que mudaram em uma transação, com
+        os triggers por linha desligados (bulk_load) e a manutenção de
+        review_pending_by_day e change_log feita em lote.
+        
+        Returns:
+            {'scheduler': str, 'updated': int, 'contents': int}
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        own_transaction = not conn.in_transaction
+        
+        try:
+            if own_transaction:
+                cursor.execute('BEGIN IMMEDIATE')
+            
+            cursor.row_factory = None  # Tuplas: montar as colunas é mais rápido
+            cursor.execute(f'''
+                SELECT
+                    r.id, r.content_id, r.review_type,
+                    CAST(julianday(substr(c.created_at, 1, 10)) - {EPOCH_JULIAN_DAY} AS INTEGER),
+                    r.scheduled_day,
+                    CASE WHEN r.completed = 1
+                        THEN COALESCE(
+                            CAST(julianday(substr(r.completed_at, 1, 10)) - {EPOCH_JULIAN_DAY} AS INTEGER),
+                            r.scheduled_day
+                        )
+                        ELSE -1
+                    END
+                FROM reviews r
+                JOIN contents c ON c.id = r.content_id
+                ORDER BY r.content_id, r.review_type
+            ''')
+            reviews = ReviewColumns(cursor.fetchall())
+            
+            new_days = self.scheduler.reschedule(reviews)
+            changed = [
+                (new_day, review_id, content_id)
+                for new_day, old_day, review_id, content_id
+                in zip(new_days, reviews.scheduled_day, reviews.id, reviews.content_id)
+                if new_day != old_day
+            ]
+            changes = [(new_day, review_id) for new_day, review_id, _ in changed]
+            changed_contents = sorted({content_id for _, _, content_id in changed})
+            
+            if changes:
+                cursor.execute('INSERT INTO bulk_load (active) VALUES (1)')
+                cursor.executemany('UPDATE reviews SET scheduled_day = ? WHERE id = ?', changes)
+                cursor.execute('DELETE FROM bulk_load')
+                self._rebuild_pending_by_day(cursor)
+                cursor.executemany(
+                    "INSERT INTO change_log (entity, row_id) VALUES ('contents', ?)",
+                    ((content_id,) for content_id in changed_contents)
+                )
+            conn.commit()
+        finally:
+            conn.close()
+            self._invalidate_contents()
+            self._cache.invalidate_namespace('content')
+        
+        if changed_contents:
+            self._compact_change_log_if_large()
         return {
-            'total_contents': total_contents,
-            'total_labels': total_labels,
-            'pending_today': pending_today,
-            'completed_reviews': completed_reviews,
-            'total_reviews': total_reviews
+            'scheduler': self.scheduler.name,
+            'updated': len(changes),
+            'contents': len(changed_contents)
         }
+    
+    # ==================== ARCHIVE ====================
+    
+    def archive_completed(self, older_than_days: int = ARCHIVE_AFTER_DAYS) -> Dict:
+        """Move para o arquivo os conteúdos com todas as revisões completas.
+        
+        Só entram conteúdos cuja última revisão foi completada há mais de
+        `older_than_days` dias. Eles saem de contents, reviews e da busca, e
+        get_changes_since os informa como removidos; as consultas por dia
+        continuam mostrando as revisões arquivadas, marcá-las de novo não
+        muda nada e desmarcar uma delas devolve o conteúdo às tabelas ativas.
+        
+        Returns:
+            {'archived': int (conteúdos), 'reviews': int}
+        """
+        cutoff = (datetime.now() - timedelta(days=older_than_days)).isoformat()
+        
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        own_transaction = not conn.in_transaction
+        try:
+            if own_transaction:
+                cursor.execute('BEGIN IMMEDIATE')
+            
+            cursor.execute('CREATE TEMP TABLE IF NOT EXISTS archive_ids (id INTEGER PRIMARY KEY)')
+            cursor.execute('''
+                INSERT INTO archive_ids (id)
+                SELECT r.content_id
+                FROM reviews r
+                JOIN contents c ON c.id = r.content_id
+                GROUP BY r.content_id
+                HAVING MIN(r.completed) = 1 AND MAX(r.completed_at) < ?
+            ''', (cutoff,))
+            archived = cursor.rowcount
+            
+            reviews = 0
+            if archived:
+                cursor.execute('''
+                    INSERT INTO archived_contents (id, title, label_id, created_at, archived_at)
+                    SELECT id, title, label_id, created_at, ?
+                    FROM contents WHERE id IN (SELECT id FROM archive_ids)
+                ''', (datetime.now().isoformat(),))
+                cursor.execute('''
+                    INSERT INTO archived_reviews (id, content_id, review_type, scheduled_day, completed, completed_at)
+                    SELECT id, content_id, review_type, scheduled_day, completed, completed_at
+                    FROM reviews WHERE content_id IN (SELECT id FROM archive_ids)
+                ''')
+                reviews = cursor.rowcount
+                cursor.execute('DELETE FROM reviews WHERE content_id IN (SELECT id FROM archive_ids)')
+                cursor.execute('DELETE FROM contents WHERE id IN (SELECT id FROM archive_ids)')
+            cursor.execute('DELETE FROM archive_ids')
+            conn.commit()
+        finally:
+            conn.close()
+        
+        if archived:
+            self._invalidate_contents()
+            self._cache.invalidate_namespace('content')
+            self._compact_change_log_if_large()
+        return {'archived': archived, 'reviews': reviews}
+    
+    @staticmethod
+    def _archived_completed_at(cursor, content_id: int, review_type: str) -> Optional[str]:
+        """completed_at de uma revisão arquivada, ou None se ela não estiver no arquivo."""
+        cursor.execute('''
+            SELECT completed_at FROM archived_reviews
+            WHERE content_id = ? AND review_type = (SELECT id FROM review_types WHERE name = ?)
+        ''', (content_id, review_type))
+        row = cursor.fetchone()
+        return row[0] if row else None
+    
+    def _restore_archived(self, cursor, content_ids: List[int]) -> int:
+        """Devolve conteúdos arquivados (e suas revisões) às tabelas ativas.
+        
+        Roda na transação de quem chama; retorna quantos conteúdos voltaram.
+        """
+        if not content_ids:
+            return 0
+        ids_json = json.dumps(content_ids)
+        cursor.execute('''
+            INSERT INTO contents (id, title, label_id, created_at)
+            SELECT id, title, label_id, created_at
+            FROM archived_contents WHERE id IN (SELECT value FROM json_each(?))
+        ''', (ids_json,))
+        restored = cursor.rowcount
+        if restored:
+            cursor.execute('''
+                INSERT INTO reviews (id, content_id, review_type, scheduled_day, completed, completed_at)
+                SELECT id, content_id, review_type, scheduled_day, completed, completed_at
+                FROM archived_reviews WHERE content_id IN (SELECT value FROM json_each(?))
+            ''', (ids_json,))
+            cursor.execute('DELETE FROM archived_reviews WHERE content_id IN (SELECT value FROM json_each(?))', (ids_json,))
+            cursor.execute('DELETE FROM archived_contents WHERE id IN (SELECT value FROM json_each(?))', (ids_json,))
+            self._invalidate_contents()
+        return restored
+    
+    # ==================== EXPORT ====================
+    
+    def iter_export_records(self) -> Iterator[Dict]:
+        """Gera todos os dados como registros {'type': ..., ...}, em streaming.
+        
+        Ordem: 'meta', 'setting', 'label', 'content' e 'review'. Datas de
+        revisão saem em ISO e tipos pelo nome; o que está no arquivo vem com
+        'archived_at' (conteúdos) ou 'archived': True (revisões). Tudo sai do
+        mesmo snapshot do banco.
+        """
+        conn = self._get_connection()
+        try:
+            if not conn.in_transaction:
+                conn.execute('BEGIN')
+            
+            yield {'type': 'meta', 'format': EXPORT_FORMAT, 'exported_at': datetime.now().isoformat()}
+            
+            for row in conn.execute("SELECT key, value FROM settings WHERE key != 'schema_stamp' ORDER BY key"):
+                yield {'type': 'setting', 'key': row['key'], 'value': row['value']}
+            
+            for row in conn.execute('SELECT id, name, color, created_at FROM labels ORDER BY id'):
+                yield {'type': 'label', **dict(row)}
+            
+            for row in conn.execute('SELECT id, title, label_id, created_at FROM contents ORDER BY id'):
+                yield {'type': 'content', **dict(row)}
+            for row in conn.execute(
+                'SELECT id, title, label_id, created_at, archived_at FROM archived_contents ORDER BY id'
+            ):
+                yield {'type': 'content', **dict(row)}
+            
+            # Sem apelido na tabela de revisões: o plano de consulta mostra o
+            # nome dela (test_query_plans só permite varrer tabelas conhecidas)
+            for table, extra in (('reviews', {}), ('archived_reviews', {'archived': True})):
+                for row in conn.execute(f'''
+                    SELECT {table}.id, {table}.content_id, t.name, {sql_date(f'{table}.scheduled_day')},
+                           {table}.completed, {table}.completed_at
+                    FROM {table}
+                    JOIN review_types t ON t.id = {table}.review_type
+                    ORDER BY {table}.id
+                '''):
+                    yield {
+                        'type': 'review',
+                        'id': row[0],
+                        'content_id': row[1],
+                        'review_type': row[2],
+                        'scheduled_date': row[3],
+                        'completed': bool(row[4]),
+                        'completed_at': row[5],
+                        **extra
+                    }
+        finally:
+            conn.close()  # Também encerra a transação de leitura
+    
+    def restore_records(self, records: Iterable[Dict], chunk_size: int = 5000,
+                        progress: Optional[Callable[[int], None]] = None) -> Dict:
+        """Grava em um banco vazio os registros de iter_export_records.
+        
+        Tudo roda em uma única transação (uma restauração pela metade é
+        desfeita), com os triggers de INSERT desligados e as estatísticas,
+        a busca e o log de alterações refeitos no fim. Clientes sincronizados
+        antes recebem 'reset' em get_changes_since.
+        
+        Args:
+            records: Registros na ordem da exportação (o primeiro é 'meta')
+            chunk_size: Registros por executemany
+            progress: Chamado com o total de registros gravados a cada lote
+        
+        Returns:
+            Contagem de registros gravados por tipo ou {'error': ...}
+        
+        Raises:
+            ValueError: Registro inválido ou sem o 'meta' inicial (nada é gravado)
+        """
+        # O 'meta' é conferido antes de abrir a transação: um arquivo vazio
+        # ou de outro formato não toca no banco
+        records = iter(records)
+        meta = next(records, None)
+        if meta is None:
+            raise ValueError("Exportação vazia: falta o registro 'meta'")
+        if not isinstance(meta, dict) or meta.get('type') != 'meta':
+            raise ValueError("Registro 1: não é uma exportação do MethodJS (falta o registro 'meta')")
+        if meta.get('format') != EXPORT_FORMAT:
+            raise ValueError(f"Registro 1: formato {meta.get('format')!r} não suportado (esperado {EXPORT_FORMAT})")
+        
+        statements = {
+            'setting': 'INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)',
+            'label': 'INSERT INTO labels (id, name, color, created_at) VALUES (?, ?, ?, ?)',
+            'content': 'INSERT INTO contents (id, title, label_id, created_at) VALUES (?, ?, ?, ?)',
+            'archived_content': '''
+                INSERT INTO archived_contents (id, title, label_id, created_at, archived_at)
+                VALUES (?, ?, ?, ?, ?)
+            ''',
+            'review': '''
+                INSERT INTO reviews (id, content_id, review_type, scheduled_day, completed, completed_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''',
+            'archived_review': '''
+                INSERT INTO archived_reviews (id, content_id, review_type, scheduled_day, completed, completed_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''',
+        }
+        counts = {'setting': 0, 'label': 0, 'content': 0, 'review': 0}
+        pending: Dict[str, List[tuple]] = {kind: [] for kind in statements}
+        
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        def flush():
+            for kind, rows in pending.items():
+                if rows:
+                    cursor.executemany(statements[kind], rows)
+                    rows.clear()
+            if progress:
+                progress(sum(counts.values()))
+        
+        try:
+            if not conn.in_transaction:
+                cursor.execute('BEGIN IMMEDIATE')
+            cursor.execute('''
+                SELECT EXISTS (SELECT 1 FROM labels) OR EXISTS (SELECT 1 FROM contents)
+                    OR EXISTS (SELECT 1 FROM archived_contents)
+            ''')
+            if cursor.fetchone()[0]:
+                return {'error': 'A restauração precisa de um banco vazio'}
+            
+            cursor.execute('SELECT name, id FROM review_types')
+            type_codes = {row['name']: row['id'] for row in cursor.fetchall()}
+            
+            cursor.execute('INSERT INTO bulk_load (active) VALUES (1)')
+            for index, record in enumerate(records, start=1):
+                kind = record.get('type') if isinstance(record, dict) else None
+                try:
+                    if kind == 'setting':
+                        if record['key'] == 'schema_stamp':
+                            continue
+                        row = (record['key'], str(record['value']))
+                    elif kind == 'label':
+                        row = (record['id'], record['name'], record['color'], record['created_at'])
+                    elif kind == 'content':
+                        row = (record['id'], record['title'], record['label_id'], record['created_at'])
+                        if record.get('archived_at'):
+                            kind, row = 'archived_content', (*row, record['archived_at'])
+                    elif kind == 'review':
+                        code = type_codes.get(record['review_type'])
+                        if code is None:
+                            raise ValueError(f"tipo de revisão desconhecido: {record['review_type']}")
+                        row = (
+                            record['id'], record['content_id'], code, to_day(record['scheduled_date']),
+                            int(bool(record['completed'])), record.get('completed_at')
+                        )
+                        if record.get('archived'):
+                            kind = 'archived_review'
+                    else:
+                        raise ValueError(f'tipo de registro desconhecido: {kind}')
+                except (KeyError, TypeError, ValueError) as error:
+                    raise ValueError(f'Registro {index + 1}: {error}') from None
+                
+                pending[kind].append(row)
+                counts[kind.replace('archived_', '')] += 1
+                if len(pending[kind]) >= chunk_size:
+                    flush()
+            flush()
+            cursor.execute('DELETE FROM bulk_load')
+            
+            # Contas e índices que os triggers fariam linha a linha
+            self._rebuild_statistics(cursor)
+            cursor.execute("INSERT INTO contents_fts (contents_fts) VALUES ('rebuild')")
+            # Ids do arquivo não podem ser reusados por conteúdos novos, e o log
+            # zerado fica com versão acima de qualquer uma já entregue (reset)
+            cursor.execute('DELETE FROM change_log')
+            for table, at_least in (
+                ('contents', '(SELECT MAX(id) FROM archived_contents)'),
+                ('reviews', '(SELECT MAX(id) FROM archived_reviews)'),
+                ('change_log', 'seq + 1'),
+            ):
+                cursor.execute(
+                    'INSERT INTO sqlite_sequence (name, seq) SELECT ?, 0 '
+                    'WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = ?)',
+                    (table, table)
+                )
+                cursor.execute(
+                    f'UPDATE sqlite_sequence SET seq = MAX(seq, COALESCE({at_least}, 0)) WHERE name = ?',
+                    (table,)
+                )
+            conn.commit()
+        finally:
+            conn.close()
+            self._cache.clear()
+        
+        self._load_settings()
+        return {f'{kind}s': count for kind, count in counts.items()}
+    
+    # ==================== CHANGES ====================
+    
+    def get_changes_since(self, version: int) -> Dict:
+        """Retorna as labels e conteúdos alterados depois de `version`.
+        
+        Cada linha aparece uma vez, no estado atual; as que não existem mais
+        vão em 'deleted'. Renomear uma label não registra os conteúdos dela:
+        quem sincroniza aplica o nome/cor novos a partir de 'labels'.
+        
+        Se as entradas depois de `version` já foram compactadas, retorna
+        'reset': True e o consumidor deve reler tudo a partir de 'version'.
+        
+        Returns:
+            {'version', 'reset', 'labels', 'contents', 'deleted': {'labels', 'contents'}}
+        """
+        try:
+            version = int(version)
+        except (TypeError, ValueError):
+            return {'error': 'Versão inválida'}
+        
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        own_transaction = not conn.in_transaction
+        try:
+            if own_transaction:
+                cursor.execute('BEGIN')  # Versão e linhas do mesmo snapshot
+            
+            cursor.execute('''
+                SELECT
+                    COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'change_log'), 0),
+                    (SELECT MIN(version) FROM change_log)
+            ''')
+            current, oldest = cursor.fetchone()
+            # Tudo até `floor` já foi compactado (ou é anterior ao log)
+            floor = current if oldest is None else oldest - 1
+            
+            changes = {
+                'version': current,
+                'reset': version < floor,
+                'labels': [],
+                'contents': [],
+                'deleted': {'labels': [], 'contents': []}
+            }
+            if changes['reset'] or version >= current:
+                return changes
+            
+            for entity in ('labels', 'contents'):
+                cursor.execute(
+                    'SELECT DISTINCT row_id FROM change_log WHERE version > ? AND entity = ?',
+                    (version, entity)
+                )
+                ids = [row[0] for row in cursor.fetchall()]
+                if not ids:
+                    continue
+                ids_json = json.dumps(ids)
+                
+                if entity == 'labels':
+                    cursor.execute(
+                        'SELECT * FROM labels WHERE id IN (SELECT value FROM json_each(?)) ORDER BY id',
+                        (ids_json,)
+                    )
+                    rows = [dict(row) for row in cursor.fetchall()]
+                else:
+                    rows = self._query_contents(
+                        cursor, 'WHERE c.id IN (SELECT value FROM json_each(?))',
+                        (ids_json,), order_by='c.id'
+                    )
+                
+                changes[entity] = rows
+                found = {row['id'] for row in rows}
+                changes['deleted'][entity] = [row_id for row_id in ids if row_id not in found]
+            
+            return changes
+        finally:
+            if own_transaction:
+                conn.commit()
+            conn.close()
+    
+    def _compact_change_log_if_large(self):
+        """Compacta só quando o log passou do dobro do tamanho mantido."""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        # Duas subconsultas: cada uma lê uma ponta da chave (MAX - MIN juntos varre a tabela)
+        cursor.execute('SELECT (SELECT MAX(version) FROM change_log) - (SELECT MIN(version) FROM change_log)')
+        span = cursor.fetchone()[0] or 0
+        conn.close()
+        if span >= 2 * CHANGE_LOG_KEEP:
+            self.compact_change_log()
+    
+    def compact_change_log(self, keep: int = CHANGE_LOG_KEEP) -> int:
+        """Encolhe change_log e retorna quantas entradas foram removidas.
+        
+        Primeiro remove entradas repetidas da mesma linha (só a mais recente
+        importa para get_changes_since). Depois, se ainda houver mais de
+        `keep`, descarta as mais antigas: quem estiver nessas versões recebe
+        'reset'.
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute('''
+                DELETE FROM change_log WHERE version NOT IN (
+                    SELECT MAX(version) FROM change_log GROUP BY entity, row_id
+                )
+            ''')
+            removed = cursor.rowcount
+            cursor.execute('''
+                DELETE FROM change_log WHERE version <= (
+                    SELECT version FROM change_log ORDER BY version DESC LIMIT 1 OFFSET ?
+                )
+            ''', (keep,))
+            removed += cursor.rowcount
+            conn.commit()
+            return removed
+        finally:
+            conn.close()
@@ -0,0 +1,44 @@
+"""
+Encoding - Representação compacta de datas e tipos de revisão no banco
+As datas de revisão são gravadas como número de dias desde 1970-01-01 e os
+tipos de revisão como inteiros pequenos (tabela review_types). A API continua
+recebendo e devolvendo datas ISO (YYYY-MM-DD) e os nomes dos tipos.
+"""
+from datetime import date, datetime
+from typing import Union
+
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# Dia juliano de 1970-01-01 à meia-noite: date(dia + EPOCH_JULIAN_DAY) no SQL
+EPOCH_JULIAN_DAY = 2440587.5
+
+# Código de cada tipo = posição na tupla (novos tipos só no final)
+REVIEW_TYPES = ('next_day', 'one_week', 'one_month', 'three_months')
+REVIEW_TYPE_CODES = {name: code for code, name in enumerate(REVIEW_TYPES)}
+
+
+def to_day(value: Union[str, date, datetime]) -> int:
+    """Converte uma data (ISO, date ou datetime) em número de dias.
+
+    Raises:
+        ValueError: Se o texto não for uma data ISO
+        TypeError: Se o valor não for texto, date nem datetime
+    """
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if isinstance(value, datetime):
+        value = value.date()
+    if not isinstance(value, date):
+        raise TypeError(f'Data inválida: {value!r}')
+    return value.toordinal() - EPOCH_ORDINAL
+
+
+def from_day(day: int) -> str:
+    """Converte um número de dias na data ISO (YYYY-MM-DD)."""
+    return date.fromordinal(day + EPOCH_ORDINAL).isoformat()
+
+
+def sql_date(column: str) -> str:
+    """Expressão SQL que converte a coluna de dias em data ISO."""
+    return f'date({column} + {EPOCH_JULIAN_DAY})'
@@ -0,0 +1,133 @@
+"""
+Events - Envio de alterações do Python para a janela (deltas em vez de recargas)
+Os eventos emitidos em uma janela curta de tempo são agrupados e
+compactados por entidade antes de irem para a UI em um único evaluate_js.
+
+No JavaScript chegam como:
+    window.addEventListener('methodjs:changes', (e) => e.detail.events)
+onde cada evento é {type: 'added' | 'changed' | 'removed', entity, id, data}.
+"""
+import json
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+JS_EVENT_NAME = 'methodjs:changes'
+
+
+class EventPusher:
+    """Agrupa eventos de alteração e os envia à janela."""
+
+    def __init__(self, send: Callable[[str], object], window_ms: float = 50,
+                 stats_provider: Optional[Callable[[], Dict]] = None):
+        """Cria o emissor.
+
+        Args:
+            send: Executa JavaScript na janela (ex.: window.evaluate_js)
+            window_ms: Tempo de agrupamento dos eventos
+            stats_provider: Fornece as estatísticas enviadas no evento 'stats'
+        """
+        self._send = send
+        self.window_ms = window_ms
+        self._stats_provider = stats_provider
+        # (entity, id) -> evento; dict mantém a ordem da primeira emissão
+        self._pending: Dict[Tuple[str, object], Dict] = {}
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._local = threading.local()
+        self._closed = False
+
+    def emit(self, type_: str, entity: str, id_=None, data=None):
+        """Registra um evento ('added', 'changed' ou 'removed')."""
+        event = {'type': type_, 'entity': entity, 'id': id_, 'data': data}
+        deferred = getattr(self._local, 'deferred', None)
+        if deferred is not None:
+            deferred.append(event)
+            return
+        self._enqueue([event])
+
+    def emit_stats(self):
+        """Avisa que as estatísticas mudaram (calculadas uma vez no envio)."""
+        self.emit('changed', 'stats')
+
+    @contextmanager
+    def transaction(self):
+        """Segura os eventos emitidos no bloco e só os envia se ele terminar bem."""
+        if getattr(self._local, 'deferred', None) is not None:
+            yield  # Já dentro de uma transação
+            return
+        self._local.deferred = []
+        try:
+            yield
+            events = self._local.deferred
+        finally:
+            self._local.deferred = None
+        self._enqueue(events)
+
+    @contextmanager
+    def savepoint(self):
+        """Descarta os eventos emitidos no bloco se ele falhar (a transação continua)."""
+        deferred = getattr(self._local, 'deferred', None)
+        mark = len(deferred) if deferred is not None else 0
+        try:
+            yield
+        except BaseException:
+            if deferred is not None:
+                del deferred[mark:]
+            raise
+
+    def _enqueue(self, events: List[Dict]):
+        if not events:
+            return
+        with self._lock:
+            if self._closed:
+                return
+            for event in events:
+                self._merge(event)
+            if self._timer is None:
+                self._timer = threading.Timer(self.window_ms / 1000, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _merge(self, event: Dict):
+        """Compacta o evento com o anterior da mesma entidade."""
+        key = (event['entity'], event['id'])
+        previous = self._pending.get(key)
+        if previous is None:
+            self._pending[key] = event
+        elif previous['type'] == 'added' and event['type'] == 'removed':
+            del self._pending[key]  # Criado e apagado dentro da janela
+        elif previous['type'] == 'added':
+            self._pending[key] = {**event, 'type': 'added'}
+        else:
+            self._pending[key] = event
+
+    def flush(self):
+        """Envia agora os eventos pendentes."""
+        with self._lock:
+            self._timer = None
+            events = list(self._pending.values())
+            self._pending.clear()
+        if not events:
+            return
+
+        for event in events:
+            if event['entity'] == 'stats' and self._stats_provider:
+                event['data'] = self._stats_provider()
+
+        payload = json.dumps({'events': events}, ensure_ascii=False)
+        script = f"window.dispatchEvent(new CustomEvent('{JS_EVENT_NAME}', {{detail: {payload}}}))"
+        try:
+            self._send(script)
+        except Exception:
+            pass  # Janela fechando: a UI recarrega tudo na próxima abertura
+
+    def close(self):
+        """Envia o que estiver pendente e para de aceitar eventos."""
+        with self._lock:
+            self._closed = True
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+        self.flush()
@@ -0,0 +1,91 @@
+"""
+Importer - Leitura em streaming de arquivos CSV/JSON para importação em massa
+Os leitores são geradores: o arquivo nunca é carregado inteiro na memória.
+
+Formatos aceitos (um conteúdo por registro):
+- CSV com cabeçalho: title, label (ou label_id), label_color, created_at
+- JSON: lista de objetos com as mesmas chaves
+- JSON Lines (.jsonl): um objeto por linha
+"""
+import csv
+import json
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, TextIO
+
+
+_CHUNK_CHARS = 64 * 1024
+
+
+def iter_csv(file: TextIO) -> Iterator[Dict]:
+    """Lê registros de um CSV com cabeçalho."""
+    for row in csv.DictReader(file):
+        item = {key.strip(): (value or '').strip() for key, value in row.items() if key}
+        if item.get('label_id'):
+            item['label_id'] = int(item['label_id'])
+        else:
+            item.pop('label_id', None)
+        yield item
+
+
+def iter_json_lines(file: TextIO) -> Iterator[Dict]:
+    """Lê um objeto JSON por linha, ignorando linhas em branco."""
+    for line in file:
+        if line.strip():
+            yield json.loads(line)
+
+
+def iter_json_array(file: TextIO) -> Iterator[Dict]:
+    """Lê os objetos de uma lista JSON de forma incremental."""
+    decoder = json.JSONDecoder()
+    buffer = file.read(_CHUNK_CHARS).lstrip()
+    if not buffer.startswith('['):
+        raise ValueError('O arquivo JSON deve conter uma lista de objetos')
+    buffer = buffer[1:]
+
+    while True:
+        buffer = buffer.lstrip().lstrip(',').lstrip()
+        if buffer.startswith(']'):
+            return
+        try:
+            item, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            # Objeto cortado no fim do bloco: lê mais e tenta de novo
+            more = file.read(_CHUNK_CHARS)
+            if not more:
+                raise
+            buffer += more
+            continue
+        yield item
+        buffer = buffer[end:]
+        if len(buffer) < _CHUNK_CHARS:
+            buffer += file.read(_CHUNK_CHARS)
+
+
+def iter_file(file: TextIO, path: Path) -> Iterator[Dict]:
+    """Escolhe o leitor pela extensão do arquivo."""
+    suffix = path.suffix.lower()
+    if suffix == '.csv':
+        return iter_csv(file)
+    if suffix in ('.jsonl', '.ndjson'):
+        return iter_json_lines(file)
+    if suffix == '.json':
+        return iter_json_array(file)
+    raise ValueError(f'Formato não suportado: {suffix}')
+
+
+def import_file(db, path: str, chunk_size: int = 1000,
+                progress: Optional[Callable[[int], None]] = None) -> Dict:
+    """Importa conteúdos de um arquivo CSV, JSON ou JSON Lines.
+
+    Args:
+        db: DataManager de destino
+        path: Caminho do arquivo
+        chunk_size: Conteúdos por transação
+        progress: Chamado com o total criado após cada lote
+    """
+    path = Path(path)
+    try:
+        with open(path, encoding='utf-8-sig', newline='') as file:
+            return db.create_contents_bulk(iter_file(file, path), chunk_size, progress)
+    except (OSError, ValueError) as error:
+        return {'error': f'Não foi possível importar o arquivo: {error}'}
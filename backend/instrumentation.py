@@ -0,0 +1,216 @@
+"""
+Instrumentation - Perfil opcional das chamadas do Backend e do SQLite
+Ativado com a variável de ambiente METHODJS_PROFILE=1 (ou Backend(profile=True)).
+
+Para cada método do Backend registra chamadas, tempo de parede, conexões
+pedidas ao pool, comandos SQL executados e linhas devolvidas à UI. Comandos
+mais lentos que o limite (METHODJS_PROFILE_SLOW_MS, padrão 50 ms) são
+registrados no log 'methodjs.perf'.
+"""
+import functools
+import json
+import logging
+import threading
+import time
+import types
+from collections import deque
+from pathlib import Path
+from typing import Callable, Dict
+
+
+logger = logging.getLogger('methodjs.perf')
+
+# Comandos executados fora de uma chamada do Backend (ex.: criação das tabelas)
+NO_CALL = '(fora de chamadas)'
+
+
+class PerfStats:
+    """Acumula as métricas por método do Backend."""
+
+    def __init__(self, slow_ms: float = 50.0, keep_slow: int = 100):
+        """Cria o coletor.
+
+        Args:
+            slow_ms: Comandos acima deste tempo são registrados como lentos
+            keep_slow: Quantos comandos lentos recentes manter no snapshot
+        """
+        self.slow_ms = slow_ms
+        self._methods: Dict[str, Dict] = {}
+        self._slow = deque(maxlen=keep_slow)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    # ==================== COLETA ====================
+
+    def _entry(self, name: str) -> Dict:
+        entry = self._methods.get(name)
+        if entry is None:
+            entry = self._methods[name] = {
+                'calls': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                'connections': 0, 'connection_ms': 0.0,
+                'statements': 0, 'rows': 0
+            }
+        return entry
+
+    def _current(self) -> str:
+        stack = getattr(self._local, 'stack', None)
+        return stack[-1] if stack else NO_CALL
+
+    def wrap(self, name: str, func: Callable) -> Callable:
+        """Retorna `func` instrumentada sob o nome `name`."""
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            stack = self._local.__dict__.setdefault('stack', [])
+            stack.append(name)
+            started = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                self._finish_statement()
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                stack.pop()
+                with self._lock:
+                    entry = self._entry(name)
+                    entry['calls'] += 1
+                    entry['total_ms'] += elapsed_ms
+                    entry['max_ms'] = max(entry['max_ms'], elapsed_ms)
+            with self._lock:
+                self._entry(name)['rows'] += _count_rows(result)
+            return result
+        return wrapper
+
+    def carry(self, func: Callable) -> Callable:
+        """Leva a chamada atual para `func` rodar em outra thread (ex.: a escritora).
+
+        Os comandos SQL executados por `func` contam para o método que a enviou.
+        """
+        name = self._current()
+
+        @functools.wraps(func)
+        def carried(*args, **kwargs):
+            stack = self._local.__dict__.setdefault('stack', [])
+            stack.append(name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._finish_statement()
+                stack.pop()
+        return carried
+
+    def on_connection(self, elapsed_ms: float):
+        """Registra uma conexão entregue pelo pool."""
+        with self._lock:
+            entry = self._entry(self._current())
+            entry['connections'] += 1
+            entry['connection_ms'] += elapsed_ms
+
+    def trace(self, statement: str):
+        """Callback de sqlite3.Connection.set_trace_callback.
+
+        O SQLite só avisa o início de cada comando, então a duração de um
+        comando é medida até o próximo começar (ou a chamada terminar), o
+        que inclui a leitura das linhas pelo Python.
+
+        Cada passo de um trigger é reportado com o texto do comando que o
+        disparou; repetições consecutivas idênticas contam como um comando
+        (parâmetros diferentes geram textos diferentes). Comandos internos
+        do SQLite (ex.: FTS5) chegam prefixados com '--' e são ignorados.
+        """
+        if statement.startswith('--'):
+            return
+        pending = getattr(self._local, 'pending', None)
+        if pending is not None and pending[0] == statement:
+            return
+        self._finish_statement()
+        self._local.pending = (statement, time.perf_counter(), self._current())
+        with self._lock:
+            self._entry(self._current())['statements'] += 1
+
+    def _finish_statement(self):
+        pending = getattr(self._local, 'pending', None)
+        if pending is None:
+            return
+        self._local.pending = None
+        statement, started, name = pending
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if elapsed_ms >= self.slow_ms:
+            logger.warning('Comando lento (%.1f ms) em %s: %s', elapsed_ms, name, statement)
+            with self._lock:
+                self._slow.append({
+                    'method': name,
+                    'ms': round(elapsed_ms, 3),
+                    'statement': ' '.join(statement.split())
+                })
+
+    # ==================== RELATÓRIO ====================
+
+    def snapshot(self) -> Dict:
+        """Retorna uma cópia das métricas acumuladas."""
+        with self._lock:
+            methods = {}
+            for name, entry in self._methods.items():
+                methods[name] = dict(entry)
+                calls = entry['calls']
+                methods[name]['avg_ms'] = entry['total_ms'] / calls if calls else 0.0
+            return {
+                'enabled': True,
+                'slow_threshold_ms': self.slow_ms,
+                'methods': methods,
+                'slow_statements': list(self._slow)
+            }
+
+    def reset(self):
+        """Zera as métricas."""
+        with self._lock:
+            self._methods.clear()
+            self._slow.clear()
+
+    def dump(self, path: Path):
+        """Grava o snapshot em JSON."""
+        Path(path).write_text(json.dumps(self.snapshot(), indent=2, ensure_ascii=False), encoding='utf-8')
+
+
+def _count_rows(result) -> int:
+    """Quantas linhas um resultado do Backend leva para a UI."""
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, dict) and 'items' in result:
+        return _count_rows(result['items'])
+    if isinstance(result, dict) and 'columns' in result:
+        return result['length']  # Formato colunar (columnar.py)
+    return 0 if result is None else 1
+
+
+def instrument_backend(backend, stats: PerfStats, exclude=('get_perf_stats',)):
+    """Substitui os métodos públicos da instância por versões instrumentadas."""
+    for name in dir(type(backend)):
+        if name.startswith('_') or name in exclude:
+            continue
+        if isinstance(getattr(type(backend), name), property):
+            continue  # Ex.: Backend.db, que espera a abertura do banco
+        method = getattr(backend, name)
+        if callable(method):
+            wrapped = stats.wrap(name, method.__func__)
+            setattr(backend, name, types.MethodType(wrapped, backend))
+
+
+def instrument_data_manager(db, stats: PerfStats):
+    """Instrumenta DataManager._get_connection (tempo do pool + trace de SQL)."""
+    get_connection = db._get_connection
+
+    def instrumented_get_connection():
+        started = time.perf_counter()
+        conn = get_connection()
+        stats.on_connection((time.perf_counter() - started) * 1000)
+        conn.set_trace_callback(stats.trace)
+        return conn
+
+    db._get_connection = instrumented_get_connection
+
+
+def slow_threshold(environ) -> float:
+    """Lê METHODJS_PROFILE_SLOW_MS do ambiente."""
+    try:
+        return float(environ.get('METHODJS_PROFILE_SLOW_MS', 50))
+    except ValueError:
+        return 50.0
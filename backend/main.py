@@ -1,7 +1,74 @@
-import webview
 import sys
 import os
+import sqlite3
+import threading
+import time
+import functools
+import logging
+from contextlib import contextmanager, nullcontext
+from types import SimpleNamespace
 from data_manager import DataManager
+from profiles import ProfileManager
+from scheduler import SCHEDULERS
+from write_queue import WriteQueue
+
+# importer, backup, columnar, instrumentation e events são importados só quando usados,
+# para não pesar na abertura do app
+
+logger = logging.getLogger('methodjs')
+
+
+# Métodos aceitos por Backend.batch: só leitura e que escrevem no banco
+BATCH_READ_METHODS = frozenset({
+    'get_labels', 'get_contents', 'get_contents_page', 'get_content', 'search_contents',
+    'get_reviews_today', 'get_reviews_by_date', 'get_reviews_by_range', 'get_review_summary',
+    'get_statistics', 'get_cache_stats', 'get_import_progress', 'get_perf_stats',
+    'get_changes_since', 'get_schedulers', 'get_review_forecast', 'get_overdue_reviews',
+    'get_profiles', 'get_all_statistics',
+})
+BATCH_WRITE_METHODS = frozenset({
+    'create_label', 'update_label', 'delete_label',
+    'create_content', 'import_contents', 'update_content', 'delete_content',
+    'mark_review_completed', 'unmark_review_completed',
+    'mark_reviews_completed', 'unmark_reviews_completed',
+    'mark_reviews_completed_by_date', 'unmark_reviews_completed_by_date',
+    'set_scheduler', 'set_load_balancing', 'reschedule_reviews', 'archive_completed',
+})
+
+# Tarefas automáticas (segundos): a primeira execução espera a abertura do
+# app assentar, as seguintes cobrem sessões longas com o app aberto
+ARCHIVE_FIRST_DELAY = 60
+ARCHIVE_INTERVAL = 6 * 60 * 60
+BACKUP_FIRST_DELAY = 120
+BACKUP_INTERVAL = 24 * 60 * 60
+PROFILE_EVICT_INTERVAL = 60
+
+
+def _queued(method):
+    """Faz o método do Backend rodar na thread escritora (ver write_queue).
+    
+    Quem chama espera o commit, então o resultado já está gravado.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        func = method if self._perf is None else self._perf.carry(method)
+        return self._writes.run(func, self, *args, **kwargs)
+    return wrapper
+
+
+def _columnar(result, columnar: bool):
+    """Codifica uma lista (ou a lista em 'items' de uma página) no formato colunar, se pedido.
+    
+    Erros ({'error': ...}) passam sem mudança.
+    """
+    if not columnar:
+        return result
+    from columnar import encode_rows
+    if isinstance(result, list):
+        return encode_rows(result)
+    if isinstance(result, dict) and isinstance(result.get('items'), list):
+        return {**result, 'items': encode_rows(result['items'])}
+    return result
 
 
 def _resource_path(*parts: str) -> str:
@@ -22,60 +89,389 @@ def _resource_path(*parts: str) -> str:
 class Backend:
     """API Backend para comunicação com o webview."""
     
-    def __init__(self):
-        """Inicializa o backend com o DataManager."""
-        self.db = DataManager()
+    def __init__(self, data_dir: str = None, profile: bool = None):
+        """Inicializa o backend e começa a abrir o banco em segundo plano.
+        
+        O construtor retorna na hora, para a janela ser criada enquanto o
+        banco abre; chamadas que usam self.db esperam a abertura terminar.
+        
+        Args:
+            data_dir: Pasta base dos dados, com um banco por perfil de usuário
+                (padrão: METHODJS_DATA_DIR ou Documents/MethodJS do usuário)
+            profile: Ativa a instrumentação (padrão: variável METHODJS_PROFILE)
+        """
+        self._profiles = None  # ProfileManager, criado por _open_db
+        self._db_error = None
+        self._db_ready = threading.Event()
+        self._import_progress = {'running': False, 'created': 0}
+        self._import_lock = threading.Lock()
+        self._events = None  # Ligado à janela por _attach_window
+        self._writes = WriteQueue(self._write_group)
+        self._timers = {}  # Tarefas automáticas agendadas, por nome
+        self._closing = False
+        self._maintenance_lock = threading.Lock()  # Backup e exportação
+        
+        if profile is None:
+            # Lido aqui para não importar instrumentation quando o perfil está desligado
+            profile = os.environ.get('METHODJS_PROFILE', '').lower() in ('1', 'true', 'yes', 'on')
+        self._perf = None
+        if profile:
+            import instrumentation
+            self._perf = instrumentation.PerfStats(instrumentation.slow_threshold(os.environ))
+            instrumentation.instrument_backend(self, self._perf)
+        
+        threading.Thread(
+            target=self._open_db, args=(data_dir,), name='methodjs-db-open', daemon=True
+        ).start()
+        self._schedule(self.archive_completed, ARCHIVE_FIRST_DELAY, ARCHIVE_INTERVAL)
+        self._schedule(self._auto_backup, BACKUP_FIRST_DELAY, BACKUP_INTERVAL)
+        self._schedule(self._evict_idle_profiles, PROFILE_EVICT_INTERVAL, PROFILE_EVICT_INTERVAL)
+    
+    def _open_db(self, data_dir):
+        """Abre o banco do perfil ativo (roda na thread criada por __init__)."""
+        try:
+            profiles = ProfileManager(data_dir, factory=DataManager, on_open=self._instrument_db)
+            profiles.get()
+            self._profiles = profiles
+        except BaseException as error:
+            self._db_error = error
+        finally:
+            self._db_ready.set()
+    
+    def _instrument_db(self, db: DataManager):
+        """Instrumenta o banco de cada perfil aberto, se o perfil de desempenho estiver ligado."""
+        if self._perf is not None:
+            import instrumentation
+            instrumentation.instrument_data_manager(db, self._perf)
+    
+    def _schedule(self, job, delay: float, interval: float):
+        """Roda `job` daqui a `delay` segundos e depois a cada `interval`."""
+        def run():
+            try:
+                job()
+            except Exception:
+                if self._closing:
+                    return  # Banco fechando: não reagenda
+                # Falha passageira (banco travado, disco cheio): tenta de novo no próximo intervalo
+                logger.exception('Tarefa automática %s falhou', job.__name__)
+            if not self._closing:
+                self._schedule(job, interval, interval)
+        
+        timer = threading.Timer(delay, run)
+        timer.daemon = True
+        self._timers[job.__name__] = timer
+        timer.start()
+    
+    def _cancel_timers(self):
+        """Cancela as tarefas automáticas agendadas."""
+        self._closing = True
+        for timer in self._timers.values():
+            timer.cancel()
+    
+    def _auto_backup(self):
+        """Cópia automática, se a última tiver mais de BACKUP_INTERVAL."""
+        import backup
+        latest = backup.latest_backup(self.db)
+        if latest is None or time.time() - latest.stat().st_mtime >= BACKUP_INTERVAL:
+            self.backup_database()
+    
+    def _evict_idle_profiles(self):
+        """Fecha os bancos de perfis sem uso recente."""
+        self._profile_manager.evict_idle()
+    
+    @property
+    def _profile_manager(self) -> ProfileManager:
+        """Perfis do app (espera a abertura do banco, se ainda estiver em andamento)."""
+        self._db_ready.wait()
+        if self._db_error is not None:
+            raise self._db_error
+        return self._profiles
+    
+    @property
+    def db(self) -> DataManager:
+        """DataManager do perfil ativo (espera a abertura do banco, se ainda estiver em andamento)."""
+        return self._profile_manager.get()
+    
+    @contextmanager
+    def _write_group(self):
+        """Transação de um grupo da fila de escrita (eventos só saem após o commit)."""
+        events = self._events.transaction() if self._events else nullcontext()
+        with events, self.db.session(write=True) as session:
+            yield SimpleNamespace(savepoint=functools.partial(self._savepoint, session))
+    
+    @contextmanager
+    def _savepoint(self, session):
+        """Savepoint do banco que também descarta os eventos da operação desfeita."""
+        events = self._events.savepoint() if self._events else nullcontext()
+        with events, session.savepoint():
+            yield
+    
+    def _attach_window(self, window):
+        """Passa a enviar à janela os eventos de alteração (deltas)."""
+        from events import EventPusher
+        self._events = EventPusher(window.evaluate_js, stats_provider=lambda: self.db.get_statistics())
+    
+    def _emit(self, type_: str, entity: str, id_=None, data=None, stats: bool = False):
+        """Emite um evento de alteração, se houver janela ligada."""
+        if self._events is None:
+            return
+        self._events.emit(type_, entity, id_, data)
+        if stats:
+            self._events.emit_stats()
+    
+    def _emit_content(self, type_: str, content_id: int, stats: bool = False):
+        """Emite a alteração de um conteúdo já com a linha atualizada."""
+        if self._events is None:
+            return
+        data = None if type_ == 'removed' else self.db.get_content_by_id(content_id)
+        self._emit(type_, 'content', content_id, data, stats)
+    
+    def _emit_review(self, content_id: int, review_type: str):
+        """Emite a alteração de uma revisão (e do conteúdo dela)."""
+        if self._events is None:
+            return
+        content = self.db.get_content_by_id(content_id)
+        review = content['reviews'].get(review_type) if content else None
+        if review is None:
+            return
+        self._emit('changed', 'review', f'{content_id}:{review_type}', {
+            'content_id': content_id,
+            'review_type': review_type,
+            **review
+        })
+        self._emit('changed', 'content', content_id, content, stats=True)
+    
+    def _shutdown(self):
+        """Libera os recursos do backend (não exposto ao JS por começar com _)."""
+        self._cancel_timers()
+        self._writes.close()  # Grava o que ainda estiver na fila
+        if self._events is not None:
+            self._events.close()
+        if self._perf is not None:
+            self._perf.dump(self.db.data_dir / "perf_stats.json")
+        self.db.compact_change_log()
+        self._profile_manager.close_all()
+    
+    # ==================== BATCH ====================
+    
+    def batch(self, calls: list):
+        """Executa várias chamadas em uma única travessia da ponte do pywebview.
+        
+        Se todas as chamadas forem leituras, elas compartilham uma conexão e
+        veem o mesmo snapshot do banco. Se houver escrita, tudo roda em uma
+        única transação; uma chamada que falha é desfeita sozinha.
+        
+        Args:
+            calls: Lista de {'method': nome, 'args': [...]} (args é opcional)
+        
+        Returns:
+            Lista, na mesma ordem, de {'result': ...} ou {'error': mensagem}
+        """
+        parsed = []
+        for call in calls:
+            if not isinstance(call, dict):
+                parsed.append((None, 'Chamada inválida'))
+                continue
+            method = call.get('method')
+            args = call.get('args') or []
+            if method not in BATCH_READ_METHODS and method not in BATCH_WRITE_METHODS:
+                parsed.append((None, f'Método não permitido em batch: {method}'))
+            elif not isinstance(args, list):
+                parsed.append((None, f'Argumentos inválidos para {method}'))
+            else:
+                parsed.append((method, args))
+        
+        write = any(method in BATCH_WRITE_METHODS for method, _ in parsed)
+        if write:
+            # Sozinho na fila: o batch abre e confirma a própria transação
+            return self._writes.run(self._run_batch, parsed, True, exclusive=True)
+        return self._run_batch(parsed, False)
+    
+    def _run_batch(self, parsed: list, write: bool):
+        """Executa as chamadas já validadas de batch()."""
+        results = []
+        
+        # Eventos de um batch de escrita só saem se o commit acontecer
+        events = self._events.transaction() if write and self._events else nullcontext()
+        
+        try:
+            with events, self.db.session(write) as session:
+                for method, args in parsed:
+                    if method is None:
+                        results.append({'error': args})
+                        continue
+                    try:
+                        if write:
+                            with self._savepoint(session):
+                                result = getattr(self, method)(*args)
+                        else:
+                            result = getattr(self, method)(*args)
+                        results.append({'result': result})
+                    except Exception as error:
+                        results.append({'error': str(error)})
+        except sqlite3.Error as error:
+            return {'error': f'Erro ao executar o batch: {error}'}
+        
+        return results
     
     # ==================== LABELS ====================
     
+    @_queued
     def create_label(self, name: str, color: str):
         """Cria uma nova label."""
-        return self.db.create_label(name, color)
+        result = self.db.create_label(name, color)
+        if 'error' not in result:
+            self._emit('added', 'label', result['id'], result, stats=True)
+        return result
     
     def get_labels(self):
         """Retorna todas as labels."""
         return self.db.get_all_labels()
     
+    @_queued
     def update_label(self, label_id: int, name: str, color: str):
         """Atualiza uma label."""
-        return self.db.update_label(label_id, name, color)
+        result = self.db.update_label(label_id, name, color)
+        if 'error' not in result:
+            self._emit('changed', 'label', label_id, {'id': label_id, 'name': name, 'color': color})
+        return result
     
+    @_queued
     def delete_label(self, label_id: int):
         """Deleta uma label."""
-        return self.db.delete_label(label_id)
+        result = self.db.delete_label(label_id)
+        if 'error' not in result:
+            self._emit('removed', 'label', label_id, stats=True)
+        return result
     
     # ==================== CONTENTS ====================
     
+    @_queued
     def create_content(self, title: str, label_id: int):
         """Cria um novo conteúdo."""
-        return self.db.create_content(title, label_id)
+        result = self.db.create_content(title, label_id)
+        self._emit_content('added', result['id'], stats=True)
+        return result
+    
+    def get_contents(self, include_archived: bool = False, columnar: bool = False):
+        """Retorna todos os conteúdos (os arquivados só com include_archived).
+        
+        Com columnar=True a lista vem no formato colunar (ver columnar.py),
+        como nas outras listagens com esse argumento.
+        """
+        return self.db.get_all_contents(include_archived, columnar)
+    
+    def get_contents_page(self, cursor: str = None, limit: int = 50, label_id: int = None,
+                          date_from: str = None, date_to: str = None, columnar: bool = False):
+        """Retorna uma página de conteúdos (paginação por cursor).
+        
+        Args:
+            cursor: 'next_cursor' da página anterior (None = primeira página)
+            limit: Tamanho da página
+            label_id: Filtra por label
+            date_from: Data de criação mínima (YYYY-MM-DD)
+            date_to: Data de criação máxima (YYYY-MM-DD)
+            columnar: 'items' no formato colunar
+        """
+        return _columnar(self.db.list_contents(cursor, limit, label_id, date_from, date_to), columnar)
+    
+    def get_content(self, content_id: int, include_archived: bool = False):
+        """Retorna um conteúdo específico (procura no arquivo com include_archived)."""
+        return self.db.get_content_by_id(content_id, include_archived)
+    
+    def import_contents(self, items: list):
+        """Cria vários conteúdos de uma vez.
+        
+        Args:
+            items: Lista de {'title', 'label_id' ou 'label' (nome), 'label_color'?, 'created_at'?}
+        """
+        return self._run_import(lambda progress: self.db.create_contents_bulk(items, progress=progress))
+    
+    def import_contents_file(self, path: str):
+        """Importa conteúdos de um arquivo CSV, JSON ou JSON Lines."""
+        import importer
+        return self._run_import(lambda progress: importer.import_file(self.db, path, progress=progress))
     
-    def get_contents(self):
-        """Retorna todos os conteúdos."""
-        return self.db.get_all_contents()
+    def get_import_progress(self):
+        """Retorna o andamento da importação em curso ({'running', 'created'})."""
+        return dict(self._import_progress)
+    
+    def _run_import(self, run):
+        """Executa uma importação atualizando o progresso consultado pela UI.
+        
+        Roda sozinha na fila de escrita: a importação confirma em blocos e as
+        escritas enviadas enquanto isso esperam por ela em vez do lock do SQLite.
+        """
+        if not self._import_lock.acquire(blocking=False):
+            return {'error': 'Já existe uma importação em andamento'}
+        
+        self._import_progress = {'running': True, 'created': 0}
+        
+        def progress(created: int):
+            self._import_progress['created'] = created
+        
+        try:
+            result = self._writes.run(run, progress, exclusive=True)
+        finally:
+            self._import_progress['running'] = False
+            self._import_lock.release()
+        
+        if result.get('created') or result.get('labels_created'):
+            # Importações podem ter milhares de linhas: a UI recarrega as listas
+            self._emit('changed', 'contents', data={'reload': True}, stats=True)
+        return result
     
-    def get_content(self, content_id: int):
-        """Retorna um conteúdo específico."""
-        return self.db.get_content_by_id(content_id)
+    def search_contents(self, query: str, limit: int = 20, label_id: int = None):
+        """Busca conteúdos pelo título (prefixo, sem acentos, por relevância)."""
+        return self.db.search_contents(query, limit, label_id)
     
+    @_queued
     def update_content(self, content_id: int, title: str, label_id: int):
         """Atualiza um conteúdo."""
-        return self.db.update_content(content_id, title, label_id)
+        result = self.db.update_content(content_id, title, label_id)
+        if 'error' not in result:
+            self._emit_content('changed', content_id)
+        return result
     
+    @_queued
     def delete_content(self, content_id: int):
         """Deleta um conteúdo."""
-        return self.db.delete_content(content_id)
+        result = self.db.delete_content(content_id)
+        if 'error' not in result:
+            self._emit_content('removed', content_id, stats=True)
+        return result
     
     # ==================== REVIEWS ====================
     
-    def get_reviews_today(self):
+    def get_reviews_today(self, columnar: bool = False):
         """Retorna revisões pendentes de hoje."""
-        return self.db.get_reviews_by_date()
+        return _columnar(self.db.get_reviews_by_date(), columnar)
     
-    def get_reviews_by_date(self, date: str):
+    def get_reviews_by_date(self, date: str, columnar: bool = False):
         """Retorna revisões de uma data específica (YYYY-MM-DD)."""
-        return self.db.get_reviews_by_date(date)
+        return _columnar(self.db.get_reviews_by_date(date), columnar)
     
+    def get_reviews_by_range(self, start: str, end: str, columnar: bool = False):
+        """Retorna revisões entre duas datas (YYYY-MM-DD, inclusivas)."""
+        return _columnar(self.db.get_reviews_by_range(start, end), columnar)
+    
+    def get_review_summary(self, start: str, end: str):
+        """Retorna a contagem de revisões pendentes/completas por dia no intervalo."""
+        return self.db.get_review_summary(start, end)
+    
+    def get_review_forecast(self, days: int = 30):
+        """Retorna as revisões pendentes por dia nos próximos `days` dias."""
+        return self.db.get_review_forecast(days)
+    
+    def get_overdue_reviews(self, cursor: str = None, limit: int = 50, label_id: int = None,
+                            columnar: bool = False):
+        """Página das revisões pendentes até hoje, as mais antigas primeiro.
+        
+        Passe o 'next_cursor' da página anterior para continuar; 'total' vem na primeira.
+        """
+        return _columnar(self.db.get_overdue_reviews(cursor, limit, label_id), columnar)
+    
+    @_queued
     def mark_review_completed(self, content_id: int, review_type: str):
         """Marca uma revisão como completa.
         
@@ -83,8 +479,12 @@ class Backend:
             content_id: ID do conteúdo
             review_type: 'next_day', 'one_week', 'one_month', ou 'three_months'
         """
-        return self.db.mark_review_completed(content_id, review_type)
+        result = self.db.mark_review_completed(content_id, review_type)
+        if 'error' not in result:
+            self._emit_review(content_id, review_type)
+        return result
     
+    @_queued
     def unmark_review_completed(self, content_id: int, review_type: str):
         """Desmarca uma revisão como completa (retorna ao estado pendente).
         
@@ -92,16 +492,190 @@ class Backend:
             content_id: ID do conteúdo
             review_type: 'next_day', 'one_week', 'one_month', ou 'three_months'
         """
-        return self.db.unmark_review_completed(content_id, review_type)
+        result = self.db.unmark_review_completed(content_id, review_type)
+        if 'error' not in result:
+            self._emit_review(content_id, review_type)
+        return result
+    
+    @_queued
+    def mark_reviews_completed(self, pairs: list):
+        """Marca várias revisões como completas em uma única transação.
+        
+        Args:
+            pairs: Lista de [content_id, review_type]
+        """
+        results = self.db.mark_reviews_completed(pairs)
+        self._emit_reviews(results, True)
+        return results
+    
+    @_queued
+    def unmark_reviews_completed(self, pairs: list):
+        """Desmarca várias revisões em uma única transação."""
+        results = self.db.unmark_reviews_completed(pairs)
+        self._emit_reviews(results, False)
+        return results
+    
+    @_queued
+    def mark_reviews_completed_by_date(self, date: str = None):
+        """Marca como completas todas as revisões pendentes de um dia (padrão: hoje)."""
+        result = self.db.mark_reviews_completed_by_date(date)
+        if 'error' not in result:
+            self._emit_reviews(result['reviews'], True, result['completed_at'])
+        return result
+    
+    @_queued
+    def unmark_reviews_completed_by_date(self, date: str = None):
+        """Desmarca todas as revisões completas de um dia (padrão: hoje)."""
+        result = self.db.unmark_reviews_completed_by_date(date)
+        if 'error' not in result:
+            self._emit_reviews(result['reviews'], False)
+        return result
+    
+    def _emit_reviews(self, reviews: list, completed: bool, completed_at: str = None):
+        """Emite a alteração de várias revisões sem reler os conteúdos."""
+        if self._events is None:
+            return
+        emitted = False
+        for review in reviews:
+            if 'error' in review:
+                continue
+            content_id, review_type = review['content_id'], review['review_type']
+            self._emit('changed', 'review', f'{content_id}:{review_type}', {
+                'content_id': content_id,
+                'review_type': review_type,
+                'completed': completed,
+                'completed_at': review.get('completed_at', completed_at)
+            })
+            emitted = True
+        if emitted:
+            self._events.emit_stats()
+    
+    # ==================== SCHEDULING ====================
+    
+    def get_schedulers(self):
+        """Lista os algoritmos de agendamento e indica o atual."""
+        return [
+            {
+                'name': name,
+                'description': scheduler.description,
+                'active': name == self.db.scheduler.name
+            }
+            for name, scheduler in SCHEDULERS.items()
+        ]
+    
+    @_queued
+    def set_scheduler(self, name: str):
+        """Escolhe o algoritmo usado para agendar conteúdos novos."""
+        return self.db.set_scheduler(name)
+    
+    @_queued
+    def set_load_balancing(self, daily_cap: int = None):
+        """Limita as revisões novas por dia (None ou 0 desliga)."""
+        return self.db.set_load_balancing(daily_cap)
+    
+    @_queued
+    def reschedule_reviews(self):
+        """Reagenda todas as revisões pendentes com o algoritmo atual."""
+        result = self.db.reschedule_reviews()
+        if result['updated']:
+            self._emit('changed', 'contents', data={'reload': True}, stats=True)
+        return result
+    
+    # ==================== ARCHIVE ====================
+    
+    @_queued
+    def archive_completed(self):
+        """Move para o arquivo os conteúdos revisados por completo (roda sozinho a cada poucas horas)."""
+        result = self.db.archive_completed()
+        if result['archived']:
+            # Os arquivados saem das listas: a UI recarrega
+            self._emit('changed', 'contents', data={'reload': True}, stats=True)
+        return result
+    
+    # ==================== BACKUP ====================
+    
+    def backup_database(self, path: str = None):
+        """Copia o banco sem parar o app (padrão: pasta backups, com rodízio).
+        
+        Args:
+            path: Arquivo de destino
+        """
+        import backup
+        return self._run_maintenance(lambda: backup.backup_database(self.db, path))
+    
+    def export_data(self, path: str):
+        """Exporta labels, conteúdos, revisões e preferências para JSON Lines."""
+        import backup
+        return self._run_maintenance(lambda: backup.export_jsonl(self.db, path))
+    
+    def restore_data(self, path: str):
+        """Restaura uma exportação de export_data (só em um banco vazio)."""
+        import backup
+        result = self._writes.run(lambda: backup.restore_jsonl(self.db, path), exclusive=True)
+        if 'error' not in result:
+            self._emit('changed', 'contents', data={'reload': True}, stats=True)
+        return result
+    
+    def _run_maintenance(self, run):
+        """Executa um backup ou exportação por vez, fora da fila de escrita (só leem)."""
+        if not self._maintenance_lock.acquire(blocking=False):
+            return {'error': 'Já existe um backup ou exportação em andamento'}
+        try:
+            return run()
+        finally:
+            self._maintenance_lock.release()
+    
+    # ==================== PROFILES ====================
+    
+    def get_profiles(self):
+        """Perfis existentes e o ativo."""
+        profiles = self._profile_manager
+        return {'active': profiles.active, 'profiles': profiles.list_profiles()}
+    
+    def create_profile(self, name: str):
+        """Cria um perfil (com banco próprio) sem trocar o ativo."""
+        return self._profile_manager.create_profile(name)
+    
+    def switch_profile(self, name: str):
+        """Troca o perfil ativo; as chamadas seguintes usam o banco dele."""
+        # Sozinho na fila: as escritas já enviadas terminam no perfil anterior
+        result = self._writes.run(self._profile_manager.switch, name, exclusive=True)
+        if 'error' not in result:
+            self._emit('changed', 'profile', data=result, stats=True)
+        return result
+    
+    def get_all_statistics(self):
+        """Estatísticas de cada perfil e a soma de todos."""
+        return self._profile_manager.aggregate_statistics()
     
     # ==================== STATISTICS ====================
     
     def get_statistics(self):
         """Retorna estatísticas gerais."""
         return self.db.get_statistics()
+    
+    def get_cache_stats(self):
+        """Retorna acertos/erros do cache de leituras."""
+        return self.db.get_cache_stats()
+    
+    def get_changes_since(self, version=0):
+        """Retorna o que mudou depois de `version` (sincronização incremental)."""
+        return self.db.get_changes_since(version)
+    
+    def get_perf_stats(self):
+        """Retorna as métricas da instrumentação ({'enabled': False} se desligada)."""
+        if self._perf is None:
+            return {'enabled': False}
+        return self._perf.snapshot()
 
 
 if __name__ == "__main__":
+    # O banco começa a abrir antes de importar o pywebview e criar a janela
+    backend = Backend()
+    
+    # Importado só aqui: o Backend pode ser usado (testes, benchmark) sem o pywebview
+    import webview
+    
     html_path = _resource_path("dist", "index.html")
     
     # Converter para file:// URL para resolver assets corretamente
@@ -113,7 +687,12 @@ if __name__ == "__main__":
         width=1200,
         height=800,
         resizable=True,
-        js_api=Backend()
+        js_api=backend
     )
+    backend._attach_window(window)
     
-    webview.start()
+    try:
+        webview.start()
+    finally:
+        # webview.start() só retorna quando todas as janelas foram fechadas
+        backend._shutdown()
@@ -0,0 +1,148 @@
+"""
+Migrations - Evolução do esquema do banco com PRAGMA user_version
+Cada migração leva o banco da versão N-1 para a N em uma única transação,
+então um banco nunca fica pela metade. Bancos novos são criados direto na
+versão atual por DataManager._create_tables.
+
+Para mudar o esquema: escreva a função da migração, registre-a em
+MIGRATIONS e atualize as instruções CREATE de _create_tables.
+"""
+import time
+from typing import Callable, Dict, List, Optional
+
+from encoding import EPOCH_JULIAN_DAY, REVIEW_TYPES
+
+
+def _compact_reviews(cursor):
+    """v1: datas de revisão em dias (INTEGER) e tipos de revisão em códigos.
+
+    Reescreve reviews (e review_pending_by_date, se existir) com as colunas
+    scheduled_day e review_type inteiras, mantendo os ids. Índices e
+    triggers são recriados por _create_tables logo depois.
+    """
+    create_review_types(cursor)
+    # Tipos desconhecidos ganham um código novo em vez de serem perdidos
+    cursor.execute('''
+        INSERT OR IGNORE INTO review_types (name)
+        SELECT DISTINCT review_type FROM reviews
+    ''')
+
+    cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'reviews'")
+    row = cursor.fetchone()
+    sequence = row[0] if row else 0
+
+    cursor.execute('''
+        CREATE TABLE reviews_v1 (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            content_id INTEGER NOT NULL,
+            review_type INTEGER NOT NULL,
+            scheduled_day INTEGER NOT NULL,
+            completed INTEGER DEFAULT 0,
+            completed_at TEXT,
+            FOREIGN KEY (content_id) REFERENCES contents(id) ON DELETE CASCADE
+        )
+    ''')
+    cursor.execute(f'''
+        INSERT INTO reviews_v1 (id, content_id, review_type, scheduled_day, completed, completed_at)
+        SELECT
+            r.id, r.content_id, t.id,
+            CAST(julianday(r.scheduled_date) - {EPOCH_JULIAN_DAY} AS INTEGER),
+            r.completed, r.completed_at
+        FROM reviews r
+        JOIN review_types t ON t.name = r.review_type
+        ORDER BY r.id
+    ''')
+    cursor.execute('DROP TABLE reviews')
+    cursor.execute('ALTER TABLE reviews_v1 RENAME TO reviews')
+    cursor.execute(
+        "UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'reviews'", (sequence,)
+    )
+
+    cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'review_pending_by_date'"
+    )
+    if cursor.fetchone():
+        cursor.execute('''
+            CREATE TABLE review_pending_by_day (
+                scheduled_day INTEGER PRIMARY KEY,
+                pending INTEGER NOT NULL
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute(f'''
+            INSERT INTO review_pending_by_day (scheduled_day, pending)
+            SELECT CAST(julianday(scheduled_date) - {EPOCH_JULIAN_DAY} AS INTEGER), SUM(pending)
+            FROM review_pending_by_date
+            GROUP BY 1
+        ''')
+        cursor.execute('DROP TABLE review_pending_by_date')
+
+
+# Versão -> migração que leva o banco até ela
+MIGRATIONS: Dict[int, Callable] = {
+    1: _compact_reviews,
+}
+SCHEMA_VERSION = max(MIGRATIONS)
+
+
+def create_review_types(cursor):
+    """Cria e preenche a tabela de códigos dos tipos de revisão."""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS review_types (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE
+        )
+    ''')
+    cursor.executemany(
+        'INSERT OR IGNORE INTO review_types (id, name) VALUES (?, ?)',
+        enumerate(REVIEW_TYPES)
+    )
+
+
+def get_version(conn) -> int:
+    """Lê a versão do esquema gravada no banco."""
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def migrate(conn, progress: Optional[Callable[[int, float], None]] = None) -> List[int]:
+    """Leva o banco até SCHEMA_VERSION e retorna as versões aplicadas.
+
+    Um banco vazio é apenas marcado com a versão atual (as tabelas são
+    criadas já no formato novo).
+
+    Args:
+        conn: Conexão fora de transação
+        progress: Chamado com (versão, segundos) após cada migração
+
+    Raises:
+        RuntimeError: Se o banco for de uma versão mais nova do MethodJS
+    """
+    version = get_version(conn)
+    if version > SCHEMA_VERSION:
+        raise RuntimeError(
+            f'Banco na versão {version}, mas esta versão do MethodJS só conhece até a {SCHEMA_VERSION}'
+        )
+    if version == SCHEMA_VERSION:
+        return []
+
+    is_new = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'reviews'"
+    ).fetchone() is None
+    if is_new:
+        conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        return []
+
+    applied = []
+    for target in range(version + 1, SCHEMA_VERSION + 1):
+        started = time.perf_counter()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            MIGRATIONS[target](conn.cursor())
+            conn.execute(f'PRAGMA user_version = {target}')
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        applied.append(target)
+        if progress:
+            progress(target, time.perf_counter() - started)
+    return applied
@@ -0,0 +1,277 @@
+"""
+Profiles - Um banco por perfil de usuário
+Cada perfil tem o seu arquivo study_data.db: o perfil padrão continua em
+<data_dir>/study_data.db (onde o app sempre guardou os dados) e os demais
+ficam em <data_dir>/profiles/<nome>/study_data.db.
+
+Os bancos só são abertos quando um perfil é usado, e os que ficam ociosos
+por PROFILE_IDLE_SECONDS são fechados (o perfil ativo fica sempre aberto).
+As estatísticas somadas de todos os perfis vêm de uma única consulta em
+uma conexão com os bancos anexados por ATTACH, sem abrir um DataManager
+por arquivo.
+"""
+import json
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from data_manager import DataManager, default_data_dir
+from encoding import to_day
+
+
+DEFAULT_PROFILE = 'default'
+
+# Perfis sem uso há mais que isso têm o banco fechado
+PROFILE_IDLE_SECONDS = 10 * 60
+
+# Nome do perfil = nome da pasta: letras, números e . _ - @ (ex.: um e-mail)
+PROFILE_NAME = re.compile(r'^[\w@-][\w.@-]{0,63}$')
+
+# Arquivo com o último perfil ativo, para reabrir o app nele
+ACTIVE_FILE = 'profiles.json'
+
+
+class ProfileManager:
+    """Abre sob demanda o banco de cada perfil e fecha os ociosos."""
+
+    def __init__(self, data_dir: Optional[Path] = None, idle_seconds: float = PROFILE_IDLE_SECONDS,
+                 factory: Callable[[Path], DataManager] = DataManager,
+                 on_open: Optional[Callable[[DataManager], None]] = None):
+        """Cria o gerenciador (nenhum banco é aberto aqui).
+
+        Args:
+            data_dir: Pasta base dos dados (padrão: default_data_dir())
+            idle_seconds: Tempo sem uso até o banco de um perfil ser fechado
+            factory: Abre o banco de uma pasta (padrão: DataManager)
+            on_open: Chamado com cada DataManager recém-aberto
+        """
+        self.data_dir = Path(data_dir) if data_dir else default_data_dir()
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.idle_seconds = idle_seconds
+        self._factory = factory
+        self._on_open = on_open
+        self._open: Dict[str, DataManager] = {}
+        self._last_used: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.active = self._read_active()
+
+    # ==================== PERFIS ====================
+
+    def profile_dir(self, name: str) -> Path:
+        """Pasta do banco de um perfil."""
+        if name == DEFAULT_PROFILE:
+            return self.data_dir
+        return self.data_dir / 'profiles' / name
+
+    def list_profiles(self) -> List[str]:
+        """Perfis existentes (o padrão primeiro)."""
+        folder = self.data_dir / 'profiles'
+        others = sorted(
+            path.name for path in folder.iterdir()
+            if (path / 'study_data.db').exists()
+        ) if folder.is_dir() else []
+        return [DEFAULT_PROFILE] + [name for name in others if name != DEFAULT_PROFILE]
+
+    def create_profile(self, name: str) -> Dict:
+        """Cria o banco de um perfil novo.
+
+        Returns:
+            {'name'} ou {'error': ...}
+        """
+        name = normalize_name(name)
+        if name is None:
+            return {'error': 'Nome de perfil inválido'}
+        if name in self.list_profiles():
+            return {'error': 'Perfil já existe'}
+        self.get(name)
+        return {'name': name}
+
+    def switch(self, name: str) -> Dict:
+        """Torna `name` o perfil ativo (e o lembra para a próxima abertura).
+
+        Returns:
+            {'name'} ou {'error': ...}
+        """
+        name = normalize_name(name)
+        if name is None or name not in self.list_profiles():
+            return {'error': 'Perfil não encontrado'}
+        self.get(name)
+        self.active = name
+        try:
+            (self.data_dir / ACTIVE_FILE).write_text(json.dumps({'active': name}), encoding='utf-8')
+        except OSError:
+            pass  # Só a próxima abertura volta ao perfil padrão
+        return {'name': name}
+
+    def _read_active(self) -> str:
+        try:
+            name = json.loads((self.data_dir / ACTIVE_FILE).read_text(encoding='utf-8')).get('active')
+        except (OSError, ValueError, AttributeError):
+            return DEFAULT_PROFILE
+        name = normalize_name(name) if isinstance(name, str) else None
+        if name is None or not (self.profile_dir(name) / 'study_data.db').exists():
+            return DEFAULT_PROFILE
+        return name
+
+    # ==================== BANCOS ABERTOS ====================
+
+    def get(self, name: Optional[str] = None) -> DataManager:
+        """DataManager do perfil (padrão: o ativo), abrindo o banco se preciso."""
+        name = name or self.active
+        with self._lock:
+            self._last_used[name] = time.monotonic()
+            db = self._open.get(name)
+            if db is not None:
+                return db
+        # Aberto fora do lock: criar o banco de um perfil novo roda o DDL
+        db = self._factory(self.profile_dir(name))
+        if self._on_open is not None:
+            self._on_open(db)
+        with self._lock:
+            current = self._open.setdefault(name, db)
+        if current is not db:
+            db.close()  # Outra thread abriu o mesmo perfil antes
+        return current
+
+    def is_open(self, name: str) -> bool:
+        """Se o banco do perfil está aberto agora."""
+        with self._lock:
+            return name in self._open
+
+    def evict_idle(self, now: Optional[float] = None) -> List[str]:
+        """Fecha os bancos sem uso há idle_seconds (menos o do perfil ativo).
+
+        Returns:
+            Perfis fechados
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            idle = [
+                name for name in self._open
+                if name != self.active and now - self._last_used.get(name, 0) >= self.idle_seconds
+            ]
+            closing = [self._open.pop(name) for name in idle]
+        for db in closing:
+            db.close()  # Conexões em uso fecham quando forem devolvidas
+        return idle
+
+    def close_all(self):
+        """Fecha os bancos de todos os perfis."""
+        with self._lock:
+            closing = list(self._open.values())
+            self._open.clear()
+        for db in closing:
+            db.close()
+
+    # ==================== ESTATÍSTICAS ====================
+
+    def aggregate_statistics(self) -> Dict:
+        """Estatísticas de cada perfil e a soma de todos.
+
+        Os bancos são anexados somente leitura a uma conexão em memória e lidos
+        por uma consulta com UNION ALL. O SQLite limita quantos bancos uma
+        conexão anexa (10 por padrão); acima disso vai uma consulta por lote.
+
+        Bancos ainda sem a tabela stats (criados antes dela e não abertos
+        desde então) são abertos uma vez para rodar a migração; os que não
+        abrem (ex.: de uma versão mais nova do app) ficam de fora.
+
+        Returns:
+            {'profiles': {nome: estatísticas}, 'total': estatísticas}
+        """
+        today = to_day(datetime.now())
+        names = [
+            name for name in self.list_profiles()
+            if (self.profile_dir(name) / 'study_data.db').exists()
+        ]
+        rows = []
+        conn = sqlite3.connect('file::memory:', uri=True)
+        try:
+            batch_size = conn.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED)
+            for start in range(0, len(names), batch_size):
+                rows.extend(_read_batch(conn, [
+                    (name, self.profile_dir(name) / 'study_data.db')
+                    for name in names[start:start + batch_size]
+                ], today, self._migrate))
+        finally:
+            conn.close()
+
+        read = {name for name, _, _ in rows}
+        names = [name for name in names if name in read]
+
+        stats = {name: {} for name in names}
+        pending = dict.fromkeys(names, 0)
+        for name, key, value in rows:
+            if key == 'pending_today':
+                pending[name] = value
+            else:
+                stats[name][key] = value
+        profiles = {name: DataManager.statistics_from(stats[name], pending[name]) for name in names}
+        total = {
+            key: sum(profile[key] for profile in profiles.values())
+            for key in DataManager.statistics_from({}, 0)
+        }
+        return {'profiles': profiles, 'total': total}
+
+    def _migrate(self, name: str) -> bool:
+        """Abre o banco do perfil (o que atualiza o esquema); False se ele não abrir."""
+        try:
+            self.get(name)
+        except (RuntimeError, sqlite3.Error):
+            return False
+        return True
+
+
+def _read_batch(conn: sqlite3.Connection, files: List, today: int,
+                migrate: Callable[[str], bool]) -> List:
+    """Anexa os bancos e lê (perfil, chave, valor) de todos em uma consulta.
+
+    `migrate` é chamado para os bancos sem as tabelas de estatísticas; os
+    que continuam sem elas ficam fora da consulta.
+    """
+    parts = []
+    params = []
+    attached = 0
+    try:
+        for name, path in files:
+            schema = f'p{attached}'
+            conn.execute(f'ATTACH DATABASE ? AS {schema}', (path.resolve().as_uri() + '?mode=ro',))
+            attached += 1
+            if not _has_statistics(conn, schema):
+                # Banco anterior às tabelas de estatísticas: abrir o perfil roda a migração
+                if not migrate(name) or not _has_statistics(conn, schema):
+                    continue
+            parts.append(f'''
+                SELECT ? AS profile, key, value FROM {schema}.stats
+                UNION ALL
+                SELECT ?, 'pending_today', COALESCE(SUM(pending), 0)
+                FROM {schema}.review_pending_by_day WHERE scheduled_day <= ?
+            ''')
+            params.extend((name, name, today))
+        if not parts:
+            return []
+        return conn.execute(' UNION ALL '.join(parts), params).fetchall()
+    finally:
+        for index in range(attached):
+            conn.execute(f'DETACH DATABASE p{index}')
+
+
+def _has_statistics(conn: sqlite3.Connection, schema: str) -> bool:
+    """Se o banco anexado como `schema` já tem as tabelas lidas por _read_batch."""
+    row = conn.execute(f'''
+        SELECT COUNT(*) FROM {schema}.sqlite_master
+        WHERE type = 'table' AND name IN ('stats', 'review_pending_by_day')
+    ''').fetchone()
+    return row[0] == 2
+
+
+def normalize_name(name: str) -> Optional[str]:
+    """Nome de perfil em minúsculas (pastas não diferenciam maiúsculas no Windows), ou None se inválido."""
+    if name is not None and not isinstance(name, str):
+        return None
+    name = (name or '').strip().lower()
+    return name if PROFILE_NAME.match(name) else None
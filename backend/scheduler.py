@@ -0,0 +1,205 @@
+"""
+Scheduler - Algoritmos que definem quando cada revisão acontece
+As quatro revisões de um conteúdo (encoding.REVIEW_TYPES) são etapas em
+ordem: o código do tipo é o índice da etapa. Cada algoritmo calcula as datas
+iniciais de um conteúdo novo e sabe reagendar, de uma vez, todas as revisões
+pendentes a partir de colunas (arrays) lidas do banco.
+"""
+from abc import ABC, abstractmethod
+from array import array
+from typing import Dict, List, Sequence
+
+from encoding import REVIEW_TYPES
+
+
+class ReviewColumns:
+    """Revisões em colunas, ordenadas por (content_id, etapa).
+
+    Dias são contados desde 1970-01-01; completed_day é -1 quando a revisão
+    está pendente.
+    """
+
+    FIELDS = ('id', 'content_id', 'stage', 'created_day', 'scheduled_day', 'completed_day')
+
+    def __init__(self, rows: Sequence[Sequence[int]] = ()):
+        """Monta as colunas a partir de linhas na ordem de FIELDS."""
+        columns = list(zip(*rows)) or [()] * len(self.FIELDS)
+        for field, column in zip(self.FIELDS, columns):
+            setattr(self, field, array('q', column))
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+
+class Scheduler(ABC):
+    """Interface dos algoritmos de agendamento."""
+
+    name = ''
+    description = ''
+
+    @abstractmethod
+    def initial_days(self, created_day: int) -> List[int]:
+        """Dias das revisões de um conteúdo criado em `created_day` (uma por etapa)."""
+
+    @abstractmethod
+    def reschedule(self, reviews: ReviewColumns) -> array:
+        """Novo scheduled_day de cada linha; completas e etapas desconhecidas não mudam."""
+
+
+class FixedIntervalScheduler(Scheduler):
+    """Intervalos fixos a partir da criação: 1 dia, 1 semana, 1 mês e 3 meses."""
+
+    name = 'fixed'
+    description = 'Intervalos fixos: 1, 7, 30 e 90 dias após a criação'
+    OFFSETS = (1, 7, 30, 90)
+
+    def initial_days(self, created_day: int) -> List[int]:
+        return [created_day + offset for offset in self.OFFSETS]
+
+    def reschedule(self, reviews: ReviewColumns) -> array:
+        offsets = self.OFFSETS
+        days = array('q', reviews.scheduled_day)
+        stages, created, completed = reviews.stage, reviews.created_day, reviews.completed_day
+        for i in range(len(days)):
+            if completed[i] < 0 and stages[i] < len(offsets):
+                days[i] = created[i] + offsets[stages[i]]
+        return days
+
+
+class SM2Scheduler(Scheduler):
+    """SM-2 adaptativo: cada revisão completa ajusta a facilidade do conteúdo.
+
+    O app não pede nota ao revisar, então a qualidade (0-5 do SM-2) vem do
+    atraso: completar no dia vale 5; atrasos maiores valem menos e, abaixo
+    de 3, os intervalos recomeçam. Cada revisão pendente é agendada a partir
+    da anterior (completa ou já reagendada).
+    """
+
+    name = 'sm2'
+    description = 'SM-2: intervalos crescem conforme as revisões são feitas em dia'
+
+    # Atraso máximo (dias) para cada qualidade, da melhor para a pior
+    QUALITY_BY_DELAY = ((0, 5), (2, 4), (7, 3))
+    FAILED_QUALITY = 2
+
+    def __init__(self, initial_ease: float = 2.5, min_ease: float = 1.3,
+                 first_intervals: Sequence[int] = (1, 6)):
+        self.initial_ease = initial_ease
+        self.min_ease = min_ease
+        self.first_intervals = tuple(first_intervals)
+
+    def _quality(self, delay: int) -> int:
+        for max_delay, quality in self.QUALITY_BY_DELAY:
+            if delay <= max_delay:
+                return quality
+        return self.FAILED_QUALITY
+
+    def _interval(self, repetition: int, previous: int, ease: float) -> int:
+        if repetition < len(self.first_intervals):
+            return self.first_intervals[repetition]
+        return max(1, round(previous * ease))
+
+    def initial_days(self, created_day: int) -> List[int]:
+        days = []
+        day, interval = created_day, 0
+        for repetition in range(len(REVIEW_TYPES)):
+            interval = self._interval(repetition, interval, self.initial_ease)
+            day += interval
+            days.append(day)
+        return days
+
+    def reschedule(self, reviews: ReviewColumns) -> array:
+        days = array('q', reviews.scheduled_day)
+        content_ids, stages = reviews.content_id, reviews.stage
+        created, completed = reviews.created_day, reviews.completed_day
+        stage_count = len(REVIEW_TYPES)
+
+        current = None
+        for i in range(len(days)):
+            if content_ids[i] != current:
+                # Primeiro registro de um conteúdo: estado inicial
+                current = content_ids[i]
+                anchor, ease, repetition, interval = created[i], self.initial_ease, 0, 0
+            if stages[i] >= stage_count:
+                continue
+
+            interval = self._interval(repetition, interval, ease)
+            if completed[i] >= 0:
+                quality = self._quality(completed[i] - days[i])
+                ease = max(self.min_ease, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+                repetition = repetition + 1 if quality >= 3 else 0
+                anchor = completed[i]
+            else:
+                days[i] = anchor + interval
+                anchor = days[i]
+                repetition += 1
+        return days
+
+
+class LoadBalancer:
+    """Espalha as datas de revisões novas para limitar a carga de cada dia.
+
+    Intervalos fixos fazem uma importação grande cair inteira nos mesmos dias
+    (1, 7, 30 e 90 dias depois). Com o balanceamento, cada revisão pode sair
+    do dia calculado pelo agendador até `tolerance` do seu intervalo (10% de
+    30 dias = até 3 dias antes ou depois) e fica no dia mais próximo do
+    original com menos de `daily_cap` revisões; se a janela inteira estiver
+    cheia, no dia menos carregado. As etapas continuam em ordem.
+    """
+
+    def __init__(self, daily_cap: int, tolerance: float = 0.1):
+        """Cria o balanceador.
+
+        Args:
+            daily_cap: Revisões pendentes desejadas por dia, no máximo
+            tolerance: Fração do intervalo que uma revisão pode se deslocar
+        """
+        self.daily_cap = daily_cap
+        self.tolerance = tolerance
+
+    def window(self, created_day: int, day: int) -> int:
+        """Quantos dias a revisão agendada para `day` pode se deslocar."""
+        return round((day - created_day) * self.tolerance)
+
+    def place(self, created_day: int, days: Sequence[int], load: Dict[int, int]) -> List[int]:
+        """Escolhe os dias das revisões de um conteúdo e os soma em `load`.
+
+        Args:
+            created_day: Dia de criação do conteúdo
+            days: Dias calculados pelo agendador, um por etapa
+            load: Revisões pendentes por dia (atualizado com as escolhidas)
+        """
+        placed = []
+        previous = created_day
+        for day in days:
+            window = self.window(created_day, day)
+            candidates = [day]
+            for distance in range(1, window + 1):
+                candidates += [day - distance, day + distance]
+            candidates = [candidate for candidate in candidates if candidate > previous] or [day]
+
+            chosen = next(
+                (candidate for candidate in candidates if load.get(candidate, 0) < self.daily_cap),
+                None
+            )
+            if chosen is None:
+                chosen = min(candidates, key=lambda candidate: load.get(candidate, 0))
+            load[chosen] = load.get(chosen, 0) + 1
+            placed.append(chosen)
+            previous = chosen
+        return placed
+
+
+SCHEDULERS: Dict[str, Scheduler] = {
+    scheduler.name: scheduler for scheduler in (FixedIntervalScheduler(), SM2Scheduler())
+}
+DEFAULT_SCHEDULER = FixedIntervalScheduler.name
+
+
+def get_scheduler(name: str) -> Scheduler:
+    """Retorna o agendador registrado com esse nome.
+
+    Raises:
+        KeyError: Se não houver agendador com esse nome
+    """
+    return SCHEDULERS[name]
@@ -0,0 +1,401 @@
+"""
+Storage - Interface de armazenamento de labels, conteúdos e revisões
+DataManager (SQLite, em arquivo ou em memória) e MemoryStorage (Python puro)
+implementam os mesmos métodos, com os mesmos retornos e mensagens de erro;
+test_storage_contract.py roda os mesmos testes nos dois.
+
+MemoryStorage existe para testes e benchmarks: nada vai para o disco, e as
+buscas usam índices em dicts e arrays, como os do banco:
+
+- revisões por dia (dict dia -> ids) e os dias com revisões em um array
+  ordenado, para os intervalos (como idx_reviews_date);
+- revisões de cada conteúdo na ordem das etapas (como idx_reviews_content_type);
+- pendentes por dia e contadores gerais (como review_pending_by_day e stats).
+
+Arquivo, change_log, busca, balanceamento de carga e o resto do que só o
+DataManager faz ficam fora da interface.
+"""
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from datetime import datetime
+from itertools import count
+from typing import Dict, List, Optional
+
+from encoding import REVIEW_TYPE_CODES, REVIEW_TYPES, from_day, to_day
+from scheduler import DEFAULT_SCHEDULER, Scheduler, get_scheduler
+
+
+class Storage(ABC):
+    """Interface dos armazenamentos (ver o docstring do módulo)."""
+
+    # ==================== LABELS ====================
+
+    @abstractmethod
+    def create_label(self, name: str, color: str) -> Dict:
+        """Cria uma label: {'id', 'name', 'color', 'created_at'} ou {'error'} se o nome já existe."""
+
+    @abstractmethod
+    def get_all_labels(self) -> List[Dict]:
+        """Todas as labels, por nome."""
+
+    @abstractmethod
+    def update_label(self, label_id: int, name: str, color: str) -> Dict:
+        """Renomeia/recolore uma label."""
+
+    @abstractmethod
+    def delete_label(self, label_id: int) -> Dict:
+        """Apaga uma label sem conteúdos."""
+
+    # ==================== CONTENTS ====================
+
+    @abstractmethod
+    def create_content(self, title: str, label_id: int) -> Dict:
+        """Cria um conteúdo e agenda as revisões: {'id', 'title', 'label_id', 'created_at', 'review_dates'}."""
+
+    @abstractmethod
+    def get_all_contents(self, include_archived: bool = False) -> List[Dict]:
+        """Todos os conteúdos com label e revisões, dos mais recentes aos mais antigos."""
+
+    @abstractmethod
+    def get_content_by_id(self, content_id: int, include_archived: bool = False) -> Optional[Dict]:
+        """Um conteúdo no formato de get_all_contents, ou None."""
+
+    @abstractmethod
+    def update_content(self, content_id: int, title: str, label_id: int) -> Dict:
+        """Altera título e label (as datas de revisão ficam)."""
+
+    @abstractmethod
+    def delete_content(self, content_id: int) -> Dict:
+        """Apaga um conteúdo e as revisões dele."""
+
+    # ==================== REVIEWS ====================
+
+    @abstractmethod
+    def get_reviews_by_date(self, date: str = None) -> List[Dict]:
+        """Revisões de um dia (padrão: hoje), pendentes primeiro e por título."""
+
+    @abstractmethod
+    def get_reviews_by_range(self, start: str, end: str) -> List[Dict]:
+        """Revisões entre duas datas (inclusivas), por dia, pendentes primeiro e por título."""
+
+    @abstractmethod
+    def get_review_summary(self, start: str, end: str) -> Dict[str, Dict]:
+        """{'YYYY-MM-DD': {'pending', 'completed'}} dos dias com revisões no intervalo."""
+
+    @abstractmethod
+    def mark_review_completed(self, content_id: int, review_type: str) -> Dict:
+        """Marca uma revisão como completa: {'success', 'completed_at'}."""
+
+    @abstractmethod
+    def unmark_review_completed(self, content_id: int, review_type: str) -> Dict:
+        """Volta uma revisão para pendente."""
+
+    # ==================== STATISTICS ====================
+
+    @abstractmethod
+    def get_statistics(self) -> Dict:
+        """Totais de conteúdos, labels e revisões (ver DataManager.statistics_from)."""
+
+    @abstractmethod
+    def close(self):
+        """Libera os recursos do armazenamento."""
+
+
+class MemoryStorage(Storage):
+    """Armazenamento em dicts, sem SQLite (testes e benchmarks)."""
+
+    def __init__(self, scheduler: Optional[Scheduler] = None):
+        """Cria um armazenamento vazio.
+
+        Args:
+            scheduler: Algoritmo de agendamento (padrão: DEFAULT_SCHEDULER)
+        """
+        self.scheduler = scheduler or get_scheduler(DEFAULT_SCHEDULER)
+        self._lock = threading.Lock()
+        self._labels: Dict[int, Dict] = {}
+        self._contents: Dict[int, Dict] = {}
+        self._reviews: Dict[int, Dict] = {}
+        # Índices
+        self._by_content: Dict[int, List[int]] = {}  # content_id -> ids das revisões, por etapa
+        self._by_day: Dict[int, List[int]] = {}      # dia -> ids das revisões
+        self._days: List[int] = []                   # dias de _by_day, ordenados
+        self._pending_by_day: Counter = Counter()
+        self._label_contents: Counter = Counter()    # label_id -> quantidade de conteúdos
+        self._completed = 0
+        self._label_ids = count(1)
+        self._content_ids = count(1)
+        self._review_ids = count(1)
+
+    # ==================== LABELS ====================
+
+    def create_label(self, name: str, color: str) -> Dict:
+        with self._lock:
+            if any(label['name'] == name for label in self._labels.values()):
+                return {'error': 'Label já existe'}
+            label = {
+                'id': next(self._label_ids),
+                'name': name,
+                'color': color,
+                'created_at': datetime.now().isoformat()
+            }
+            self._labels[label['id']] = label
+            return dict(label)
+
+    def get_all_labels(self) -> List[Dict]:
+        with self._lock:
+            return [dict(label) for label in sorted(self._labels.values(), key=lambda label: label['name'])]
+
+    def update_label(self, label_id: int, name: str, color: str) -> Dict:
+        with self._lock:
+            label = self._labels.get(label_id)
+            if label is None:
+                return {'error': 'Label não encontrada'}
+            if any(other['name'] == name for other in self._labels.values() if other is not label):
+                return {'error': 'Label já existe'}
+            label.update(name=name, color=color)
+            return {'success': True}
+
+    def delete_label(self, label_id: int) -> Dict:
+        with self._lock:
+            used = self._label_contents[label_id]
+            if used > 0:
+                return {'error': f'Não é possível deletar. Existem {used} conteúdo(s) com esta label.'}
+            self._labels.pop(label_id, None)
+            return {'success': True}
+
+    # ==================== CONTENTS ====================
+
+    def create_content(self, title: str, label_id: int) -> Dict:
+        created_at = datetime.now()
+        days = self.scheduler.initial_days(to_day(created_at))
+        with self._lock:
+            content = {
+                'id': next(self._content_ids),
+                'title': title,
+                'label_id': label_id,
+                'created_at': created_at.isoformat()
+            }
+            self._contents[content['id']] = content
+            self._label_contents[label_id] += 1
+            self._by_content[content['id']] = [
+                self._add_review(content['id'], stage, day) for stage, day in enumerate(days)
+            ]
+        return {
+            **content,
+            'review_dates': {review_type: from_day(day) for review_type, day in zip(REVIEW_TYPES, days)}
+        }
+
+    def get_all_contents(self, include_archived: bool = False) -> List[Dict]:
+        """Todos os conteúdos (não há arquivo: include_archived não muda nada)."""
+        with self._lock:
+            contents = sorted(
+                self._contents.values(),
+                key=lambda content: (content['created_at'], content['id']),
+                reverse=True
+            )
+            return [self._content_view(content) for content in contents if content['label_id'] in self._labels]
+
+    def get_content_by_id(self, content_id: int, include_archived: bool = False) -> Optional[Dict]:
+        with self._lock:
+            content = self._contents.get(content_id)
+            if content is None or content['label_id'] not in self._labels:
+                return None
+            return self._content_view(content)
+
+    def update_content(self, content_id: int, title: str, label_id: int) -> Dict:
+        with self._lock:
+            content = self._contents.get(content_id)
+            if content is None:
+                return {'error': 'Conteúdo não encontrado'}
+            self._label_contents[content['label_id']] -= 1
+            self._label_contents[label_id] += 1
+            content.update(title=title, label_id=label_id)
+            return {'success': True}
+
+    def delete_content(self, content_id: int) -> Dict:
+        with self._lock:
+            content = self._contents.pop(content_id, None)
+            if content is None:
+                return {'error': 'Conteúdo não encontrado'}
+            self._label_contents[content['label_id']] -= 1
+            for review_id in self._by_content.pop(content_id):
+                self._remove_review(review_id)
+            return {'success': True}
+
+    def _content_view(self, content: Dict) -> Dict:
+        """Conteúdo no formato da API (o de DataManager._query_contents)."""
+        label = self._labels[content['label_id']]
+        reviews = {}
+        for review_id in self._by_content[content['id']]:
+            review = self._reviews[review_id]
+            reviews[REVIEW_TYPES[review['stage']]] = {
+                'scheduled_date': from_day(review['scheduled_day']),
+                'completed': review['completed'],
+                'completed_at': review['completed_at']
+            }
+        return {
+            'id': content['id'],
+            'title': content['title'],
+            'created_at': content['created_at'],
+            'label_id': label['id'],
+            'label_name': label['name'],
+            'label_color': label['color'],
+            'reviews': reviews
+        }
+
+    # ==================== REVIEWS ====================
+
+    def _add_review(self, content_id: int, stage: int, day: int) -> int:
+        """Grava uma revisão pendente e a coloca nos índices."""
+        review_id = next(self._review_ids)
+        self._reviews[review_id] = {
+            'id': review_id,
+            'content_id': content_id,
+            'stage': stage,
+            'scheduled_day': day,
+            'completed': False,
+            'completed_at': None
+        }
+        if day not in self._by_day:
+            self._by_day[day] = []
+            insort(self._days, day)
+        self._by_day[day].append(review_id)
+        self._pending_by_day[day] += 1
+        return review_id
+
+    def _remove_review(self, review_id: int):
+        """Apaga uma revisão e a tira dos índices."""
+        review = self._reviews.pop(review_id)
+        day = review['scheduled_day']
+        ids = self._by_day[day]
+        ids.remove(review_id)
+        if not ids:
+            del self._by_day[day]
+            del self._days[bisect_left(self._days, day)]
+        if review['completed']:
+            self._completed -= 1
+        else:
+            self._pending_by_day[day] -= 1
+
+    def _find_review(self, content_id: int, review_type: str) -> Optional[Dict]:
+        stage = REVIEW_TYPE_CODES.get(review_type)
+        ids = self._by_content.get(content_id)
+        if stage is None or ids is None or stage >= len(ids):
+            return None
+        return self._reviews[ids[stage]]
+
+    def _set_completed(self, review: Dict, completed: bool, completed_at: Optional[str]):
+        """Muda o estado de uma revisão, mantendo os contadores."""
+        if review['completed'] != completed:
+            change = 1 if completed else -1
+            self._completed += change
+            self._pending_by_day[review['scheduled_day']] -= change
+        review['completed'] = completed
+        review['completed_at'] = completed_at
+
+    def _review_view(self, review: Dict) -> Dict:
+        """Revisão no formato da API (o de DataManager._reviews_select)."""
+        content = self._contents[review['content_id']]
+        label = self._labels[content['label_id']]
+        return {
+            'content_id': content['id'],
+            'title': content['title'],
+            'created_at': content['created_at'],
+            'label_id': label['id'],
+            'label_name': label['name'],
+            'label_color': label['color'],
+            'review_id': review['id'],
+            'review_type': REVIEW_TYPES[review['stage']],
+            'scheduled_date': from_day(review['scheduled_day']),
+            'completed': int(review['completed']),
+            'completed_at': review['completed_at']
+        }
+
+    def _reviews_between(self, first: int, last: int) -> List[Dict]:
+        """Revisões dos dias first..last (com conteúdo e label), pelo índice de dias."""
+        days = self._days[bisect_left(self._days, first):bisect_right(self._days, last)]
+        reviews = []
+        for day in days:
+            for review_id in self._by_day[day]:
+                review = self._reviews[review_id]
+                if self._contents[review['content_id']]['label_id'] in self._labels:
+                    reviews.append(self._review_view(review))
+        reviews.sort(key=lambda review: (review['scheduled_date'], review['completed'], review['title']))
+        return reviews
+
+    def get_reviews_by_date(self, date: str = None) -> List[Dict]:
+        try:
+            day = to_day(date if date is not None else datetime.now())
+        except (TypeError, ValueError):
+            return {'error': 'Data inválida'}
+        with self._lock:
+            return self._reviews_between(day, day)
+
+    def get_reviews_by_range(self, start: str, end: str) -> List[Dict]:
+        error = validate_range(start, end)
+        if error:
+            return error
+        with self._lock:
+            return self._reviews_between(to_day(start), to_day(end))
+
+    def get_review_summary(self, start: str, end: str) -> Dict[str, Dict]:
+        error = validate_range(start, end)
+        if error:
+            return error
+        summary = {}
+        with self._lock:
+            first, last = bisect_left(self._days, to_day(start)), bisect_right(self._days, to_day(end))
+            for day in self._days[first:last]:
+                total = len(self._by_day[day])
+                pending = self._pending_by_day[day]
+                summary[from_day(day)] = {'pending': pending, 'completed': total - pending}
+        return summary
+
+    def mark_review_completed(self, content_id: int, review_type: str) -> Dict:
+        completed_at = datetime.now().isoformat()
+        with self._lock:
+            review = self._find_review(content_id, review_type)
+            if review is None:
+                return {'error': 'Revisão não encontrada'}
+            self._set_completed(review, True, completed_at)
+        return {'success': True, 'completed_at': completed_at}
+
+    def unmark_review_completed(self, content_id: int, review_type: str) -> Dict:
+        with self._lock:
+            review = self._find_review(content_id, review_type)
+            if review is None:
+                return {'error': 'Revisão não encontrada'}
+            self._set_completed(review, False, None)
+        return {'success': True}
+
+    # ==================== STATISTICS ====================
+
+    def get_statistics(self) -> Dict:
+        today = to_day(datetime.now())
+        with self._lock:
+            upto = bisect_right(self._days, today)
+            return {
+                'total_contents': len(self._contents),
+                'total_labels': len(self._labels),
+                'pending_today': sum(self._pending_by_day[day] for day in self._days[:upto]),
+                'completed_reviews': self._completed,
+                'total_reviews': len(self._reviews),
+                'archived_contents': 0
+            }
+
+    def close(self):
+        """Nada a liberar (os dados somem com o objeto)."""
+
+
+def validate_range(start: str, end: str) -> Optional[Dict]:
+    """Valida um intervalo de datas ISO; retorna um dict de erro ou None."""
+    try:
+        start_date = datetime.fromisoformat(start).date()
+        end_date = datetime.fromisoformat(end).date()
+    except (TypeError, ValueError):
+        return {'error': 'Data inválida'}
+    if start_date > end_date:
+        return {'error': 'A data inicial deve ser anterior à final'}
+    return None
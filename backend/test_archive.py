@@ -0,0 +1,96 @@
+"""
+Testes do arquivo de conteúdos já revisados por completo
+"""
+import pytest
+
+from data_manager import DataManager
+from encoding import REVIEW_TYPES
+
+
+@pytest.fixture
+def db(tmp_path):
+    """DataManager com um conteúdo revisado por completo e outro pendente."""
+    manager = DataManager(tmp_path)
+    label = manager.create_label("História", "#AA5500")
+    manager.done = manager.create_content("Revolução Francesa", label['id'])['id']
+    manager.pending = manager.create_content("Era Vargas", label['id'])['id']
+    manager.mark_reviews_completed([[manager.done, t] for t in REVIEW_TYPES])
+    yield manager
+    manager.close()
+
+
+def _hot_rows(db):
+    conn = db._get_connection()
+    try:
+        return conn.execute('SELECT (SELECT COUNT(*) FROM contents), (SELECT COUNT(*) FROM reviews)').fetchone()
+    finally:
+        conn.close()
+
+
+def test_arquiva_so_o_que_passou_do_prazo(db):
+    """Revisões completadas agora só vão para o arquivo depois do prazo."""
+    assert db.archive_completed() == {'archived': 0, 'reviews': 0}
+    assert db.archive_completed(older_than_days=-1) == {'archived': 1, 'reviews': 4}
+    assert tuple(_hot_rows(db)) == (1, 4)
+
+
+def test_leituras_transparentes(db):
+    """Listas ativas escondem o arquivo; quem pede include_archived o vê."""
+    dates = {t: r['scheduled_date'] for t, r in db.get_content_by_id(db.done)['reviews'].items()}
+    stats = db.get_statistics()
+    db.archive_completed(older_than_days=-1)
+
+    assert [c['id'] for c in db.get_all_contents()] == [db.pending]
+    assert db.get_content_by_id(db.done) is None
+    archived = db.get_content_by_id(db.done, include_archived=True)
+    assert archived['archived'] is True
+    assert {t: r['scheduled_date'] for t, r in archived['reviews'].items()} == dates
+    assert {c['id'] for c in db.get_all_contents(include_archived=True)} == {db.done, db.pending}
+    assert db.search_contents("revolução") == []
+
+    # O calendário e os totais não mudam
+    day = dates['one_week']
+    assert [r['content_id'] for r in db.get_reviews_by_date(day) if r['completed']] == [db.done]
+    assert db.get_review_summary(day, day)[day]['completed'] == 1
+    assert db.get_statistics() == {**stats, 'archived_contents': 1}
+    assert db.get_changes_since(0)['deleted']['contents'] == [db.done]
+
+
+def test_desmarcar_devolve_o_conteudo(db):
+    """Desmarcar uma revisão arquivada traz o conteúdo de volta, com os mesmos ids."""
+    before = db.get_content_by_id(db.done)
+    db.archive_completed(older_than_days=-1)
+
+    assert db.unmark_review_completed(db.done, 'three_months') == {'success': True}
+    restored = db.get_content_by_id(db.done)
+    assert restored['reviews']['three_months']['completed'] is False
+    assert restored['reviews']['one_week'] == before['reviews']['one_week']
+    assert db.get_statistics()['archived_contents'] == 0
+    assert len(db.search_contents("revolução")) == 1
+
+
+def test_marcar_revisao_arquivada_continua_idempotente(db):
+    """Marcar de novo uma revisão arquivada dá sucesso e a mantém no arquivo."""
+    completed_at = db.get_content_by_id(db.done)['reviews']['one_week']['completed_at']
+    db.archive_completed(older_than_days=-1)
+
+    assert db.mark_review_completed(db.done, 'one_week') == {'success': True, 'completed_at': completed_at}
+    assert db.mark_reviews_completed([[db.done, 'one_week']]) == [
+        {'success': True, 'content_id': db.done, 'review_type': 'one_week', 'completed_at': completed_at}
+    ]
+    assert db.mark_review_completed(db.done, 'sempre') == {'error': 'Revisão não encontrada'}
+    assert db.get_statistics()['archived_contents'] == 1
+    assert db.get_content_by_id(db.done) is None
+
+
+def test_label_com_arquivados_nao_pode_ser_apagada(db):
+    """Conteúdos arquivados contam para delete_label e podem ser apagados."""
+    label_id = db.get_content_by_id(db.done)['label_id']
+    db.delete_content(db.pending)
+    db.archive_completed(older_than_days=-1)
+
+    assert 'error' in db.delete_label(label_id)
+    assert db.delete_content(db.done) == {'success': True}
+    assert db.delete_label(label_id) == {'success': True}
+    stats = db.get_statistics()
+    assert (stats['total_contents'], stats['archived_contents']) == (0, 0)
@@ -0,0 +1,152 @@
+"""
+Testes do backup online e da exportação/restauração em JSON Lines
+"""
+import json
+import sqlite3
+import threading
+from pathlib import Path
+
+import pytest
+
+import backup
+from data_manager import DataManager
+from encoding import REVIEW_TYPES
+
+
+@pytest.fixture
+def db(tmp_path):
+    """DataManager com algumas labels, conteúdos e um conteúdo arquivado."""
+    manager = DataManager(tmp_path / 'origem')
+    manager.set_scheduler('sm2')
+    manager.create_contents_bulk(
+        {'title': f"Conteúdo {i}", 'label': f"Label {i % 3}"} for i in range(30)
+    )
+    manager.mark_reviews_completed([[1, t] for t in REVIEW_TYPES] + [[2, 'next_day']])
+    manager.archive_completed(older_than_days=-1)
+    yield manager
+    manager.close()
+
+
+def test_backup_durante_escritas(db, tmp_path):
+    """A cópia em passos termina consistente mesmo com o app gravando."""
+    label_id = db.get_all_labels()[0]['id']
+    stop = threading.Event()
+
+    def write():
+        while not stop.is_set():
+            db.create_content("Durante o backup", label_id)
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    try:
+        steps = []
+        result = backup.backup_database(db, tmp_path / 'copia.db', pages=1,
+                                        progress=lambda done, total: steps.append(done))
+    finally:
+        stop.set()
+        writer.join()
+
+    assert 'error' not in result and len(steps) > 1
+    assert not (tmp_path / 'copia.db.partial').exists()
+    copy = sqlite3.connect(result['path'])
+    assert copy.execute('PRAGMA integrity_check').fetchone()[0] == 'ok'
+    contents, stat = copy.execute(
+        "SELECT (SELECT COUNT(*) FROM contents), (SELECT value FROM stats WHERE key = 'total_contents')"
+    ).fetchone()
+    assert contents == stat >= 29
+    copy.close()
+
+
+
+def test_backup_de_banco_em_memoria(tmp_path):
+    """Um banco em memória é copiado pelas conexões do pool; sem pasta, só com destino."""
+    db = DataManager(':memory:')
+    label = db.create_label('Geral', '#000000')
+    db.create_content('Na memória', label['id'])
+
+    assert 'error' in backup.backup_database(db)
+    assert backup.latest_backup(db) is None
+    result = backup.backup_database(db, tmp_path / 'memoria.db')
+    db.close()
+
+    assert 'error' not in result
+    copy = sqlite3.connect(result['path'])
+    assert copy.execute('SELECT title FROM contents').fetchall() == [('Na memória',)]
+    copy.close()
+
+def test_backups_automaticos_em_rodizio(db):
+    """Sem destino, as cópias vão para data_dir/backups e só as mais novas ficam."""
+    folder = backup.backup_dir(db)
+    folder.mkdir()
+    for day in (1, 2, 3):
+        (folder / f'study_data-2000010{day}-000000.db').write_bytes(b'')
+
+    result = backup.backup_database(db, keep=2)
+    names = sorted(path.name for path in folder.glob('study_data-*.db'))
+    assert names == ['study_data-20000103-000000.db', Path(result['path']).name]
+    assert str(backup.latest_backup(db)) == result['path']
+
+
+def test_exportar_e_restaurar(db, tmp_path):
+    """Uma exportação restaurada em um banco vazio reproduz os dados."""
+    path = tmp_path / 'dados.jsonl'
+    exported = backup.export_jsonl(db, path)
+    assert exported == {'meta': 1, 'setting': 1, 'label': 3, 'content': 30, 'review': 120}
+    assert json.loads(path.read_text(encoding='utf-8').splitlines()[0])['type'] == 'meta'
+
+    restored_db = DataManager(tmp_path / 'destino')
+    assert backup.restore_jsonl(restored_db, path, chunk_size=7) == {
+        'settings': 1, 'labels': 3, 'contents': 30, 'reviews': 120
+    }
+
+    assert restored_db.get_all_contents(include_archived=True) == db.get_all_contents(include_archived=True)
+    assert restored_db.get_statistics() == db.get_statistics()
+    assert restored_db.scheduler.name == 'sm2'
+    assert restored_db.search_contents("conteúdo 2") == db.search_contents("conteúdo 2")
+    assert restored_db.get_changes_since(0)['reset'] is True
+
+    # Ids do arquivo não são reusados
+    created = restored_db.create_content("Novo", restored_db.get_all_labels()[0]['id'])
+    assert created['id'] == 31
+    restored_db.close()
+
+
+def test_restauracao_recusa_banco_com_dados_ou_arquivo_invalido(db, tmp_path):
+    """Banco com dados ou registro inválido: nada é gravado."""
+    path = tmp_path / 'dados.jsonl'
+    backup.export_jsonl(db, path)
+    assert 'error' in backup.restore_jsonl(db, path)
+
+    lines = path.read_text(encoding='utf-8').splitlines()
+    lines.insert(5, json.dumps({'type': 'desconhecido'}))
+    path.write_text('\n'.join(lines), encoding='utf-8')
+
+    empty = DataManager(tmp_path / 'vazio')
+    result = backup.restore_jsonl(empty, path)
+    assert 'Registro 6' in result['error']
+    assert empty.get_statistics()['total_contents'] == 0
+    empty.close()
+
+
+def test_restauracao_exige_o_registro_meta(tmp_path):
+    """Arquivo vazio, sem 'meta' ou de outro formato: erro, e nada é gravado."""
+    empty = DataManager(tmp_path / 'vazio')
+    meta = {'type': 'meta', 'format': 1}
+    label = {'type': 'label', 'id': 1, 'name': 'Geral', 'color': '#000000', 'created_at': '2024-01-01'}
+    cases = {
+        'vazio.jsonl': [],
+        'sem_meta.jsonl': [label],
+        'formato.jsonl': [{**meta, 'format': 99}, label],
+    }
+    for name, records in cases.items():
+        path = tmp_path / name
+        path.write_text(''.join(json.dumps(record) + '\n' for record in records), encoding='utf-8')
+        result = backup.restore_jsonl(empty, path)
+        assert 'error' in result, name
+    assert 'formato 99' in result['error']
+    assert empty.get_all_labels() == []
+
+    path = tmp_path / 'ok.jsonl'
+    path.write_text(json.dumps(meta) + '\n' + json.dumps(label) + '\n', encoding='utf-8')
+    assert backup.restore_jsonl(empty, path)['labels'] == 1
+    empty.close()
@@ -0,0 +1,74 @@
+"""
+Testes do Backend.batch (várias chamadas em uma travessia da ponte)
+"""
+import pytest
+
+from main import Backend
+
+
+@pytest.fixture
+def backend(tmp_path):
+    """Backend apontando para um diretório temporário."""
+    instance = Backend(tmp_path)
+    yield instance
+    instance._shutdown()
+
+
+def test_leituras_em_ordem(backend):
+    """Resultados voltam na ordem das chamadas, com erro por chamada."""
+    label = backend.create_label("Matemática", "#FFFF00")
+    backend.create_content("Limites", label['id'])
+
+    results = backend.batch([
+        {'method': 'get_statistics'},
+        {'method': 'get_labels'},
+        {'method': 'get_content', 'args': [1]},
+        {'method': '_shutdown'},
+        {'method': 'get_content', 'args': ['a', 'b', 'c']},
+    ])
+
+    assert results[0]['result']['total_contents'] == 1
+    assert results[1]['result'][0]['name'] == "Matemática"
+    assert results[2]['result']['title'] == "Limites"
+    assert 'error' in results[3]
+    assert 'error' in results[4]
+
+
+def test_escritas_em_uma_transacao(backend):
+    """Escritas e leituras do batch veem umas às outras; falhas são isoladas."""
+    label = backend.create_label("Física", "#00FF00")
+
+    results = backend.batch([
+        {'method': 'create_content', 'args': ["Cinemática", label['id']]},
+        {'method': 'create_content', 'args': ["Dinâmica"]},  # faltam argumentos
+        {'method': 'mark_review_completed', 'args': [1, 'next_day']},
+        {'method': 'get_content', 'args': [1]},
+        {'method': 'get_statistics'},
+    ])
+
+    assert results[0]['result']['title'] == "Cinemática"
+    assert 'error' in results[1]
+    assert results[2]['result']['success'] is True
+    assert results[3]['result']['reviews']['next_day']['completed'] is True
+    assert results[4]['result']['completed_reviews'] == 1
+
+    # Depois do commit o cache não guarda nada da sessão
+    assert backend.get_content(1)['reviews']['next_day']['completed'] is True
+    assert backend.get_statistics()['total_contents'] == 1
+
+
+def test_falha_geral_desfaz_tudo(backend, monkeypatch):
+    """Se o commit final falhar, nada do batch fica no banco."""
+    label = backend.create_label("Química", "#0000FF")
+
+    def broken_statistics():
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(backend, 'get_statistics', broken_statistics)
+    with pytest.raises(KeyboardInterrupt):
+        backend.batch([
+            {'method': 'create_content', 'args': ["Ácidos", label['id']]},
+            {'method': 'get_statistics'},
+        ])
+
+    assert backend.get_contents() == []
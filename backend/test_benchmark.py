@@ -0,0 +1,29 @@
+"""
+Teste rápido do benchmark (garante que todos os casos continuam rodando)
+"""
+import benchmark
+
+
+def test_benchmark_banco_pequeno(tmp_path):
+    """Gera um banco pequeno e mede todos os casos com poucas repetições."""
+    results = benchmark.run_benchmark(200, repeat=3, budget=0.05, workdir=tmp_path)
+
+    assert results['DataManager.get_statistics']['calls'] == 3
+    assert all(result['p99_ms'] >= result['p50_ms'] for result in results.values())
+
+
+def test_benchmark_dos_armazenamentos(tmp_path):
+    """Os mesmos casos rodam em todos os armazenamentos de ENGINES."""
+    results = benchmark.run_engine_benchmark(50, repeat=3, budget=0.05, workdir=tmp_path)
+
+    for engine in benchmark.ENGINES:
+        assert results[f'{engine}.get_statistics']['calls'] == 3
+
+
+def test_compare_aponta_regressao():
+    """Um p50 acima da tolerância vira regressão."""
+    baseline = {'1000': {'Backend.get_statistics': {'p50_ms': 1.0}}}
+    current = {'1000': {'Backend.get_statistics': {'p50_ms': 1.5}}}
+
+    assert benchmark.compare(current, baseline, tolerance=0.25)
+    assert not benchmark.compare(current, baseline, tolerance=0.6)
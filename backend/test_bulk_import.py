@@ -0,0 +1,86 @@
+"""
+Testes da importação em massa de conteúdos
+"""
+import json
+from datetime import datetime
+
+import importer
+
+
+def test_bulk_equivale_a_create_content(db):
+    """Conteúdos importados têm as mesmas revisões, estatísticas e busca."""
+    existing = db.create_label("Física", "#00FF00")
+    progress = []
+    result = db.create_contents_bulk(
+        [
+            {'title': "Leis de Newton", 'label': "Física"},
+            {'title': "Citologia", 'label': "Biologia", 'label_color': "#00AA00"},
+            {'title': "Genética", 'label': "Biologia", 'created_at': "2024-01-10T08:00:00"},
+            {'title': "", 'label': "Biologia"},
+            {'title': "Óptica", 'label_id': existing['id']},
+            {'title': "Sem data", 'label': "Física", 'created_at': "ontem"},
+        ],
+        chunk_size=2,
+        progress=progress.append
+    )
+
+    assert result['created'] == 4
+    assert result['labels_created'] == 1
+    assert [error['index'] for error in result['errors']] == [3, 5]
+    assert progress == [2, 3, 4]
+
+    genetics = next(c for c in db.get_all_contents() if c['title'] == "Genética")
+    expected = db._calculate_review_dates(datetime(2024, 1, 10, 8))
+    assert {k: v['scheduled_date'] for k, v in genetics['reviews'].items()} == expected
+    assert genetics['label_color'] == "#00AA00"
+
+    stats = db.get_statistics()
+    assert (stats['total_contents'], stats['total_labels'], stats['total_reviews']) == (4, 2, 16)
+    assert [c['title'] for c in db.search_contents("newton")] == ["Leis de Newton"]
+    assert db.get_review_summary('2024-01-11', '2024-01-11') == {
+        '2024-01-11': {'pending': 1, 'completed': 0}
+    }
+
+
+def test_triggers_voltam_a_funcionar_depois_do_bulk(db):
+    """Depois da importação, inserções comuns seguem atualizando os contadores."""
+    db.create_contents_bulk([{'title': "A", 'label': "X"}])
+    label_id = db.get_all_labels()[0]['id']
+    db.create_content("B", label_id)
+    assert db.get_statistics()['total_contents'] == 2
+    assert len(db.search_contents("b")) == 1
+
+
+def test_itens_que_nao_sao_objetos(db, tmp_path):
+    """Itens que não são dicts viram erros por índice; os válidos são importados."""
+    result = db.create_contents_bulk([1, {'title': "Ondas", 'label': "Física"}, "Calor", None, ['x']])
+    assert result['created'] == 1
+    assert result['errors'] == [{'index': index, 'error': 'Item inválido'} for index in (0, 2, 3, 4)]
+
+    json_path = tmp_path / "misto.json"
+    json_path.write_text(json.dumps([{'title': "Som", 'label': "Física"}, 2, "três"]), encoding='utf-8')
+    result = importer.import_file(db, json_path)
+    assert result['created'] == 1
+    assert [error['index'] for error in result['errors']] == [1, 2]
+
+
+def test_leitores_de_arquivo(db, tmp_path, monkeypatch):
+    """CSV, JSON e JSON Lines são lidos em streaming e importados."""
+    monkeypatch.setattr(importer, '_CHUNK_CHARS', 16)  # força objetos cortados entre blocos
+
+    csv_path = tmp_path / "topicos.csv"
+    csv_path.write_text("title,label\nFunções,Matemática\nMatrizes,Matemática\n", encoding='utf-8')
+
+    json_path = tmp_path / "topicos.json"
+    json_path.write_text(json.dumps([
+        {'title': f"Tópico {i}", 'label': "História"} for i in range(5)
+    ]), encoding='utf-8')
+
+    jsonl_path = tmp_path / "topicos.jsonl"
+    jsonl_path.write_text('{"title": "Brasil Colônia", "label": "História"}\n\n', encoding='utf-8')
+
+    assert importer.import_file(db, csv_path)['created'] == 2
+    assert importer.import_file(db, json_path)['created'] == 5
+    assert importer.import_file(db, jsonl_path)['created'] == 1
+    assert 'error' in importer.import_file(db, tmp_path / "topicos.xlsx")
+    assert db.get_statistics()['total_contents'] == 8
@@ -0,0 +1,96 @@
+"""
+Testes da marcação de revisões em lote
+"""
+from datetime import datetime, timedelta
+
+from main import Backend
+
+
+def _count_commits(db, run):
+    """Executa `run` contando os COMMITs enviados ao SQLite."""
+    statements = []
+    get_connection = db._get_connection
+
+    def traced():
+        conn = get_connection()
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    db._get_connection = traced
+    try:
+        result = run()
+    finally:
+        db._get_connection = get_connection
+    return result, sum(1 for statement in statements if statement.strip().upper() == 'COMMIT')
+
+
+def test_marcar_lista_de_pares(db):
+    """Cada item tem seu resultado; tudo é confirmado em um único commit."""
+    label = db.create_label("Biologia", "#00FF00")
+    ids = [db.create_content(f"Tema {i}", label['id'])['id'] for i in range(30)]
+    pairs = [[content_id, 'next_day'] for content_id in ids]
+    pairs += [{'content_id': ids[0], 'review_type': 'one_week'}, [ids[0], 'sempre'], 'lixo']
+
+    results, commits = _count_commits(db, lambda: db.mark_reviews_completed(pairs))
+
+    assert commits == 1
+    assert all(result['success'] for result in results[:31])
+    assert results[31] == {'error': 'Revisão não encontrada'}
+    assert results[32] == {'error': 'Item inválido'}
+    assert db.get_content_by_id(ids[0])['reviews']['one_week']['completed'] is True
+    assert db.get_statistics()['completed_reviews'] == 31
+
+    results = db.unmark_reviews_completed([[content_id, 'next_day'] for content_id in ids])
+    assert all(result['success'] for result in results)
+    assert db.get_statistics()['completed_reviews'] == 1
+
+
+def test_itens_de_tipo_errado_nao_abortam_o_lote(db):
+    """Um item com tipos errados é rejeitado sozinho; os demais são confirmados."""
+    label = db.create_label("Geografia", "#0000AA")
+    first, second = (db.create_content(f"Tema {i}", label['id'])['id'] for i in range(2))
+    pairs = [[first, 'next_day'], [[1], 'next_day'], [{}, 'x'], [True, 'next_day'], [second, 7], [second, 'next_day']]
+
+    results = db.mark_reviews_completed(pairs)
+
+    assert [result.get('error') for result in results] == [None] + ['Item inválido'] * 4 + [None]
+    assert db.get_content_by_id(first)['reviews']['next_day']['completed'] is True
+    assert db.get_content_by_id(second)['reviews']['next_day']['completed'] is True
+    assert db.get_statistics()['completed_reviews'] == 2
+
+
+def test_marcar_dia_inteiro(db):
+    """Todas as pendências do dia são completadas de uma vez."""
+    label = db.create_label("História", "#AA0000")
+    contents = [db.create_content(f"Tema {i}", label['id']) for i in range(5)]
+    day = contents[0]['review_dates']['next_day']
+
+    result, commits = _count_commits(db, lambda: db.mark_reviews_completed_by_date(day))
+
+    assert commits == 1
+    assert result['updated'] == 5
+    assert {review['content_id'] for review in result['reviews']} == {c['id'] for c in contents}
+    assert all(review['completed'] for review in db.get_reviews_by_date(day))
+    assert db.get_review_summary(day, day)[day] == {'pending': 0, 'completed': 5}
+    assert db.mark_reviews_completed_by_date(day)['updated'] == 0
+
+    assert db.unmark_reviews_completed_by_date(day)['updated'] == 5
+    assert db.get_review_summary(day, day)[day] == {'pending': 5, 'completed': 0}
+    assert 'error' in db.mark_reviews_completed_by_date('ontem')
+    for invalid in (5, [], {}):
+        assert db.mark_reviews_completed_by_date(invalid) == {'error': 'Data inválida'}
+
+
+def test_backend_emite_eventos(tmp_path):
+    """O Backend avisa a UI de cada revisão alterada."""
+    backend = Backend(tmp_path)
+    sent = []
+    backend._attach_window(type('Window', (), {'evaluate_js': staticmethod(sent.append)})())
+    label = backend.create_label("Artes", "#FF00AA")
+    content = backend.create_content("Barroco", label['id'])
+    tomorrow = (datetime.now() + timedelta(days=1)).date().isoformat()
+
+    assert backend.mark_reviews_completed_by_date(tomorrow)['updated'] == 1
+    backend._events.flush()
+    assert f'"{content["id"]}:next_day"' in sent[-1]
+    backend._shutdown()
@@ -0,0 +1,57 @@
+"""
+Testes do cache LRU e da invalidação pelas escritas do DataManager
+"""
+from cache import LRUCache
+from data_manager import DataManager
+
+
+def test_lru_descarta_menos_usada():
+    """Acima de maxsize a entrada menos usada é descartada."""
+    cache = LRUCache(maxsize=2)
+    cache.get_or_load(('a',), lambda: 1)
+    cache.get_or_load(('b',), lambda: 2)
+    cache.get_or_load(('a',), lambda: 0)  # acerto: 'a' passa a ser a mais recente
+    cache.get_or_load(('c',), lambda: 3)  # descarta 'b'
+
+    assert cache.get_or_load(('b',), lambda: 'recarregado') == 'recarregado'
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions']) == (1, 4, 2)
+
+
+def test_escrita_durante_leitura_nao_grava_valor_antigo():
+    """Uma invalidação durante o carregamento impede gravar o valor lido."""
+    cache = LRUCache()
+
+    def loader():
+        cache.invalidate_namespace('x')
+        return 'antigo'
+
+    cache.get_or_load(('x', 1), loader)
+    assert cache.get_or_load(('x', 1), lambda: 'novo') == 'novo'
+
+
+def test_escritas_invalidam_leituras(db):
+    """Cada método de escrita invalida exatamente o que mudou."""
+    label = db.create_label("Matemática", "#FFFF00")
+    content = db.create_content("Limites", label['id'])
+
+    assert db.get_content_by_id(content['id'])['title'] == "Limites"
+    assert db.get_content_by_id(content['id'])['title'] == "Limites"
+    assert db.get_cache_stats()['hits'] == 1
+
+    db.update_content(content['id'], "Derivadas", label['id'])
+    assert db.get_content_by_id(content['id'])['title'] == "Derivadas"
+
+    db.mark_review_completed(content['id'], 'next_day')
+    assert db.get_all_contents()[0]['reviews']['next_day']['completed'] is True
+    db.unmark_review_completed(content['id'], 'next_day')
+    assert db.get_all_contents()[0]['reviews']['next_day']['completed'] is False
+
+    db.update_label(label['id'], "Cálculo", "#FF0000")
+    assert db.get_all_labels()[0]['name'] == "Cálculo"
+    assert db.get_content_by_id(content['id'])['label_name'] == "Cálculo"
+    assert db.list_contents()['items'][0]['label_color'] == "#FF0000"
+
+    db.delete_content(content['id'])
+    assert db.get_content_by_id(content['id']) is None
+    assert db.get_all_contents() == []
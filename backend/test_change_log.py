@@ -0,0 +1,67 @@
+"""
+Testes do change_log e de get_changes_since
+"""
+import sqlite3
+
+from data_manager import DataManager
+
+
+def test_mudancas_desde_uma_versao(db):
+    """Só as linhas tocadas depois da versão voltam, no estado atual."""
+    label = db.create_label("Geografia", "#AA5500")
+    first = db.create_content("Relevo", label['id'])
+    second = db.create_content("Clima", label['id'])
+    version = db.get_changes_since(0)['version']
+
+    db.mark_review_completed(first['id'], 'next_day')
+    db.delete_content(second['id'])
+    changes = db.get_changes_since(version)
+
+    assert not changes['reset']
+    assert changes['version'] > version
+    assert changes['labels'] == []
+    assert [c['id'] for c in changes['contents']] == [first['id']]
+    assert changes['contents'][0]['reviews']['next_day']['completed'] is True
+    assert changes['deleted'] == {'labels': [], 'contents': [second['id']]}
+    assert db.get_changes_since(changes['version'])['contents'] == []
+
+
+def test_bulk_registra_no_log(db):
+    """A carga em massa (sem triggers de INSERT) também entra no log."""
+    db.create_contents_bulk([{'title': f"T{i}", 'label': "L"} for i in range(5)], chunk_size=2)
+    changes = db.get_changes_since(0)
+    assert len(changes['contents']) == 5
+    assert [l['name'] for l in changes['labels']] == ["L"]
+
+
+def test_compactacao(db):
+    """Repetições somem; versões descartadas pedem reset."""
+    label = db.create_label("Artes", "#FF00AA")
+    content = db.create_content("Barroco", label['id'])
+    for _ in range(3):
+        db.update_content(content['id'], "Barroco", label['id'])
+    version = db.get_changes_since(0)['version']
+    db.create_content("Renascimento", label['id'])
+
+    assert db.compact_change_log(keep=1) > 0
+    assert db.get_changes_since(0)['reset']
+    assert [c['title'] for c in db.get_changes_since(version)['contents']] == ["Renascimento"]
+
+
+def test_banco_anterior_ao_log(tmp_path):
+    """Em um banco que já tinha dados, a versão 0 exige reler tudo."""
+    conn = sqlite3.connect(tmp_path / "study_data.db")
+    conn.execute('CREATE TABLE labels (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL UNIQUE, '
+                 'color TEXT NOT NULL, created_at TEXT NOT NULL)')
+    conn.execute("INSERT INTO labels (name, color, created_at) VALUES ('Antiga', '#000000', '2024-01-01')")
+    conn.commit()
+    conn.close()
+
+    manager = DataManager(tmp_path)
+    assert manager.get_changes_since(0) == {
+        'version': 1, 'reset': True, 'labels': [], 'contents': [],
+        'deleted': {'labels': [], 'contents': []}
+    }
+    manager.create_label("Nova", "#FFFFFF")
+    assert [l['name'] for l in manager.get_changes_since(1)['labels']] == ["Nova"]
+    manager.close()
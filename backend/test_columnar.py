@@ -0,0 +1,71 @@
+"""
+Testes do formato colunar das listagens (columnar.py)
+"""
+import json
+
+import main
+from columnar import decode_rows, encode_rows
+from data_manager import DataManager
+
+
+def _roundtrip(rows):
+    """Codifica, passa por JSON (como na ponte do pywebview) e decodifica."""
+    return decode_rows(json.loads(json.dumps(encode_rows(rows))))
+
+
+def test_conteudos_voltam_iguais_e_bem_menores(tmp_path):
+    db = DataManager(tmp_path)
+    labels = [db.create_label(f'Label {index}', '#336699') for index in range(5)]
+    db.create_contents_bulk([
+        {'title': f'Conteúdo {index}', 'label_id': labels[index % 5]['id'],
+         'created_at': f'2024-{1 + index % 12:02d}-{1 + index % 28:02d}'}
+        for index in range(500)
+    ])
+    first = db.get_all_contents()[0]['id']
+    db.mark_review_completed(first, 'next_day')
+
+    # Conteúdo sem uma das revisões e um arquivado: chaves ausentes em algumas linhas
+    conn = db._get_connection()
+    conn.execute('DELETE FROM reviews WHERE content_id = ? AND review_type = 3', (first + 1,))
+    conn.execute("UPDATE reviews SET completed = 1, completed_at = '2000-01-01' WHERE content_id = ?", (first + 2,))
+    conn.commit()
+    conn.close()
+    db._cache.clear()
+    db.archive_completed()
+
+    contents = db.get_all_contents(include_archived=True)
+    assert any('archived' in content for content in contents)
+    assert any('three_months' not in content['reviews'] for content in contents)
+    assert _roundtrip(contents) == contents
+
+    encoded = encode_rows(contents)
+    assert len(encoded['labels']) == 5
+    assert len(json.dumps(contents)) > 4 * len(json.dumps(encoded, separators=(',', ':')))
+    db.close()
+
+
+def test_backend_codifica_so_quando_pedido(tmp_path):
+    backend = main.Backend(tmp_path, profile=False)
+    label = backend.create_label('Biologia', '#00AA00')
+    for index in range(3):
+        backend.create_content(f'Célula {index}', label['id'])
+    day = backend.get_contents()[0]['reviews']['next_day']['scheduled_date']
+
+    reviews = backend.get_reviews_by_date(day)
+    assert backend.get_reviews_by_date(day, True)['format'] == 'columnar/1'
+    assert decode_rows(backend.get_reviews_by_date(day, True)) == reviews
+    assert decode_rows(backend.get_reviews_by_range(day, day, True)) == backend.get_reviews_by_range(day, day)
+
+    page = backend.get_contents_page(limit=2, columnar=True)
+    assert page['next_cursor'] is not None
+    assert decode_rows(page['items']) == backend.get_contents_page(limit=2)['items']
+
+    # A forma colunar de get_contents fica em cache e é invalidada com a lista
+    assert decode_rows(backend.get_contents(False, True)) == backend.get_contents()
+    backend.create_content('Mitose', label['id'])
+    assert backend.get_contents(False, True)['length'] == 4
+
+    # Erros e listas vazias
+    assert backend.get_reviews_by_date('ontem', True) == {'error': 'Data inválida'}
+    assert decode_rows(backend.get_reviews_by_date('1999-01-01', True)) == []
+    backend._shutdown()
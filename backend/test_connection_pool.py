@@ -0,0 +1,98 @@
+"""
+Testes do pool de conexões SQLite
+"""
+import sqlite3
+import threading
+
+import pytest
+
+from connection_pool import MEMORY, ConnectionPool
+
+
+def test_pragmas_aplicados(tmp_path):
+    """Toda conexão nova sai do pool com WAL e os PRAGMAs ajustados."""
+    pool = ConnectionPool(tmp_path / "pool.db")
+    conn = pool.acquire()
+
+    assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+    assert conn.execute('PRAGMA synchronous').fetchone()[0] == 1  # NORMAL
+    assert conn.execute('PRAGMA busy_timeout').fetchone()[0] == 5000
+    assert conn.execute('PRAGMA cache_size').fetchone()[0] == -20000
+
+    conn.close()
+    pool.close_all()
+
+
+def test_conexao_reutilizada_entre_threads(tmp_path):
+    """close() devolve a conexão, que é reaproveitada por outra thread."""
+    pool = ConnectionPool(tmp_path / "pool.db")
+    first = pool.acquire()
+    first.close()
+    assert pool.idle_count == 1
+
+    seen = []
+
+    def worker():
+        conn = pool.acquire()
+        seen.append(conn)
+        conn.execute('SELECT 1').fetchone()
+        conn.close()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+
+    assert seen == [first]
+    pool.close_all()
+
+
+def test_transacao_pendente_descartada(tmp_path):
+    """Uma conexão devolvida sem commit não vaza a transação."""
+    pool = ConnectionPool(tmp_path / "pool.db")
+    conn = pool.acquire()
+    conn.execute('CREATE TABLE t (x INTEGER)')
+    conn.commit()
+    conn.execute('INSERT INTO t VALUES (1)')
+    conn.close()
+
+    conn = pool.acquire()
+    assert not conn.in_transaction
+    assert conn.execute('SELECT COUNT(*) FROM t').fetchone()[0] == 0
+    conn.close()
+    pool.close_all()
+
+
+def test_close_all(tmp_path):
+    """Depois de close_all o pool não entrega mais conexões."""
+    pool = ConnectionPool(tmp_path / "pool.db")
+    in_use = pool.acquire()
+    pool.close_all()
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        pool.acquire()
+
+    # A conexão em uso é fechada de fato ao ser devolvida
+    in_use.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        in_use.execute('SELECT 1')
+
+
+def test_banco_em_memoria_compartilhado_pelo_pool():
+    """Com MEMORY, as conexões de um pool veem o mesmo banco; outro pool tem o seu."""
+    pool = ConnectionPool(MEMORY, max_idle=0)  # Sem ociosas: cada acquire abre uma nova
+    conn = pool.acquire()
+    conn.execute('CREATE TABLE t (x INTEGER)')
+    conn.execute('INSERT INTO t VALUES (1)')
+    conn.commit()
+    conn.close()
+
+    conn = pool.acquire()
+    assert conn.execute('SELECT COUNT(*) FROM t').fetchone()[0] == 1
+    conn.close()
+
+    other = ConnectionPool(MEMORY)
+    conn = other.acquire()
+    assert conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 't'").fetchone()[0] == 0
+    conn.close()
+    other.close_all()
+    pool.close_all()
@@ -8,7 +8,7 @@ def test_database():
     """Testa todas as operações do banco."""
     print("🔧 Iniciando testes do SQLite...\n")
     
-    db = DataManager()
+    db = DataManager(':memory:')  # Banco isolado: não toca nos dados reais
     
     # Teste 1: Criar Labels
     print("1️⃣ Testando criação de labels...")
@@ -77,12 +77,11 @@ def test_database():
     
     # Teste 8: Localização do banco
     print("8️⃣ Localização do banco de dados...")
-    print(f"   ✓ Pasta: {db.data_dir}")
-    print(f"   ✓ Arquivo: {db.db_path}")
+    print(f"   ✓ Arquivo: {db.db_path} (em memória, descartado ao fechar)")
     print()
     
+    db.close()
     print("✅ Todos os testes concluídos com sucesso!")
-    print(f"📁 Acesse a pasta: {db.data_dir}")
 
 if __name__ == "__main__":
     test_database()
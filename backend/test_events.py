@@ -0,0 +1,95 @@
+"""
+Testes do envio de alterações (deltas) para a janela
+"""
+import json
+import threading
+
+import pytest
+
+from events import EventPusher
+from main import Backend
+
+
+class FakeWindow:
+    """Guarda os scripts enviados em vez de executá-los."""
+
+    def __init__(self):
+        self.scripts = []
+
+    def evaluate_js(self, script):
+        self.scripts.append(script)
+
+    def batches(self):
+        return [json.loads(s[s.index('{detail: ') + 9:-3])['events'] for s in self.scripts]
+
+
+@pytest.fixture
+def backend(tmp_path):
+    """Backend ligado a uma janela falsa, com envio manual."""
+    instance = Backend(tmp_path)
+    window = FakeWindow()
+    instance._attach_window(window)
+    instance._events.window_ms = 60_000  # O teste chama flush()
+    yield instance, window
+    instance._shutdown()
+
+
+def test_eventos_compactados(backend):
+    """Vários eventos na mesma janela viram um único envio compacto."""
+    instance, window = backend
+    label = instance.create_label("Química", "#00FFFF")
+    content = instance.create_content("Ligações", label['id'])
+    instance.update_content(content['id'], "Ligações químicas", label['id'])
+    instance.mark_review_completed(content['id'], 'next_day')
+    temp = instance.create_content("Rascunho", label['id'])
+    instance.delete_content(temp['id'])
+    instance._events.flush()
+
+    [events] = window.batches()
+    by_key = {(e['entity'], e['id']): e for e in events}
+    assert ('content', temp['id']) not in by_key
+    assert by_key[('content', content['id'])]['type'] == 'added'
+    assert by_key[('content', content['id'])]['data']['title'] == "Ligações químicas"
+    assert by_key[('review', f"{content['id']}:next_day")]['data']['completed'] is True
+    assert by_key[('stats', None)]['data']['total_contents'] == 1
+
+
+def test_batch_com_falha_total_nao_emite():
+    """Eventos de uma transação desfeita são descartados."""
+    sent = []
+    pusher = EventPusher(sent.append, window_ms=60_000)
+    with pytest.raises(RuntimeError):
+        with pusher.transaction():
+            pusher.emit('added', 'label', 1)
+            raise RuntimeError('rollback')
+    with pusher.transaction():
+        pusher.emit('removed', 'label', 2)
+    pusher.flush()
+
+    assert len(sent) == 1
+    assert '"id": 2' in sent[0] and '"id": 1' not in sent[0]
+
+
+def test_operacao_desfeita_no_grupo_nao_emite(backend):
+    """Os eventos de uma operação desfeita no savepoint não vão para a janela."""
+    instance, window = backend
+    gate = threading.Event()
+
+    def create_and_fail():
+        instance.create_label("Desfeita", "#000000")
+        raise ValueError('falhou')
+
+    instance._writes.submit(lambda: gate.wait(5))
+    kept = instance._writes.submit(instance.create_label, "Mantida", "#FFFFFF")
+    failing = instance._writes.submit(create_and_fail)
+    gate.set()
+
+    with pytest.raises(ValueError):
+        failing.result()
+    label = kept.result()
+    instance._events.flush()
+
+    [events] = window.batches()
+    labels = [e for e in events if e['entity'] == 'label']
+    assert [(e['id'], e['data']['name']) for e in labels] == [(label['id'], "Mantida")]
+    assert [l['name'] for l in instance.get_labels()] == ["Mantida"]
@@ -0,0 +1,74 @@
+"""
+Testes da previsão de carga e do balanceamento das datas de revisão
+"""
+from collections import Counter
+from datetime import datetime, timedelta
+
+from data_manager import DataManager
+from encoding import from_day, to_day
+from scheduler import LoadBalancer
+
+
+def _import(db, count, created_at=None):
+    return db.create_contents_bulk(
+        {'title': f"Tópico {i}", 'label': "Geografia", 'created_at': created_at}
+        for i in range(count)
+    )
+
+
+def test_previsao_por_dia(db):
+    """Cada dia do horizonte aparece, com as atrasadas à parte."""
+    _import(db, 5)
+    _import(db, 2, (datetime.now() - timedelta(days=3)).isoformat())
+    today = to_day(datetime.now())
+
+    forecast = db.get_review_forecast(10)
+    assert [entry['date'] for entry in forecast['days']] == [from_day(today + i) for i in range(10)]
+    pending = {entry['date']: entry['pending'] for entry in forecast['days'] if entry['pending']}
+    assert pending == {from_day(today + 1): 5, from_day(today + 4): 2, from_day(today + 7): 5}
+    assert forecast['overdue'] == 2
+    assert forecast['peak'] == {'date': from_day(today + 1), 'pending': 5}
+    assert forecast['daily_cap'] is None
+    assert 'error' in db.get_review_forecast(0)
+
+
+def test_balanceamento_na_importacao(tmp_path):
+    """Com limite diário, a importação espalha as revisões dentro da janela."""
+    db = DataManager(tmp_path)  # Em arquivo: o teste reabre o banco
+    assert db.set_load_balancing(40) == {'success': True, 'daily_cap': 40}
+    _import(db, 100)
+    today = to_day(datetime.now())
+
+    conn = db._get_connection()
+    rows = conn.execute('SELECT content_id, review_type, scheduled_day FROM reviews').fetchall()
+    conn.close()
+    per_day = Counter(row['scheduled_day'] for row in rows)
+
+    # 1 e 7 dias: janela 0 e 1; 30 e 90 dias: janelas de 3 e 9 dias
+    assert per_day[today + 1] == 100
+    assert {day - today for day in per_day if 6 <= day - today <= 8} == {6, 7, 8}
+    assert max(count for day, count in per_day.items() if day - today >= 27) <= 40
+    assert all(abs(day - today - 90) <= 9 for day in per_day if day - today > 60)
+
+    # Etapas continuam em ordem em cada conteúdo
+    by_content = {}
+    for row in sorted(rows, key=lambda row: row['review_type']):
+        by_content.setdefault(row['content_id'], []).append(row['scheduled_day'])
+    assert all(days == sorted(set(days)) for days in by_content.values())
+
+    # A configuração sobrevive à reabertura e vale também para create_content
+    db.close()
+    reopened = DataManager(db.data_dir)
+    assert reopened.get_review_forecast(1)['daily_cap'] == 40
+    label_id = reopened.get_all_labels()[0]['id']
+    dates = reopened.create_content("Relevo", label_id)['review_dates']
+    assert dates['one_month'] != from_day(today + 30)  # O dia 30 já está cheio
+    reopened.close()
+
+
+def test_balanceador_usa_o_dia_mais_proximo_livre():
+    """Dia original livre é mantido; cheio, vai para o vizinho mais próximo."""
+    balancer = LoadBalancer(daily_cap=2, tolerance=0.1)
+    load = {30: 2, 29: 2}
+    assert balancer.place(0, [1, 7, 30, 90], load) == [1, 7, 31, 90]
+    assert load[31] == 1 and load[90] == 1
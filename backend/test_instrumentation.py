@@ -0,0 +1,50 @@
+"""
+Testes da instrumentação opcional do Backend
+"""
+import json
+
+from main import Backend
+
+
+def test_desligada_por_padrao(tmp_path, monkeypatch):
+    """Sem METHODJS_PROFILE os métodos não são embrulhados."""
+    monkeypatch.delenv('METHODJS_PROFILE', raising=False)
+    backend = Backend(tmp_path)
+    assert backend.get_perf_stats() == {'enabled': False}
+    assert 'get_labels' not in vars(backend)
+    backend._shutdown()
+
+
+def test_metricas_por_chamada(tmp_path):
+    """Conta chamadas, conexões, comandos SQL e linhas devolvidas."""
+    backend = Backend(tmp_path, profile=True)
+    label = backend.create_label("Matemática", "#FFFF00")
+    backend.create_content("Limites", label['id'])
+    backend.create_content("Derivadas", label['id'])
+    backend.get_contents()
+
+    methods = backend.get_perf_stats()['methods']
+    assert methods['create_content']['calls'] == 2
+    assert methods['create_content']['connections'] == 2
+    # INSERT do conteúdo + 4 revisões (triggers não contam; BEGIN/COMMIT
+    # são do grupo da fila de escrita, não da chamada)
+    assert methods['create_content']['statements'] == 10
+    assert methods['get_contents']['rows'] == 2
+    assert methods['get_contents']['statements'] == 1
+    assert 'get_perf_stats' not in methods
+
+    backend._shutdown()
+    dumped = json.loads((tmp_path / "perf_stats.json").read_text(encoding='utf-8'))
+    assert dumped['methods']['create_label']['calls'] == 1
+
+
+def test_comandos_lentos(tmp_path, monkeypatch):
+    """Com limite zero todo comando é registrado como lento."""
+    monkeypatch.setenv('METHODJS_PROFILE', '1')
+    monkeypatch.setenv('METHODJS_PROFILE_SLOW_MS', '0')
+    backend = Backend(tmp_path)
+    backend.get_statistics()
+
+    slow = backend.get_perf_stats()['slow_statements']
+    assert slow and all(entry['method'] == 'get_statistics' for entry in slow)
+    backend._shutdown()
@@ -0,0 +1,59 @@
+"""
+Testes da listagem de conteúdos em consulta única com paginação por cursor
+"""
+
+
+def test_revisoes_agregadas(db):
+    """Cada conteúdo vem com as quatro revisões, como antes."""
+    label = db.create_label("Matemática", "#FFFF00")
+    content = db.create_content("Equação do 2º Grau", label['id'])
+    db.mark_review_completed(content['id'], 'next_day')
+
+    [listed] = db.get_all_contents()
+    assert listed['label_name'] == "Matemática"
+    assert set(listed['reviews']) == {'next_day', 'one_week', 'one_month', 'three_months'}
+    assert listed['reviews']['next_day']['completed'] is True
+    assert listed['reviews']['one_week']['completed'] is False
+    assert listed['reviews']['one_week']['scheduled_date'] == content['review_dates']['one_week']
+    assert db.get_content_by_id(content['id']) == listed
+    assert db.get_content_by_id(999) is None
+
+
+def test_paginacao_por_cursor(db):
+    """As páginas cobrem todos os conteúdos, sem repetir, do mais novo ao mais antigo."""
+    label = db.create_label("Física", "#00FF00")
+    ids = [db.create_content(f"Tópico {i}", label['id'])['id'] for i in range(7)]
+
+    seen = []
+    cursor = None
+    while True:
+        page = db.list_contents(cursor=cursor, limit=3)
+        seen.extend(item['id'] for item in page['items'])
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+
+    assert seen == list(reversed(ids))
+    assert 'error' in db.list_contents(cursor='lixo')
+    assert 'error' in db.list_contents(limit=0)
+
+    # Valores vindos da UI com o tipo errado viram erro, não exceção
+    assert db.list_contents(cursor=123) == {'error': 'Cursor inválido'}
+    assert db.list_contents(cursor=['a', 1]) == {'error': 'Cursor inválido'}
+    assert db.list_contents(limit='10') == {'error': 'O limite deve estar entre 1 e 500'}
+    assert db.list_contents(limit=None) == {'error': 'O limite deve estar entre 1 e 500'}
+    assert db.list_contents(date_to=20240101) == {'error': 'Data inválida'}
+
+
+def test_filtros(db):
+    """Filtros por label e por data de criação."""
+    math = db.create_label("Matemática", "#FFFF00")
+    physics = db.create_label("Física", "#00FF00")
+    db.create_content("Limites", math['id'])
+    db.create_content("Cinemática", physics['id'])
+
+    page = db.list_contents(label_id=physics['id'])
+    assert [item['title'] for item in page['items']] == ["Cinemática"]
+
+    assert db.list_contents(date_to='2000-01-01')['items'] == []
+    assert len(db.list_contents(date_from='2000-01-01', date_to='2999-12-31')['items']) == 2
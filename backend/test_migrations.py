@@ -0,0 +1,107 @@
+"""
+Testes das migrações de esquema (PRAGMA user_version)
+"""
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+import benchmark
+import migrations
+from data_manager import DataManager
+
+
+def _legacy_rows(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    rows = conn.execute('SELECT * FROM reviews ORDER BY id').fetchall()
+    conn.close()
+    return [dict(row) for row in rows]
+
+
+def test_migra_banco_da_versao_0(tmp_path):
+    """Um banco antigo é convertido no lugar e a API devolve o mesmo JSON."""
+    db_path = benchmark.generate_legacy_database(tmp_path, 50, labels=3)
+    legacy = _legacy_rows(db_path)
+
+    manager = DataManager(tmp_path)
+    conn = manager._get_connection()
+    assert migrations.get_version(conn) == migrations.SCHEMA_VERSION
+    types = conn.execute(
+        'SELECT DISTINCT typeof(review_type), typeof(scheduled_day) FROM reviews'
+    ).fetchall()
+    conn.close()
+    assert [tuple(row) for row in types] == [('integer', 'integer')]
+
+    content = manager.get_content_by_id(1)
+    expected = {
+        row['review_type']: {
+            'scheduled_date': row['scheduled_date'],
+            'completed': bool(row['completed']),
+            'completed_at': row['completed_at']
+        }
+        for row in legacy if row['content_id'] == 1
+    }
+    assert content['reviews'] == expected
+
+    first = legacy[0]
+    by_date = manager.get_reviews_by_date(first['scheduled_date'])
+    assert first['id'] in [review['review_id'] for review in by_date]
+    assert all(review['scheduled_date'] == first['scheduled_date'] for review in by_date)
+
+    today = datetime.now().date().isoformat()
+    stats = manager.get_statistics()
+    assert stats['total_reviews'] == len(legacy)
+    assert stats['pending_today'] == sum(
+        1 for row in legacy if row['scheduled_date'] <= today and not row['completed']
+    )
+
+    # Escritas seguem funcionando sobre o esquema novo
+    assert manager.mark_review_completed(1, first['review_type'])['success']
+    new = manager.create_content("Depois da migração", 1)
+    assert manager.get_content_by_id(new['id'])['reviews']['one_week']['scheduled_date'] == \
+        new['review_dates']['one_week']
+    manager.close()
+
+
+def test_converte_pendencias_e_tipos_desconhecidos(tmp_path):
+    """review_pending_by_date vira review_pending_by_day e nenhum tipo se perde."""
+    db_path = benchmark.generate_legacy_database(tmp_path, 5, labels=1)
+    yesterday = (datetime.now() - timedelta(days=1)).date().isoformat()
+    conn = sqlite3.connect(db_path)
+    conn.execute("UPDATE reviews SET review_type = 'extra', scheduled_date = ?, completed = 0 "
+                 "WHERE id = 1", (yesterday,))
+    conn.execute('CREATE TABLE review_pending_by_date (scheduled_date TEXT PRIMARY KEY, pending INTEGER NOT NULL)')
+    conn.execute("INSERT INTO review_pending_by_date VALUES (?, 1)", (yesterday,))
+    conn.commit()
+    conn.close()
+
+    manager = DataManager(tmp_path)
+    assert manager.get_content_by_id(1)['reviews']['extra']['scheduled_date'] == yesterday
+    assert manager.get_review_summary(yesterday, yesterday)[yesterday]['pending'] == 1
+    manager.close()
+
+
+def test_migracao_falha_sem_alterar_o_banco(tmp_path):
+    """Uma migração que falha é desfeita por inteiro."""
+    db_path = benchmark.generate_legacy_database(tmp_path, 3, labels=1)
+    conn = sqlite3.connect(db_path)
+    conn.execute("UPDATE reviews SET scheduled_date = 'amanhã' WHERE id = 2")
+    conn.commit()
+
+    with pytest.raises(sqlite3.IntegrityError):
+        migrations.migrate(conn)
+    assert migrations.get_version(conn) == 0
+    assert conn.execute("SELECT scheduled_date FROM reviews WHERE id = 2").fetchone()[0] == 'amanhã'
+    conn.close()
+
+
+def test_recusa_banco_mais_novo(tmp_path):
+    """Um banco de uma versão futura não é aberto."""
+    DataManager(tmp_path).close()
+    conn = sqlite3.connect(tmp_path / 'study_data.db')
+    conn.execute(f'PRAGMA user_version = {migrations.SCHEMA_VERSION + 1}')
+    conn.close()
+
+    with pytest.raises(RuntimeError):
+        DataManager(tmp_path)
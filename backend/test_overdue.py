@@ -0,0 +1,63 @@
+"""
+Testes da lista paginada de revisões pendentes até hoje (atrasadas)
+"""
+from datetime import date, timedelta
+
+
+def _create_past(db, title: str, label_id: int, days_ago: int):
+    """Cria um conteúdo como se tivesse sido estudado há `days_ago` dias."""
+    created = (date.today() - timedelta(days=days_ago)).isoformat()
+    return db.create_contents_bulk([{'title': title, 'label_id': label_id, 'created_at': created}])
+
+
+def test_paginas_cobrem_o_atraso_do_mais_antigo_ao_mais_novo(db):
+    """As páginas seguem (dia, id) sem repetir nem pular, e o total bate com pending_today."""
+    label = db.create_label('História', '#AA0000')
+    for days_ago in (40, 10, 3):
+        _create_past(db, f'Há {days_ago} dias', label['id'], days_ago)
+    db.create_content('Futuro', label['id'])  # Primeira revisão amanhã: não entra
+
+    first = db.get_overdue_reviews(limit=2)
+    assert first['total'] == db.get_statistics()['pending_today']
+
+    items, page = [], first
+    while True:
+        items.extend(page['items'])
+        if page['next_cursor'] is None:
+            break
+        page = db.get_overdue_reviews(page['next_cursor'], 2)
+        assert page['total'] is None
+
+    assert len(items) == first['total']
+    keys = [(review['scheduled_date'], review['review_id']) for review in items]
+    assert keys == sorted(keys)
+    assert len(set(keys)) == len(keys)
+    assert all(review['scheduled_date'] <= date.today().isoformat() for review in items)
+    assert items[0]['title'] == 'Há 40 dias'
+    assert 'scheduled_day' not in items[0]
+
+
+def test_filtro_por_label_e_revisoes_completas(db):
+    """Revisões completas saem da lista; o filtro por label conta só a label."""
+    history = db.create_label('História', '#AA0000')
+    math = db.create_label('Matemática', '#00AA00')
+    _create_past(db, 'Revolução', history['id'], 10)
+    _create_past(db, 'Frações', math['id'], 10)
+
+    content_id = db.get_overdue_reviews(label_id=math['id'])['items'][0]['content_id']
+    db.mark_review_completed(content_id, 'next_day')
+
+    page = db.get_overdue_reviews(label_id=math['id'])
+    assert page['total'] == 1
+    assert [review['review_type'] for review in page['items']] == ['one_week']
+    assert {review['label_id'] for review in page['items']} == {math['id']}
+    assert db.get_overdue_reviews()['total'] == 3
+
+
+def test_parametros_invalidos(db):
+    assert 'error' in db.get_overdue_reviews(limit=0)
+    assert db.get_overdue_reviews('abc') == {'error': 'Cursor inválido'}
+    for cursor in ('1|2|3', '19000', '|', 19000, ['1', '2'], {'day': 1}):
+        assert db.get_overdue_reviews(cursor) == {'error': 'Cursor inválido'}, cursor
+    assert db.get_overdue_reviews(limit='50') == {'error': 'O limite deve estar entre 1 e 500'}
+    assert db.get_overdue_reviews(limit=2.5) == {'error': 'O limite deve estar entre 1 e 500'}
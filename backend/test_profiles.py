@@ -0,0 +1,140 @@
+"""
+Testes dos perfis (um banco por perfil, abertura sob demanda e estatísticas somadas)
+"""
+import sqlite3
+
+import main
+import profiles
+from profiles import DEFAULT_PROFILE, ProfileManager
+
+
+def _fill(db, contents: int):
+    label = db.create_label(f'Label {contents}', '#123456')
+    for index in range(contents):
+        db.create_content(f'Conteúdo {index}', label['id'])
+
+
+def test_perfis_tem_bancos_separados(tmp_path):
+    """O perfil padrão fica no caminho antigo; os outros em profiles/<nome>."""
+    manager = ProfileManager(tmp_path)
+    _fill(manager.get(), 2)
+
+    assert manager.create_profile('Ana@Example.com') == {'name': 'ana@example.com'}
+    assert manager.create_profile('ana@example.com') == {'error': 'Perfil já existe'}
+    assert 'error' in manager.create_profile('../fora')
+    assert manager.list_profiles() == [DEFAULT_PROFILE, 'ana@example.com']
+    assert (tmp_path / 'study_data.db').exists()
+    assert (tmp_path / 'profiles' / 'ana@example.com' / 'study_data.db').exists()
+
+    assert manager.switch('ana@example.com') == {'name': 'ana@example.com'}
+    assert manager.get().get_statistics()['total_contents'] == 0
+    manager.close_all()
+
+    # O perfil ativo é lembrado na próxima abertura
+    reopened = ProfileManager(tmp_path)
+    assert reopened.active == 'ana@example.com'
+    assert reopened.get(DEFAULT_PROFILE).get_statistics()['total_contents'] == 2
+    reopened.close_all()
+
+
+def test_bancos_ociosos_sao_fechados(tmp_path):
+    """Só abre o banco de um perfil ao usá-lo e fecha os ociosos (menos o ativo)."""
+    opened = []
+    manager = ProfileManager(tmp_path, idle_seconds=10, on_open=opened.append)
+    manager.create_profile('bia')
+    assert len(opened) == 1 and not manager.is_open(DEFAULT_PROFILE)
+
+    manager.get()
+    assert manager.evict_idle(now=manager._last_used['bia'] + 5) == []
+    assert manager.evict_idle(now=manager._last_used['bia'] + 10) == ['bia']
+    assert manager.is_open(DEFAULT_PROFILE) and not manager.is_open('bia')
+
+    # Reabre sob demanda
+    assert manager.get('bia').get_statistics()['total_contents'] == 0
+    assert len(opened) == 3
+    manager.close_all()
+
+
+def test_estatisticas_de_todos_os_perfis_em_uma_consulta(tmp_path, monkeypatch):
+    """Soma os perfis anexando os bancos, mesmo acima do limite de ATTACH."""
+    manager = ProfileManager(tmp_path)
+    _fill(manager.get(), 3)
+    for index in range(12):
+        manager.create_profile(f'perfil{index}')
+        _fill(manager.get(f'perfil{index}'), index % 3)
+
+    queries = []
+    connect = sqlite3.connect
+
+    def tracing_connect(*args, **kwargs):
+        conn = connect(*args, **kwargs)
+        conn.set_trace_callback(lambda sql: queries.append(sql) if 'UNION ALL' in sql else None)
+        return conn
+
+    monkeypatch.setattr(profiles.sqlite3, 'connect', tracing_connect)
+    result = manager.aggregate_statistics()
+
+    assert result['profiles']['perfil4']['total_contents'] == 1
+    assert result['total']['total_contents'] == 3 + sum(index % 3 for index in range(12))
+    assert result['total']['total_labels'] == 13
+    assert result['total']['total_reviews'] == 4 * result['total']['total_contents']
+    assert len(queries) == 2  # 13 bancos: dois lotes de até 10
+    manager.close_all()
+
+
+def test_estatisticas_migram_perfis_antigos(tmp_path):
+    """Perfis sem a tabela stats são migrados; os de versão mais nova ficam de fora."""
+    manager = ProfileManager(tmp_path)
+    _fill(manager.get(), 1)
+    for name in ('antigo', 'futuro'):
+        manager.create_profile(name)
+        _fill(manager.get(name), 2)
+    manager.close_all()
+
+    # Como bancos criados antes das estatísticas mantidas por triggers;
+    # 'futuro' ainda tem uma versão de esquema que este app não abre
+    for name, version in (('antigo', None), ('futuro', 999)):
+        conn = sqlite3.connect(tmp_path / 'profiles' / name / 'study_data.db')
+        for table in ('stats', 'review_pending_by_day'):
+            conn.execute(f'DROP TABLE {table}')
+        conn.execute("DELETE FROM settings WHERE key = 'schema_stamp'")
+        if version is not None:
+            conn.execute(f'PRAGMA user_version = {version}')
+        conn.commit()
+        conn.close()
+
+    manager = ProfileManager(tmp_path)
+    result = manager.aggregate_statistics()
+    assert set(result['profiles']) == {DEFAULT_PROFILE, 'antigo'}
+    assert result['profiles']['antigo']['total_contents'] == 2
+    assert result['total']['total_contents'] == 3
+    manager.close_all()
+
+
+def test_nome_de_perfil_que_nao_e_texto(tmp_path):
+    """Nomes que não são texto dão erro em vez de exceção."""
+    backend = main.Backend(tmp_path, profile=False)
+    for name in (5, ['a'], {}):
+        assert backend.create_profile(name) == {'error': 'Nome de perfil inválido'}
+        assert backend.switch_profile(name) == {'error': 'Perfil não encontrado'}
+    backend._shutdown()
+
+
+def test_backend_troca_de_perfil(tmp_path):
+    """Depois da troca, as leituras e escritas do Backend usam o banco do novo perfil."""
+    backend = main.Backend(tmp_path, profile=False)
+    label = backend.create_label('Geral', '#000000')
+    backend.create_content('No padrão', label['id'])
+
+    assert backend.create_profile('carla') == {'name': 'carla'}
+    assert backend.switch_profile('carla') == {'name': 'carla'}
+    assert backend.get_profiles() == {'active': 'carla', 'profiles': [DEFAULT_PROFILE, 'carla']}
+    assert backend.get_contents() == []
+    assert backend.switch_profile('inexistente') == {'error': 'Perfil não encontrado'}
+
+    label = backend.create_label('Outra', '#ffffff')
+    backend.create_content('No perfil', label['id'])
+    totals = backend.get_all_statistics()
+    assert totals['total']['total_contents'] == 2
+    assert totals['profiles']['carla']['total_labels'] == 1
+    backend._shutdown()
@@ -0,0 +1,267 @@
+"""
+Testes dos planos de consulta: toda consulta do DataManager usa índice
+
+Cada método é executado em um banco pequeno com o trace do SQLite ligado, e
+cada comando capturado passa por EXPLAIN QUERY PLAN. Varreduras de tabela
+(SCAN) e ordenações temporárias (USE TEMP B-TREE) falham o teste, a não ser
+que estejam em ALLOWED com o motivo.
+
+Os comandos dentro dos triggers não aparecem no trace: test_triggers_usam_indices
+checa o plano de cada um a partir da definição em sqlite_master.
+"""
+import inspect
+import re
+from datetime import datetime, timedelta
+
+import pytest
+
+from data_manager import DataManager
+
+
+# (método, início do plano) -> por que a varredura ou ordenação é esperada.
+# O início casa com palavras inteiras: 'SCAN labels' não libera 'SCAN labels_x'.
+ALLOWED = {
+    ('get_all_labels', 'SCAN labels'): 'lista todas as labels (tabela pequena)',
+    ('create_contents_bulk', 'SCAN labels'): 'mapa nome -> id das labels para a importação',
+    ('get_all_contents', 'SCAN c USING INDEX idx_contents_created'): 'lista todos os conteúdos, já na ordem do índice',
+    ('get_all_contents', 'SCAN c USING INDEX idx_archived_contents_created'): 'idem, no arquivo',
+    ('list_contents', 'SCAN c USING INDEX idx_contents_created'): 'página sem filtro: lê só até o LIMIT',
+    ('get_statistics', 'SCAN stats'): 'lê todos os contadores (poucas linhas)',
+    ('get_reviews_by_date', 'USE TEMP B-TREE FOR RIGHT PART OF ORDER BY'):
+        'o índice já ordena por completed; só o título (de contents) é ordenado, dentro do dia',
+    ('get_reviews_by_range', 'USE TEMP B-TREE FOR RIGHT PART OF ORDER BY'):
+        'o índice já ordena por dia e completed; só o título é ordenado, dentro de cada dia',
+    ('get_changes_since', 'USE TEMP B-TREE FOR DISTINCT'):
+        'a busca é por intervalo de version (chave primária); o DISTINCT só vê o que mudou',
+    ('reschedule_reviews', 'SCAN r USING INDEX idx_reviews_content_type'): 'recalcula todas as revisões, já na ordem do índice',
+    ('reschedule_reviews', 'SCAN reviews USING COVERING INDEX idx_reviews_date'): 'refaz review_pending_by_day inteira',
+    ('archive_completed', 'SCAN r USING INDEX idx_reviews_content_type'): 'procura conteúdos completos em todas as revisões',
+    ('compact_change_log', 'SCAN change_log'): 'manutenção ao fechar o app: percorre o log inteiro',
+    ('compact_change_log', 'USE TEMP B-TREE FOR GROUP BY'):
+        'um índice por (entity, row_id) pesaria em toda escrita só para a manutenção',
+    **{
+        ('iter_export_records', f'SCAN {table}'): 'exporta a tabela inteira, na ordem da chave primária'
+        for table in ('settings', 'labels', 'contents', 'archived_contents', 'reviews', 'archived_reviews')
+    },
+    ('restore_records', 'SCAN review_types'): 'mapa nome -> código dos tipos (tabela pequena)',
+    **{
+        ('restore_records', f'SCAN {table}'): 'EXISTS do banco vazio e COUNT(*) das estatísticas refeitas'
+        for table in ('labels', 'contents', 'archived_contents', 'reviews', 'archived_reviews')
+    },
+}
+
+# Início do plano -> por que a varredura é esperada em qualquer trigger
+ALLOWED_IN_TRIGGERS = {
+    'SCAN bulk_load': 'WHEN NOT EXISTS: a tabela só tem uma linha durante a carga em massa',
+}
+
+# Varreduras que não são de tabela do app ('SCAN CONSTANT ROW', 'SCAN 6 CONSTANT ROWS')
+IGNORED_SCANS = re.compile(r'SCAN (\d+ )?CONSTANT ROW|SCAN \(|SCAN sqlite_sequence')
+
+PLANNED = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH', 'REPLACE')
+
+
+class PlanRecorder:
+    """Guarda os comandos executados por cada método do DataManager."""
+
+    def __init__(self, db: DataManager):
+        self.db = db
+        self.statements = {}  # método -> comandos na ordem
+        self.method = None
+        get_connection = db._get_connection
+
+        def traced():
+            conn = get_connection()
+            conn.set_trace_callback(self._trace)
+            return conn
+
+        db._get_connection = traced
+
+    def _trace(self, statement: str):
+        if self.method is not None and not statement.startswith('--'):
+            self.statements.setdefault(self.method, []).append(statement)
+
+    def call(self, method: str, *args):
+        self.method = method
+        try:
+            result = getattr(self.db, method)(*args)
+            return list(result) if inspect.isgenerator(result) else result
+        finally:
+            self.method = None
+
+    def problems(self):
+        """(método, comando, linha do plano) de cada varredura ou ordenação não permitida."""
+        conn = self.db._get_connection()
+        conn.set_trace_callback(None)
+        found = []
+        try:
+            for method, statements in self.statements.items():
+                for statement in dict.fromkeys(statements):
+                    words = statement.split()
+                    if words[:3] == ['CREATE', 'TEMP', 'TABLE']:
+                        conn.execute(statement)  # Tabelas temporárias usadas nos comandos seguintes
+                        continue
+                    if words[0].upper() not in PLANNED:
+                        continue
+                    for row in conn.execute('EXPLAIN QUERY PLAN ' + statement):
+                        detail = row[3]
+                        if not _is_problem(detail):
+                            continue
+                        if any(m == method and _starts_with(detail, part) for m, part in ALLOWED):
+                            continue
+                        found.append((method, ' '.join(words), detail))
+        finally:
+            conn.close()
+        return found
+
+
+def _is_problem(detail: str) -> bool:
+    if detail.startswith('USE TEMP B-TREE'):
+        return True
+    if not detail.startswith('SCAN ') or IGNORED_SCANS.match(detail):
+        return False
+    return 'VIRTUAL TABLE' not in detail  # json_each e contents_fts fazem a própria busca
+
+
+def _starts_with(detail: str, part: str) -> bool:
+    """Se o plano começa com `part` seguido de fim ou espaço (palavra inteira)."""
+    return detail == part or detail.startswith(part + ' ')
+
+
+def _trigger_statements(sql: str):
+    """Condição WHEN e comandos do corpo de um trigger, com NEW./OLD. trocados por ?."""
+    header, body = re.split(r'\bBEGIN\b', sql, maxsplit=1)
+    body = body[:body.rstrip().rfind('END')]
+    statements = [part.strip() for part in body.split(';') if part.strip()]
+    when = re.search(r'\bWHEN\b(.*)$', header, re.S)
+    if when:
+        statements.insert(0, f'SELECT 1 WHERE {when.group(1).strip()}')
+    return [re.sub(r'\b(NEW|OLD)\.\w+', '?', statement) for statement in statements]
+
+
+@pytest.fixture
+def recorder(tmp_path):
+    db = DataManager(tmp_path)
+    yield PlanRecorder(db)
+    db.close()
+
+
+def _exercise(recorder: PlanRecorder):
+    """Chama cada método público do DataManager que acessa o banco."""
+    call = recorder.call
+    today = datetime.now().strftime('%Y-%m-%d')
+    later = (datetime.now() + timedelta(days=40)).strftime('%Y-%m-%d')
+
+    label = call('create_label', 'Matemática', '#111111')
+    other = call('create_label', 'Física', '#222222')
+    content = call('create_content', 'Derivadas', label['id'])
+    call('create_contents_bulk', [{'title': f'Tópico {i}', 'label_id': label['id']} for i in range(5)])
+    call('update_label', other['id'], 'Química', '#333333')
+    call('get_all_labels')
+    call('get_all_contents')
+    page = call('list_contents', None, 3)
+    call('list_contents', page['next_cursor'], 3, label['id'], '2020-01-01', later)
+    call('get_content_by_id', content['id'])
+    call('search_contents', 'deriv')
+    call('search_contents', 'tóp', 5, label['id'])
+    call('update_content', content['id'], 'Integrais', other['id'])
+
+    call('get_reviews_by_date')
+    call('get_reviews_by_date', today)
+    call('get_reviews_by_range', today, later)
+    call('get_review_summary', today, later)
+    call('get_review_forecast', 30)
+    overdue = call('get_overdue_reviews', None, 2)
+    call('get_overdue_reviews', overdue['next_cursor'], 2, label['id'])
+    call('get_overdue_reviews', None, 2, label['id'])
+    call('mark_review_completed', content['id'], 'next_day')
+    call('unmark_review_completed', content['id'], 'next_day')
+    call('mark_reviews_completed', [(content['id'], 'one_week')])
+    call('unmark_reviews_completed', [(content['id'], 'one_week')])
+    call('mark_reviews_completed_by_date', today)
+    call('unmark_reviews_completed_by_date', today)
+    call('get_statistics')
+
+    call('set_scheduler', 'sm2')
+    call('set_load_balancing', 5)
+    call('create_content', 'Balanceado', label['id'])
+    call('reschedule_reviews')
+
+    # Um conteúdo completo há muito tempo vai para o arquivo
+    conn = recorder.db._get_connection()
+    conn.execute("UPDATE reviews SET completed = 1, completed_at = '2000-01-01' WHERE content_id = ?", (content['id'],))
+    conn.commit()
+    conn.close()
+    recorder.db._cache.clear()
+    assert call('archive_completed')['archived'] == 1
+    call('get_all_contents', True)
+    call('get_content_by_id', content['id'], True)
+    call('get_reviews_by_date', '2000-01-01')
+    call('unmark_reviews_completed_by_date', today)
+    call('unmark_review_completed', content['id'], 'next_day')
+
+    call('get_changes_since', 0)
+    call('compact_change_log')
+    call('delete_content', content['id'])
+    call('delete_label', other['id'])
+    return call('iter_export_records')
+
+
+def test_consultas_usam_indices(recorder, tmp_path):
+    records = _exercise(recorder)
+
+    restored = PlanRecorder(DataManager(tmp_path / 'restaurado'))
+    restored.call('restore_records', iter(records))
+
+    problems = recorder.problems() + restored.problems()
+    restored.db.close()
+    assert problems == [], '\n'.join(f'{m}: {plan}\n    {sql[:200]}' for m, sql, plan in problems)
+
+
+def test_marcacao_usa_indice_por_conteudo_e_tipo(recorder):
+    """mark/unmark_review_completed buscam a revisão por (content_id, review_type)."""
+    label = recorder.db.create_label('A', '#000000')
+    content = recorder.db.create_content('B', label['id'])
+    recorder.call('mark_review_completed', content['id'], 'one_month')
+
+    conn = recorder.db._get_connection()
+    plans = [
+        row[3]
+        for statement in recorder.statements['mark_review_completed']
+        if statement.split()[0] in PLANNED
+        for row in conn.execute('EXPLAIN QUERY PLAN ' + statement)
+        if row[3].startswith('SEARCH reviews')
+    ]
+    conn.close()
+    assert plans
+    assert all('idx_reviews_content_type (content_id=? AND review_type=?)' in plan for plan in plans), plans
+
+
+def test_triggers_usam_indices(tmp_path):
+    """Os comandos dos triggers (estatísticas, change_log, busca) usam índice."""
+    db = DataManager(tmp_path)
+    conn = db._get_connection()
+    found = []
+    checked = set()
+    try:
+        triggers = conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'trigger'").fetchall()
+        for name, sql in triggers:
+            for statement in _trigger_statements(sql):
+                params = (None,) * statement.count('?')
+                for row in conn.execute('EXPLAIN QUERY PLAN ' + statement, params):
+                    detail = row[3]
+                    if 'stats' in statement or 'review_pending_by_day' in statement:
+                        checked.add(name)
+                    if not _is_problem(detail):
+                        continue
+                    if any(_starts_with(detail, part) for part in ALLOWED_IN_TRIGGERS):
+                        continue
+                    found.append((name, ' '.join(statement.split()), detail))
+    finally:
+        conn.close()
+        db.close()
+
+    # Os triggers que mantêm stats e review_pending_by_day foram todos vistos
+    assert {'trg_stats_reviews_insert', 'trg_stats_reviews_update', 'trg_stats_reviews_delete',
+            'trg_stats_contents_insert', 'trg_stats_labels_delete'} <= checked
+    assert found == [], '\n'.join(f'{t}: {plan}\n    {sql[:200]}' for t, sql, plan in found)
@@ -8,7 +8,7 @@ def test_review_dates():
     """Testa se as revisões aparecem apenas nas datas exatas."""
     print("🔧 Testando datas de revisão...\n")
     
-    db = DataManager()
+    db = DataManager(':memory:')  # Banco isolado: não toca nos dados reais
     
     # Cria label e conteúdo
     label = db.create_label("Teste", "#FF0000")
@@ -98,6 +98,7 @@ def test_review_dates():
         print(f"   ❌ ERRO - Deveria aparecer exatamente 1 revisão!\n")
     
     print("✅ Teste concluído!")
+    db.close()
 
 if __name__ == "__main__":
     test_review_dates()
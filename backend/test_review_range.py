@@ -0,0 +1,30 @@
+"""
+Testes da consulta de revisões por intervalo (visão mensal do calendário)
+"""
+from datetime import date, timedelta
+
+
+def test_intervalo_igual_a_soma_dos_dias(db):
+    """get_reviews_by_range e o resumo batem com consultas dia a dia."""
+    label = db.create_label("Química", "#0000FF")
+    first = db.create_content("Estequiometria", label['id'])
+    db.create_content("Ligações", label['id'])
+    db.mark_review_completed(first['id'], 'one_week')
+
+    today = date.today()
+    days = [(today + timedelta(days=i)).isoformat() for i in range(32)]
+
+    by_range = db.get_reviews_by_range(days[0], days[-1])
+    by_day = [review for day in days for review in db.get_reviews_by_date(day)]
+    assert sorted(r['review_id'] for r in by_range) == sorted(r['review_id'] for r in by_day)
+
+    summary = db.get_review_summary(days[0], days[-1])
+    assert summary[first['review_dates']['next_day']] == {'pending': 2, 'completed': 0}
+    assert summary[first['review_dates']['one_week']] == {'pending': 1, 'completed': 1}
+    assert first['review_dates']['three_months'] not in summary
+
+
+def test_intervalo_invalido(db):
+    """Datas inválidas ou invertidas retornam erro."""
+    assert 'error' in db.get_reviews_by_range('2024-02-01', '2024-01-01')
+    assert 'error' in db.get_review_summary('ontem', '2024-01-01')
@@ -0,0 +1,110 @@
+"""
+Testes dos agendadores e do reagendamento em lote
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from data_manager import DataManager
+from encoding import from_day, to_day
+from scheduler import Scheduler, SM2Scheduler
+
+
+def _set_review(db, content_id, review_type, scheduled_day, completed_day=None):
+    conn = db._get_connection()
+    conn.execute(
+        'UPDATE reviews SET scheduled_day = ?, completed = ?, completed_at = ? '
+        'WHERE content_id = ? AND review_type = (SELECT id FROM review_types WHERE name = ?)',
+        (scheduled_day, int(completed_day is not None),
+         from_day(completed_day) + 'T10:00:00' if completed_day is not None else None,
+         content_id, review_type)
+    )
+    conn.commit()
+    conn.close()
+    db._cache.clear()
+
+
+def _days(db, content_id):
+    reviews = db.get_content_by_id(content_id)['reviews']
+    return {name: to_day(review['scheduled_date']) for name, review in reviews.items()}
+
+
+def test_fixo_restaura_o_agendamento_padrao(db):
+    """Com o agendador fixo, reagendar devolve as pendentes às datas 1/7/30/90."""
+    label = db.create_label("Física", "#0000FF")
+    content = db.create_content("Cinemática", label['id'])
+    created = to_day(datetime.now())
+    _set_review(db, content['id'], 'next_day', created + 3, completed_day=created + 3)
+    _set_review(db, content['id'], 'one_month', created + 200)
+
+    result = db.reschedule_reviews()
+
+    assert result == {'scheduler': 'fixed', 'updated': 1, 'contents': 1}
+    assert _days(db, content['id']) == {
+        'next_day': created + 3, 'one_week': created + 7,
+        'one_month': created + 30, 'three_months': created + 90
+    }
+    assert db.reschedule_reviews()['updated'] == 0
+
+
+def test_sm2_adapta_pelo_atraso(db):
+    """Revisões em dia alongam os intervalos; atrasos grandes os reiniciam."""
+    assert db.set_scheduler('sm2') == {'success': True, 'scheduler': 'sm2'}
+    label = db.create_label("Química", "#00FFFF")
+    on_time = db.create_content("Ligações", label['id'])
+    late = db.create_content("Soluções", label['id'])
+    start = on_time['review_dates']['next_day']
+    assert to_day(on_time['review_dates']['one_week']) - to_day(start) == 6
+
+    day = to_day(start)
+    _set_review(db, on_time['id'], 'next_day', day, completed_day=day)
+    _set_review(db, late['id'], 'next_day', day, completed_day=day + 10)
+    version = db.get_changes_since(0)['version']
+    db.reschedule_reviews()
+
+    # Qualidade 5: facilidade 2.6 -> intervalos 6, 16, 42
+    assert _days(db, on_time['id']) == {
+        'next_day': day, 'one_week': day + 6, 'one_month': day + 22, 'three_months': day + 64
+    }
+    # Qualidade 2: recomeça com 1 dia a partir de quando foi feita
+    assert _days(db, late['id'])['one_week'] == day + 11
+
+    changed = {c['id'] for c in db.get_changes_since(version)['contents']}
+    assert changed == {on_time['id'], late['id']}
+    target = from_day(day + 22)
+    assert db.get_review_summary(target, target)[target]['pending'] == 1
+
+
+def test_estatisticas_apos_reagendar(db):
+    """review_pending_by_day é refeito junto com as datas."""
+    label = db.create_label("História", "#AA0000")
+    ids = [db.create_content(f"Tema {i}", label['id'])['id'] for i in range(5)]
+    yesterday = to_day(datetime.now() - timedelta(days=1))
+    for content_id in ids:
+        _set_review(db, content_id, 'next_day', yesterday - 30)
+    assert db.get_statistics()['pending_today'] == 5
+
+    db.reschedule_reviews()
+    assert db.get_statistics()['pending_today'] == 0
+
+
+def test_agendador_salvo_no_banco(tmp_path):
+    """A escolha do agendador sobrevive a reaberturas; nomes inválidos dão erro."""
+    manager = DataManager(tmp_path)
+    assert 'error' in manager.set_scheduler('leitner')
+    manager.set_scheduler('sm2')
+    manager.close()
+
+    reopened = DataManager(tmp_path)
+    assert isinstance(reopened.scheduler, SM2Scheduler)
+    reopened.close()
+
+
+def test_agendador_incompleto_falha_ao_criar():
+    """Um agendador sem reschedule não chega a ser criado."""
+    class SoInicial(Scheduler):
+        def initial_days(self, created_day):
+            return [created_day + 1] * 4
+
+    with pytest.raises(TypeError, match='reschedule'):
+        SoInicial()
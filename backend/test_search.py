@@ -0,0 +1,53 @@
+"""
+Testes da busca textual (FTS5) nos títulos dos conteúdos
+"""
+
+
+def _titles(results):
+    return [content['title'] for content in results]
+
+
+def test_prefixo_e_acentos(db):
+    """Busca por prefixo, sem diferenciar acentos e maiúsculas."""
+    math = db.create_label("Matemática", "#FFFF00")
+    physics = db.create_label("Física", "#00FF00")
+    db.create_content("Equação do 2º Grau", math['id'])
+    db.create_content("Leis de Newton", physics['id'])
+    db.create_content("Equação de Torricelli", physics['id'])
+
+    assert _titles(db.search_contents("newt")) == ["Leis de Newton"]
+    assert sorted(_titles(db.search_contents("EQUACAO"))) == [
+        "Equação de Torricelli", "Equação do 2º Grau"
+    ]
+    assert _titles(db.search_contents("equa", label_id=math['id'])) == ["Equação do 2º Grau"]
+    assert _titles(db.search_contents("equacao torri")) == ["Equação de Torricelli"]
+
+    [result] = db.search_contents("newton")
+    assert set(result['reviews']) == {'next_day', 'one_week', 'one_month', 'three_months'}
+
+
+def test_indice_acompanha_escritas(db):
+    """Atualizações e exclusões refletem na busca."""
+    label = db.create_label("História", "#AA0000")
+    content = db.create_content("Revolução Francesa", label['id'])
+
+    db.update_content(content['id'], "Revolução Industrial", label['id'])
+    assert db.search_contents("francesa") == []
+    assert _titles(db.search_contents("industrial")) == ["Revolução Industrial"]
+
+    db.delete_content(content['id'])
+    assert db.search_contents("revolucao") == []
+
+
+def test_sintaxe_fts_e_busca_vazia(db):
+    """Operadores do FTS5 digitados pelo usuário não quebram a busca."""
+    label = db.create_label("Química", "#0000FF")
+    db.create_content("Ácidos e bases", label['id'])
+
+    assert db.search_contents('') == []
+    assert db.search_contents('"*()') == []
+    assert _titles(db.search_contents('acidos "bases')) == ["Ácidos e bases"]
+    assert db.search_contents('acidos', limit=0) == {'error': 'O limite deve estar entre 1 e 500'}
+    assert db.search_contents('acidos', limit='5') == {'error': 'O limite deve estar entre 1 e 500'}
+    for invalid in (5, ['a'], {}):
+        assert db.search_contents(invalid) == {'error': 'A busca deve ser um texto'}
@@ -0,0 +1,98 @@
+"""
+Testes da abertura rápida (sem DDL no banco pronto e banco aberto em segundo plano)
+"""
+import threading
+
+import pytest
+
+import main
+from data_manager import DataManager
+
+
+@pytest.fixture
+def create_calls(monkeypatch):
+    """Conta as chamadas de DataManager._create_tables."""
+    calls = []
+    original = DataManager._create_tables
+
+    def counting(self):
+        calls.append(1)
+        return original(self)
+
+    monkeypatch.setattr(DataManager, '_create_tables', counting)
+    return calls
+
+
+def test_reabertura_nao_recria_o_schema(tmp_path, create_calls):
+    """Banco com o carimbo atual abre sem rodar o DDL."""
+    DataManager(tmp_path).close()
+    assert len(create_calls) == 1
+
+    db = DataManager(tmp_path)
+    assert len(create_calls) == 1
+    assert db.get_statistics()['total_contents'] == 0
+    db.close()
+
+
+def test_carimbo_antigo_recria_o_schema(tmp_path, create_calls):
+    """Carimbo diferente (app atualizado) roda o DDL de novo."""
+    db = DataManager(tmp_path)
+    conn = db._get_connection()
+    conn.execute("UPDATE settings SET value = '0.0' WHERE key = 'schema_stamp'")
+    conn.commit()
+    conn.close()
+    db.close()
+
+    db = DataManager(tmp_path)
+    assert len(create_calls) == 2
+    assert db._schema_is_current()
+    db.close()
+
+
+def test_backend_retorna_antes_de_abrir_o_banco(tmp_path, monkeypatch):
+    """O construtor não espera o banco; as chamadas esperam."""
+    gate = threading.Event()
+
+    class SlowDataManager(DataManager):
+        def __init__(self, data_dir=None):
+            gate.wait(5)
+            super().__init__(data_dir)
+
+    monkeypatch.setattr(main, 'DataManager', SlowDataManager)
+    backend = main.Backend(tmp_path, profile=False)
+    assert not backend._db_ready.is_set()
+
+    gate.set()
+    assert backend.get_statistics()['total_contents'] == 0
+    backend._shutdown()
+
+
+def test_erro_na_abertura_aparece_ao_usar_o_banco(tmp_path, monkeypatch):
+    """Falha ao abrir o banco é relançada em quem acessa Backend.db."""
+    def broken(data_dir=None):
+        raise RuntimeError('banco de uma versão mais nova')
+
+    monkeypatch.setattr(main, 'DataManager', broken)
+    backend = main.Backend(tmp_path, profile=False)
+    with pytest.raises(RuntimeError, match='versão mais nova'):
+        backend.db
+
+
+def test_falha_de_tarefa_automatica_reagenda(tmp_path, caplog):
+    """Uma falha passageira é registrada e a tarefa volta no próximo intervalo."""
+    backend = main.Backend(tmp_path, profile=False)
+    calls = []
+    done = threading.Event()
+
+    def flaky():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError('database is locked')
+        backend._closing = True  # Encerra depois da segunda execução
+        done.set()
+
+    backend._schedule(flaky, 0, 0.01)
+    assert done.wait(5)
+    assert len(calls) == 2
+    assert 'flaky' in caplog.text and 'database is locked' in caplog.text
+    backend._shutdown()
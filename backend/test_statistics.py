@@ -0,0 +1,110 @@
+"""
+Testes dos contadores de estatísticas mantidos por triggers
+"""
+import random
+from datetime import datetime, timedelta
+
+from data_manager import DataManager
+from encoding import to_day
+
+
+def _count_statistics(db, today):
+    """Calcula as estatísticas com COUNT(*), como era feito antes (mais o arquivo)."""
+    conn = db._get_connection()
+    try:
+        count = lambda sql, *args: conn.execute(sql, args).fetchone()[0]
+        archived_reviews = count('SELECT COUNT(*) FROM archived_reviews')
+        return {
+            'total_contents': count('SELECT COUNT(*) FROM contents') + count('SELECT COUNT(*) FROM archived_contents'),
+            'total_labels': count('SELECT COUNT(*) FROM labels'),
+            'pending_today': count(
+                'SELECT COUNT(*) FROM reviews WHERE scheduled_day <= ? AND completed = 0', today
+            ),
+            'completed_reviews': count('SELECT COUNT(*) FROM reviews WHERE completed = 1') + archived_reviews,
+            'total_reviews': count('SELECT COUNT(*) FROM reviews') + archived_reviews,
+            'archived_contents': count('SELECT COUNT(*) FROM archived_contents'),
+        }
+    finally:
+        conn.close()
+
+
+def test_contadores_exatos(db):
+    """Após uma sequência aleatória de operações os contadores batem com COUNT(*)."""
+    rng = random.Random(42)
+    labels = [db.create_label(f"Label {i}", "#FFFFFF")['id'] for i in range(3)]
+    contents = [db.create_content(f"Conteúdo {i}", rng.choice(labels))['id'] for i in range(20)]
+
+    # Traz parte das revisões para o passado, para que contem como pendentes hoje
+    conn = db._get_connection()
+    yesterday = to_day(datetime.now() - timedelta(days=1))
+    conn.execute("UPDATE reviews SET scheduled_day = ? WHERE id % 3 = 0", (yesterday,))
+    conn.commit()
+    conn.close()
+
+    review_types = ['next_day', 'one_week', 'one_month', 'three_months']
+    for _ in range(50):
+        content_id = rng.choice(contents)
+        if rng.random() < 0.7:
+            db.mark_review_completed(content_id, rng.choice(review_types))
+        else:
+            db.unmark_review_completed(content_id, rng.choice(review_types))
+
+    db.delete_content(contents.pop())
+    db.delete_label(db.create_label("Temporária", "#000000")['id'])
+
+    # Arquiva dois conteúdos e devolve um deles desmarcando uma revisão
+    db.mark_reviews_completed([[cid, t] for cid in contents[:2] for t in review_types])
+    assert db.archive_completed(older_than_days=-1)['archived'] >= 2
+    db.unmark_review_completed(contents[0], 'one_week')
+
+    today = to_day(datetime.now())
+    assert db.get_statistics() == _count_statistics(db, today)
+
+
+def test_banco_existente_inicializa_contadores(tmp_path):
+    """Um banco criado antes dos triggers tem os contadores calculados ao abrir."""
+    manager = DataManager(tmp_path)
+    label = manager.create_label("Biologia", "#00FF00")
+    manager.create_content("Citologia", label['id'])
+
+    conn = manager._get_connection()
+    conn.execute('DROP TABLE stats')
+    conn.execute('DROP TABLE review_pending_by_day')
+    conn.execute("DELETE FROM settings WHERE key = 'schema_stamp'")  # Banco de antes do carimbo
+    conn.commit()
+    conn.close()
+    manager.close()
+
+    reopened = DataManager(tmp_path)
+    stats = reopened.get_statistics()
+    assert stats['total_contents'] == 1
+    assert stats['total_labels'] == 1
+    assert stats['total_reviews'] == 4
+    reopened.close()
+
+
+def test_revisoes_orfas_removidas_ao_abrir(tmp_path):
+    """Revisões de conteúdos apagados antes da correção saem, e os contadores são refeitos."""
+    manager = DataManager(tmp_path)
+    label = manager.create_label("Física", "#0000FF")
+    kept = manager.create_content("Óptica", label['id'])
+    removed = manager.create_content("Ondas", label['id'])
+
+    # Como o delete_content antigo: o conteúdo sai e as revisões ficam
+    conn = manager._get_connection()
+    conn.execute('DELETE FROM contents WHERE id = ?', (removed['id'],))
+    conn.execute("UPDATE settings SET value = 'antigo' WHERE key = 'schema_stamp'")
+    conn.commit()
+    conn.close()
+    assert manager.get_statistics()['total_reviews'] == 8
+    manager.close()
+
+    reopened = DataManager(tmp_path)
+    today = to_day(datetime.now())
+    assert reopened.get_statistics() == _count_statistics(reopened, today)
+    assert reopened.get_statistics()['total_reviews'] == 4
+    conn = reopened._get_connection()
+    assert conn.execute('SELECT SUM(pending) FROM review_pending_by_day').fetchone()[0] == 4
+    assert [row[0] for row in conn.execute('SELECT DISTINCT content_id FROM reviews')] == [kept['id']]
+    conn.close()
+    reopened.close()
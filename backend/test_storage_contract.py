@@ -0,0 +1,201 @@
+"""
+Testes de contrato da interface Storage
+Os mesmos testes rodam no DataManager (arquivo e ':memory:') e no
+MemoryStorage; o último compara os resultados dos três, chamada a chamada.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from data_manager import DataManager
+from scheduler import FixedIntervalScheduler
+from storage import MemoryStorage, Storage
+
+
+class PastScheduler(FixedIntervalScheduler):
+    """Agenda revisões no passado e no mesmo dia, para testar atrasos e empates."""
+
+    OFFSETS = (-2, 0, 3, 3)
+
+
+ENGINES = {
+    'sqlite': lambda tmp_path: DataManager(tmp_path, scheduler=PastScheduler()),
+    'sqlite-memory': lambda tmp_path: DataManager(':memory:', scheduler=PastScheduler()),
+    'memory': lambda tmp_path: MemoryStorage(scheduler=PastScheduler()),
+}
+
+
+def _day(offset: int) -> str:
+    return (datetime.now().date() + timedelta(days=offset)).isoformat()
+
+
+@pytest.fixture(params=list(ENGINES))
+def storage(request, tmp_path):
+    engine = ENGINES[request.param](tmp_path)
+    yield engine
+    engine.close()
+
+
+def test_labels(storage: Storage):
+    """Nomes únicos, ordem por nome e label com conteúdos não pode ser apagada."""
+    physics = storage.create_label('Física', '#00FF00')
+    math = storage.create_label('Matemática', '#FFFF00')
+    assert storage.create_label('Física', '#000000') == {'error': 'Label já existe'}
+    assert [label['name'] for label in storage.get_all_labels()] == ['Física', 'Matemática']
+
+    assert storage.update_label(math['id'], 'Álgebra', '#123456') == {'success': True}
+    assert storage.update_label(math['id'], 'Física', '#123456') == {'error': 'Label já existe'}
+    assert storage.update_label(999, 'X', '#000000') == {'error': 'Label não encontrada'}
+    # Ordem binária, como no SQLite: 'Álgebra' vem depois de 'Física'
+    assert storage.get_all_labels()[1] == {**math, 'name': 'Álgebra', 'color': '#123456'}
+
+    storage.create_content('Newton', physics['id'])
+    assert storage.delete_label(physics['id']) == {
+        'error': 'Não é possível deletar. Existem 1 conteúdo(s) com esta label.'
+    }
+    assert storage.delete_label(math['id']) == {'success': True}
+    assert [label['name'] for label in storage.get_all_labels()] == ['Física']
+
+
+def test_conteudos(storage: Storage):
+    """Criação com as datas do agendador, listagem e alterações."""
+    label = storage.create_label('Matemática', '#FFFF00')
+    other = storage.create_label('Física', '#00FF00')
+    first = storage.create_content('Limites', label['id'])
+    second = storage.create_content('Derivadas', label['id'])
+    assert first['review_dates'] == {
+        'next_day': _day(-2), 'one_week': _day(0), 'one_month': _day(3), 'three_months': _day(3)
+    }
+
+    contents = storage.get_all_contents()
+    assert [content['id'] for content in contents] == [second['id'], first['id']]
+    assert contents[1] == storage.get_content_by_id(first['id'])
+    assert contents[1]['label_name'] == 'Matemática'
+    assert contents[1]['reviews']['one_month'] == {
+        'scheduled_date': _day(3), 'completed': False, 'completed_at': None
+    }
+    assert storage.get_content_by_id(999) is None
+
+    assert storage.update_content(first['id'], 'Integrais', other['id']) == {'success': True}
+    updated = storage.get_content_by_id(first['id'])
+    assert (updated['title'], updated['label_color']) == ('Integrais', '#00FF00')
+    assert updated['reviews'] == contents[1]['reviews']
+    assert storage.update_content(999, 'X', label['id']) == {'error': 'Conteúdo não encontrado'}
+
+    assert storage.delete_content(second['id']) == {'success': True}
+    assert storage.delete_content(second['id']) == {'error': 'Conteúdo não encontrado'}
+    assert storage.get_reviews_by_range(_day(-2), _day(3))[0]['title'] == 'Integrais'
+    assert len(storage.get_reviews_by_range(_day(-2), _day(3))) == 4
+    assert storage.delete_label(label['id']) == {'success': True}
+
+
+def test_revisoes_por_dia_e_intervalo(storage: Storage):
+    """Pendentes primeiro, depois por título; o intervalo ordena por dia."""
+    label = storage.create_label('Química', '#0000FF')
+    storage.create_content('Ácidos', label['id'])
+    base = storage.create_content('Bases', label['id'])
+    storage.mark_review_completed(base['id'], 'one_week')
+
+    today = storage.get_reviews_by_date()
+    assert [(review['title'], review['completed']) for review in today] == [('Ácidos', 0), ('Bases', 1)]
+    assert today[1]['review_type'] == 'one_week' and today[1]['scheduled_date'] == _day(0)
+    assert storage.get_reviews_by_date(_day(1)) == []
+    assert storage.get_reviews_by_date('amanhã') == {'error': 'Data inválida'}
+    for invalid in (5, [], {}):
+        assert storage.get_reviews_by_date(invalid) == {'error': 'Data inválida'}
+
+    reviews = storage.get_reviews_by_range(_day(-5), _day(5))
+    assert [review['scheduled_date'] for review in reviews] == [_day(-2)] * 2 + [_day(0)] * 2 + [_day(3)] * 4
+    assert reviews[2:4] == today
+    assert storage.get_reviews_by_range(_day(1), _day(0)) == {
+        'error': 'A data inicial deve ser anterior à final'
+    }
+
+    assert storage.get_review_summary(_day(-5), _day(5)) == {
+        _day(-2): {'pending': 2, 'completed': 0},
+        _day(0): {'pending': 1, 'completed': 1},
+        _day(3): {'pending': 4, 'completed': 0},
+    }
+    assert storage.get_review_summary('x', _day(0)) == {'error': 'Data inválida'}
+    assert storage.get_reviews_by_range(_day(0), 5) == {'error': 'Data inválida'}
+
+
+def test_marcar_e_estatisticas(storage: Storage):
+    """Os contadores acompanham marcações, desmarcações e exclusões."""
+    label = storage.create_label('História', '#FF0000')
+    content = storage.create_content('Império', label['id'])
+    storage.create_content('República', label['id'])
+    assert storage.get_statistics() == {
+        'total_contents': 2, 'total_labels': 1, 'pending_today': 4,
+        'completed_reviews': 0, 'total_reviews': 8, 'archived_contents': 0
+    }
+
+    result = storage.mark_review_completed(content['id'], 'next_day')
+    assert result['success'] and result['completed_at']
+    assert storage.get_content_by_id(content['id'])['reviews']['next_day']['completed'] is True
+    assert storage.mark_review_completed(content['id'], 'dois_dias') == {'error': 'Revisão não encontrada'}
+    assert storage.mark_review_completed(999, 'next_day') == {'error': 'Revisão não encontrada'}
+    stats = storage.get_statistics()
+    assert (stats['pending_today'], stats['completed_reviews']) == (3, 1)
+
+    assert storage.unmark_review_completed(content['id'], 'next_day') == {'success': True}
+    assert storage.get_content_by_id(content['id'])['reviews']['next_day']['completed_at'] is None
+    assert storage.get_statistics()['pending_today'] == 4
+
+    storage.mark_review_completed(content['id'], 'one_month')
+    storage.delete_content(content['id'])
+    stats = storage.get_statistics()
+    assert (stats['total_contents'], stats['total_reviews'], stats['completed_reviews']) == (1, 4, 0)
+
+
+def _normalize(value):
+    """Troca os horários (que variam entre as execuções) por 'tem/não tem'."""
+    if isinstance(value, dict):
+        return {
+            key: (item is not None) if key in ('created_at', 'completed_at') else _normalize(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def test_mesmos_resultados_nos_tres(tmp_path):
+    """Uma sequência de operações devolve o mesmo em todos os armazenamentos."""
+    engines = [factory(tmp_path) for factory in ENGINES.values()]
+    calls = [
+        ('create_label', 'Biologia', '#00AA00'),
+        ('create_label', 'Artes', '#AA00AA'),
+        *[('create_content', f'Tópico {index}', 1 + index % 2) for index in range(6)],
+        ('mark_review_completed', 2, 'next_day'),
+        ('mark_review_completed', 5, 'one_week'),
+        ('unmark_review_completed', 2, 'next_day'),
+        ('update_content', 3, 'Renomeado', 1),
+        ('update_label', 2, 'Música', '#FFFFFF'),
+        ('delete_content', 4),
+        ('get_all_labels',),
+        ('get_all_contents',),
+        ('get_content_by_id', 5),
+        ('get_reviews_by_date',),
+        ('get_reviews_by_range', _day(-3), _day(3)),
+        ('get_review_summary', _day(-3), _day(3)),
+        ('get_statistics',),
+        ('delete_label', 2),
+    ]
+    try:
+        for name, *args in calls:
+            results = [_normalize(getattr(engine, name)(*args)) for engine in engines]
+            assert results[0] == results[1] == results[2], name
+    finally:
+        for engine in engines:
+            engine.close()
+
+
+def test_armazenamento_incompleto_falha_ao_criar():
+    """Um armazenamento sem todos os métodos da interface nem chega a ser criado."""
+    class Parcial(Storage):
+        def close(self):
+            pass
+
+    with pytest.raises(TypeError, match='get_statistics'):
+        Parcial()
@@ -0,0 +1,84 @@
+"""
+Testes da fila de escrita (thread escritora única e group commit)
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from main import Backend
+from write_queue import WriteQueue
+
+
+def test_escritas_acumuladas_vao_em_um_commit(db):
+    """O que chega enquanto um grupo grava é confirmado junto no próximo."""
+    writes = WriteQueue(lambda: db.session(write=True))
+    label = db.create_label("Química", "#00FFFF")
+    started, gate = threading.Event(), threading.Event()
+
+    def block():
+        started.set()
+        return gate.wait(5)
+
+    first = writes.submit(block)
+    started.wait(5)  # O primeiro grupo já saiu da fila
+    futures = [writes.submit(db.create_content, f"Tópico {i}", label['id']) for i in range(10)]
+    gate.set()
+
+    assert first.result() is True
+    assert [future.result()['title'] for future in futures] == [f"Tópico {i}" for i in range(10)]
+    assert writes.stats() == {'operations': 11, 'groups': 2, 'largest_group': 10, 'pending': 0}
+    assert db.get_statistics()['total_contents'] == 10
+    writes.close()
+
+
+def test_falha_desfaz_so_a_operacao(db):
+    """Uma operação que falha não derruba as outras do mesmo grupo."""
+    writes = WriteQueue(lambda: db.session(write=True))
+    label = db.create_label("Física", "#00FF00")
+    gate = threading.Event()
+
+    def create_and_fail():
+        db.create_content("Desfeito", label['id'])
+        raise ValueError('falhou')
+
+    writes.submit(lambda: gate.wait(5))
+    failing = writes.submit(create_and_fail)
+    kept = writes.submit(db.create_content, "Mantido", label['id'])
+    gate.set()
+
+    with pytest.raises(ValueError):
+        failing.result()
+    assert kept.result()['title'] == "Mantido"
+    assert [c['title'] for c in db.get_all_contents()] == ["Mantido"]
+    writes.close()
+
+
+def test_close_grava_o_que_esta_na_fila(db):
+    """Fechar a fila executa as escritas pendentes e recusa novas."""
+    writes = WriteQueue(lambda: db.session(write=True))
+    futures = [writes.submit(db.create_label, f"L{i}", "#000000") for i in range(5)]
+    writes.close()
+
+    assert all(future.done() for future in futures)
+    assert len(db.get_all_labels()) == 5
+    with pytest.raises(RuntimeError):
+        writes.submit(db.create_label, "Depois", "#000000")
+
+
+def test_backend_com_escritas_concorrentes(tmp_path):
+    """Cliques simultâneos não dão 'database is locked' e leem a própria escrita."""
+    backend = Backend(tmp_path, profile=False)
+    label = backend.create_label("Biologia", "#00AA00")
+
+    def create_and_read(i):
+        created = backend.create_content(f"Célula {i}", label['id'])
+        return backend.get_content(created['id'])['title']
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        titles = list(pool.map(create_and_read, range(64)))
+
+    assert titles == [f"Célula {i}" for i in range(64)]
+    assert backend.get_statistics()['total_contents'] == 64
+    assert backend._writes.stats()['operations'] == 65
+    backend._shutdown()
@@ -0,0 +1,146 @@
+"""
+Write Queue - Fila de escritas com uma única thread escritora (write-behind)
+O pywebview executa cada chamada do js_api em uma thread própria; cliques
+rápidos viravam várias transações disputando o lock de escrita do SQLite,
+cada uma com o seu fsync. Aqui as escritas entram em uma fila e uma thread
+as executa: o que se acumulou enquanto a transação anterior confirmava vai
+junto na próxima (group commit), cada operação no seu savepoint.
+
+Quem chama recebe um Future resolvido depois do commit, então uma leitura
+feita após o resultado já vê a escrita.
+"""
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, ContextManager, Deque, Dict, List, Tuple
+
+
+class WriteQueue:
+    """Executa as escritas em ordem, em uma única thread, agrupando commits."""
+
+    def __init__(self, begin: Callable[[], ContextManager], max_group: int = 64):
+        """Cria a fila (a thread escritora só começa na primeira escrita).
+
+        Args:
+            begin: Abre a transação de um grupo; deve entregar um objeto com
+                savepoint() (ex.: lambda: db.session(write=True))
+            max_group: Máximo de operações confirmadas em um mesmo commit
+        """
+        self._begin = begin
+        self.max_group = max_group
+        self._items: Deque[Tuple[Future, Callable, tuple, Dict, bool]] = deque()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._closed = False
+        self._stats = {'operations': 0, 'groups': 0, 'largest_group': 0}
+
+    def submit(self, func: Callable, *args, exclusive: bool = False, **kwargs) -> Future:
+        """Enfileira func(*args, **kwargs) e retorna o Future do resultado.
+
+        Args:
+            exclusive: Roda sozinha e fora da transação do grupo (para
+                operações que controlam as próprias transações, como importações)
+        """
+        future = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError('Fila de escrita fechada')
+            self._items.append((future, func, args, kwargs, exclusive))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='methodjs-writer', daemon=True)
+                self._thread.start()
+            self._condition.notify()
+        return future
+
+    def run(self, func: Callable, *args, exclusive: bool = False, **kwargs):
+        """Executa pela fila e espera o commit; na própria thread escritora, executa direto."""
+        if threading.current_thread() is self._thread:
+            return func(*args, **kwargs)  # Ex.: métodos chamados de dentro de um batch
+        return self.submit(func, *args, exclusive=exclusive, **kwargs).result()
+
+    # ==================== THREAD ESCRITORA ====================
+
+    def _next_group(self) -> List[Tuple]:
+        """Espera e retira o próximo grupo (ou [] quando a fila fecha vazia)."""
+        with self._condition:
+            while not self._items and not self._closed:
+                self._condition.wait()
+            if not self._items:
+                return []
+            group = [self._items.popleft()]
+            if group[0][4]:
+                return group  # Exclusiva: sempre sozinha
+            while self._items and len(group) < self.max_group and not self._items[0][4]:
+                group.append(self._items.popleft())
+            return group
+
+    def _run(self):
+        while True:
+            group = self._next_group()
+            if not group:
+                return
+            if group[0][4]:
+                self._run_exclusive(group[0])
+            else:
+                self._run_group(group)
+
+    def _run_exclusive(self, item: Tuple):
+        future, func, args, kwargs, _ = item
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as error:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+        self._count(1)
+
+    def _run_group(self, group: List[Tuple]):
+        group = [item for item in group if item[0].set_running_or_notify_cancel()]
+        if not group:
+            return
+
+        outcomes = []
+        try:
+            with self._begin() as session:
+                for future, func, args, kwargs, _ in group:
+                    try:
+                        with session.savepoint():
+                            outcomes.append((True, func(*args, **kwargs)))
+                    except Exception as error:
+                        outcomes.append((False, error))  # Só esta operação é desfeita
+        except BaseException as error:
+            # Sem commit: nenhuma operação do grupo foi gravada
+            for future, *_ in group:
+                future.set_exception(error)
+            return
+
+        for (future, *_), (ok, value) in zip(group, outcomes):
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+        self._count(len(group))
+
+    def _count(self, operations: int):
+        with self._condition:
+            self._stats['operations'] += operations
+            self._stats['groups'] += 1
+            self._stats['largest_group'] = max(self._stats['largest_group'], operations)
+
+    # ==================== CONTROLE ====================
+
+    def stats(self) -> Dict:
+        """Operações executadas, commits (grupos) e o maior grupo até agora."""
+        with self._condition:
+            return {**self._stats, 'pending': len(self._items)}
+
+    def close(self, timeout: float = None):
+        """Executa o que já está na fila e para a thread escritora."""
+        with self._condition:
+            self._closed = True
+            thread = self._thread
+            self._condition.notify()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
@@ -27,8 +27,17 @@ hiddenimports = [
     'pythonnet',
 ]
 
-# Coletar submódulos do webview
-hiddenimports += collect_submodules('webview')
+# Coletar submódulos do webview, exceto as plataformas que não rodam no
+# Windows (menos arquivos para extrair a cada abertura do executável)
+hiddenimports += collect_submodules(
+    'webview',
+    filter=lambda name: not name.startswith((
+        'webview.platforms.android',
+        'webview.platforms.cocoa',
+        'webview.platforms.gtk',
+        'webview.platforms.qt',
+    ))
+)
 
 a = Analysis(
     [os.path.join(backend_path, 'main.py')],
@@ -4,6 +4,9 @@ declare global {
   interface Window {
     pywebview?: {
       api: {
+        // Batch
+        batch(calls: { method: string; args?: unknown[] }[]): Promise<any>
+
         // Labels
         create_label(name: string, color: string): Promise<any>
         get_labels(): Promise<any[]>
@@ -12,19 +15,64 @@ declare global {
         
         // Contents
         create_content(title: string, label_id: number): Promise<any>
-        get_contents(): Promise<any[]>
-        get_content(content_id: number): Promise<any>
+        get_contents(include_archived?: boolean, columnar?: boolean): Promise<any>
+        get_contents_page(
+          cursor: string | null,
+          limit: number,
+          label_id: number | null,
+          date_from: string | null,
+          date_to: string | null,
+          columnar?: boolean
+        ): Promise<any>
+        get_content(content_id: number, include_archived?: boolean): Promise<any>
+        import_contents(items: any[]): Promise<any>
+        import_contents_file(path: string): Promise<any>
+        get_import_progress(): Promise<any>
+        search_contents(
+          query: string,
+          limit: number,
+          label_id: number | null
+        ): Promise<any[]>
         update_content(content_id: number, title: string, label_id: number): Promise<any>
         delete_content(content_id: number): Promise<any>
         
         // Reviews
-        get_reviews_today(): Promise<any[]>
-        get_reviews_by_date(date: string): Promise<any[]>
+        get_reviews_today(columnar?: boolean): Promise<any>
+        get_reviews_by_date(date: string, columnar?: boolean): Promise<any>
+        get_reviews_by_range(start: string, end: string, columnar?: boolean): Promise<any>
+        get_review_summary(start: string, end: string): Promise<any>
+        get_overdue_reviews(
+          cursor: string | null,
+          limit: number,
+          label_id: number | null,
+          columnar?: boolean
+        ): Promise<any>
         mark_review_completed(content_id: number, review_type: string): Promise<any>
         unmark_review_completed(content_id: number, review_type: string): Promise<any>
+        mark_reviews_completed(pairs: [number, string][]): Promise<any[]>
+        unmark_reviews_completed(pairs: [number, string][]): Promise<any[]>
+        mark_reviews_completed_by_date(date: string | null): Promise<any>
+        unmark_reviews_completed_by_date(date: string | null): Promise<any>
+        
+        // Scheduling
+        get_schedulers(): Promise<any[]>
+        set_scheduler(name: string): Promise<any>
+        reschedule_reviews(): Promise<any>
+        set_load_balancing(daily_cap: number | null): Promise<any>
+        get_review_forecast(days?: number): Promise<any>
+        archive_completed(): Promise<any>
+        backup_database(path?: string | null): Promise<any>
+        export_data(path: string): Promise<any>
+        restore_data(path: string): Promise<any>
+        
+        // Profiles
+        get_profiles(): Promise<any>
+        create_profile(name: string): Promise<any>
+        switch_profile(name: string): Promise<any>
         
         // Statistics
         get_statistics(): Promise<any>
+        get_all_statistics(): Promise<any>
       }
     }
   }
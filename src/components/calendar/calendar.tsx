@@ -17,7 +17,7 @@ import { Check, ChevronLeft, ChevronRight, X } from 'lucide-react'
 import { useEffect, useState } from 'react'
 import { toast } from 'sonner'
 
-import { api, type Review } from '@/lib/api'
+import { api, type Review, type ReviewSummary } from '@/lib/api'
 
 import { Button } from '../ui/button'
 import {
@@ -40,6 +40,7 @@ export function Calendar() {
   const [reviews, setReviews] = useState<Review[]>([])
   const [isLoadingReviews, setIsLoadingReviews] = useState(false)
   const [isDialogOpen, setIsDialogOpen] = useState(false)
+  const [summary, setSummary] = useState<ReviewSummary>({})
 
   const startOfCurrentMonth = startOfMonth(currentDate)
   const endOfCurrentMonth = endOfMonth(currentDate)
@@ -79,6 +80,16 @@ export function Calendar() {
         )
       : []
 
+  // Intervalo visível na grade do mês (inclui dias dos meses vizinhos)
+  const visibleStart = format(
+    daysFromPreviousMonth[0] ?? startOfCurrentMonth,
+    'yyyy-MM-dd',
+  )
+  const visibleEnd = format(
+    daysFromNextMonth[daysFromNextMonth.length - 1] ?? endOfCurrentMonth,
+    'yyyy-MM-dd',
+  )
+
   function switchViewCalendar({ viewCase }: viewCalendarProps) {
     setView(viewCase)
   }
@@ -90,6 +101,83 @@ export function Calendar() {
     }
   }, [selectedDate, isDialogOpen])
 
+  // Carrega o resumo de revisões de todos os dias visíveis em uma chamada
+  useEffect(() => {
+    loadSummary()
+  }, [visibleStart, visibleEnd])
+
+  // Aplica os deltas do Python em vez de buscar a lista do dia de novo
+  useEffect(() => {
+    return api.onChanges((events) => {
+      let summaryChanged = false
+
+      for (const event of events) {
+        if (event.entity === 'review') {
+          const change = event.data
+          setReviews((current) =>
+            current.map((review) =>
+              review.content_id === change.content_id &&
+              review.review_type === change.review_type
+                ? {
+                    ...review,
+                    completed: change.completed,
+                    completed_at: change.completed_at ?? undefined,
+                  }
+                : review,
+            ),
+          )
+          summaryChanged = true
+        } else if (event.entity === 'content') {
+          if (event.type === 'removed') {
+            setReviews((current) =>
+              current.filter((review) => review.content_id !== event.id),
+            )
+          } else if (event.type === 'changed' && event.data) {
+            const content = event.data
+            setReviews((current) =>
+              current.map((review) =>
+                review.content_id === content.id
+                  ? {
+                      ...review,
+                      title: content.title,
+                      label_id: content.label_id,
+                      label_name: content.label_name ?? review.label_name,
+                      label_color: content.label_color ?? review.label_color,
+                    }
+                  : review,
+              ),
+            )
+          }
+          summaryChanged = true
+        } else if (event.entity === 'contents') {
+          summaryChanged = true
+        }
+      }
+
+      if (summaryChanged) loadSummary()
+    })
+  }, [visibleStart, visibleEnd])
+
+  async function loadSummary() {
+    try {
+      const data = await api.getReviewSummary(visibleStart, visibleEnd)
+      setSummary(data)
+    } catch (error) {
+      console.error('Erro ao carregar resumo de revisões:', error)
+    }
+  }
+
+  function renderPendingBadge(day: Date) {
+    const pending = summary[format(day, 'yyyy-MM-dd')]?.pending
+    if (!pending) return null
+
+    return (
+      <span className="rounded-full bg-blue-600 px-1.5 text-xs text-white">
+        {pending}
+      </span>
+    )
+  }
+
   async function loadReviews() {
     if (!selectedDate) return
 
@@ -115,7 +203,6 @@ export function Calendar() {
 
       if (result?.success) {
         toast.success('Revisão marcada como completa!')
-        loadReviews()
       } else {
         toast.error(result?.error || 'Erro ao marcar revisão')
       }
@@ -134,7 +221,6 @@ export function Calendar() {
 
       if (result?.success) {
         toast.success('Revisão desmarcada com sucesso!')
-        loadReviews()
       } else {
         toast.error(result?.error || 'Erro ao desmarcar revisão')
       }
@@ -144,6 +230,25 @@ export function Calendar() {
     }
   }
 
+  async function handleMarkAllAsReviewed() {
+    if (!selectedDate) return
+
+    try {
+      const result = await api.markReviewsCompletedByDate(
+        format(selectedDate, 'yyyy-MM-dd'),
+      )
+
+      if (result && !result.error) {
+        toast.success(`${result.updated} revisão(ões) marcada(s) como completa(s)!`)
+      } else {
+        toast.error(result?.error || 'Erro ao marcar revisões')
+      }
+    } catch (error) {
+      console.error('Erro ao marcar revisões:', error)
+      toast.error('Erro ao marcar revisões')
+    }
+  }
+
   function handleDayClick(day: Date) {
     setSelectedDate(day)
     setIsDialogOpen(true)
@@ -229,81 +334,93 @@ export function Calendar() {
                     Nenhuma revisão pendente para esta data.
                   </p>
                 ) : (
-                  <ul className="flex list-inside list-none flex-col gap-3">
-                    {reviews.map((review) => (
-                      <li
-                        key={`${review.content_id}-${review.review_type}`}
-                        className="flex flex-col gap-2 rounded-md border p-3"
+                  <div className="flex flex-col gap-3">
+                    {reviews.some((review) => !review.completed) && (
+                      <Button
+                        size="sm"
+                        onClick={handleMarkAllAsReviewed}
+                        className="flex items-center gap-1 self-end cursor-pointer"
                       >
-                        <div className="flex items-center gap-2">
-                          <span
-                            className="rounded px-2 py-1 text-xs font-semibold text-white"
-                            style={{ backgroundColor: review.label_color }}
-                          >
-                            {review.label_name}
-                          </span>
-                          <span className="flex-1 font-medium">
-                            {review.title}
-                          </span>
-                        </div>
-                        <div className="flex items-center gap-2 text-sm text-muted-foreground">
-                          <span className="capitalize">
-                            {review.review_type === 'next_day' && 'Dia seguinte'}
-                            {review.review_type === 'one_week' && '1 semana'}
-                            {review.review_type === 'one_month' && '1 mês'}
-                            {review.review_type === 'three_months' &&
-                              '3 meses'}
-                          </span>
-                          <span>•</span>
-                          <span>
-                            {review.scheduled_date.split('-').reverse().join('/')}
-                          </span>
-                        </div>
-                        <div className="flex gap-2">
-                          {!review.completed ? (
-                            <Button
-                              size="sm"
-                              onClick={() =>
-                                handleMarkAsReviewed(
-                                  review.content_id,
-                                  review.review_type,
-                                )
-                              }
-                              className="flex items-center gap-1 cursor-pointer"
+                        <Check className="size-4" />
+                        Marcar todas como revisadas
+                      </Button>
+                    )}
+                    <ul className="flex list-inside list-none flex-col gap-3">
+                      {reviews.map((review) => (
+                        <li
+                          key={`${review.content_id}-${review.review_type}`}
+                          className="flex flex-col gap-2 rounded-md border p-3"
+                        >
+                          <div className="flex items-center gap-2">
+                            <span
+                              className="rounded px-2 py-1 text-xs font-semibold text-white"
+                              style={{ backgroundColor: review.label_color }}
                             >
-                              <Check className="size-4" />
-                              Marcar como revisado
-                            </Button>
-                          ) : (
-                            <div className="flex items-center justify-between gap-2">
-                              <span className="text-sm text-green-600">
-                                ✓ Revisado em{' '}
-                                {review.completed_at &&
-                                  format(
-                                    new Date(review.completed_at),
-                                    "dd/MM/yyyy 'às' HH:mm",
-                                  )}
-                              </span>
+                              {review.label_name}
+                            </span>
+                            <span className="flex-1 font-medium">
+                              {review.title}
+                            </span>
+                          </div>
+                          <div className="flex items-center gap-2 text-sm text-muted-foreground">
+                            <span className="capitalize">
+                              {review.review_type === 'next_day' && 'Dia seguinte'}
+                              {review.review_type === 'one_week' && '1 semana'}
+                              {review.review_type === 'one_month' && '1 mês'}
+                              {review.review_type === 'three_months' &&
+                                '3 meses'}
+                            </span>
+                            <span>•</span>
+                            <span>
+                              {review.scheduled_date.split('-').reverse().join('/')}
+                            </span>
+                          </div>
+                          <div className="flex gap-2">
+                            {!review.completed ? (
                               <Button
                                 size="sm"
-                                variant="outline"
                                 onClick={() =>
-                                  handleUnmarkReview(
+                                  handleMarkAsReviewed(
                                     review.content_id,
                                     review.review_type,
                                   )
                                 }
                                 className="flex items-center gap-1 cursor-pointer"
                               >
-                                <X className="size-4" />
-                                Desmarcar
+                                <Check className="size-4" />
+                                Marcar como revisado
                               </Button>
-                            </div>
-                          )}
-                        </div>
-                      </li>
-                    ))}
-                  </ul>
+                            ) : (
+                              <div className="flex items-center justify-between gap-2">
+                                <span className="text-sm text-green-600">
+                                  ✓ Revisado em{' '}
+                                  {review.completed_at &&
+                                    format(
+                                      new Date(review.completed_at),
+                                      "dd/MM/yyyy 'às' HH:mm",
+                                    )}
+                                </span>
+                                <Button
+                                  size="sm"
+                                  variant="outline"
+                                  onClick={() =>
+                                    handleUnmarkReview(
+                                      review.content_id,
+                                      review.review_type,
+                                    )
+                                  }
+                                  className="flex items-center gap-1 cursor-pointer"
+                                >
+                                  <X className="size-4" />
+                                  Desmarcar
+                                </Button>
+                              </div>
+                            )}
+                          </div>
+                        </li>
+                      ))}
+                    </ul>
+                  </div>
                 )}
               </div>
             </DialogDescription>
@@ -320,6 +437,7 @@ export function Calendar() {
                   className="text-muted-foreground"
                 >
                   {format(day, 'd')}
+                  {renderPendingBadge(day)}
                 </Button>
               </DialogTrigger>
             ))}
@@ -335,6 +453,7 @@ export function Calendar() {
                   }`}
                 >
                   {format(day, 'd')}
+                  {renderPendingBadge(day)}
                 </Button>
               </DialogTrigger>
             ))}
@@ -348,6 +467,7 @@ export function Calendar() {
                   className="text-muted-foreground cursor-pointer"
                 >
                   {format(day, 'd')}
+                  {renderPendingBadge(day)}
                 </Button>
               </DialogTrigger>
             ))}
@@ -365,6 +485,7 @@ export function Calendar() {
                   }`}
                 >
                   {format(day, 'd')}
+                  {renderPendingBadge(day)}
                 </Button>
               </DialogTrigger>
             ))}
@@ -17,6 +17,8 @@ export interface Content {
   created_at: string
   label_name?: string
   label_color?: string
+  // Só nos conteúdos lidos do arquivo (include_archived)
+  archived?: boolean
   reviews?: {
     next_day?: ReviewStatus
     one_week?: ReviewStatus
@@ -25,6 +27,49 @@ export interface Content {
   }
 }
 
+export interface ContentsPage {
+  items: Content[]
+  next_cursor: string | null
+  error?: string
+}
+
+export interface ContentsPageParams {
+  cursor?: string | null
+  limit?: number
+  labelId?: number | null
+  dateFrom?: string | null
+  dateTo?: string | null
+}
+
+export interface OverduePage {
+  // Mais antigas primeiro
+  items: Review[]
+  next_cursor: string | null
+  // Só na primeira página
+  total: number | null
+  error?: string
+}
+
+export interface ImportItem {
+  title: string
+  label_id?: number
+  label?: string
+  label_color?: string
+  created_at?: string
+}
+
+export interface ImportResult {
+  created: number
+  labels_created: number
+  errors: { index: number; error: string }[]
+  error?: string
+}
+
+export interface ImportProgress {
+  running: boolean
+  created: number
+}
+
 export interface ReviewStatus {
   scheduled_date: string
   completed: boolean
@@ -45,12 +90,205 @@ export interface Review {
   created_at: string
 }
 
+export interface DaySummary {
+  pending: number
+  completed: number
+}
+
+export type ReviewSummary = Record<string, DaySummary>
+
+export interface BatchCall {
+  method: string
+  args?: unknown[]
+}
+
+export type BatchResult<T = unknown> =
+  | { result: T; error?: undefined }
+  | { result?: undefined; error: string }
+
+export type ReviewPair = [number, Review['review_type']]
+
+export type ReviewPairResult =
+  | {
+      success: true
+      content_id: number
+      review_type: Review['review_type']
+      completed_at?: string
+      error?: undefined
+    }
+  | { success?: undefined; error: string }
+
+export interface DayCompletionResult {
+  updated: number
+  reviews: { content_id: number; review_type: Review['review_type'] }[]
+  completed_at?: string
+  error?: string
+}
+
+export interface SchedulerInfo {
+  name: 'fixed' | 'sm2'
+  description: string
+  active: boolean
+}
+
+export interface RescheduleResult {
+  scheduler: SchedulerInfo['name']
+  updated: number
+  contents: number
+}
+
+// Alterações enviadas pelo Python (evento 'methodjs:changes' na window)
+export type ChangeType = 'added' | 'changed' | 'removed'
+
+export interface ReviewChange {
+  content_id: number
+  review_type: Review['review_type']
+  scheduled_date?: string
+  completed: boolean
+  completed_at?: string | null
+}
+
+export type ChangeEvent =
+  | { type: ChangeType; entity: 'label'; id: number; data: Label | null }
+  | { type: ChangeType; entity: 'content'; id: number; data: Content | null }
+  | { type: 'changed'; entity: 'review'; id: string; data: ReviewChange }
+  | { type: 'changed'; entity: 'contents'; id: null; data: { reload: true } }
+  // Perfil trocado: tudo vem de outro banco
+  | { type: 'changed'; entity: 'profile'; id: null; data: { name: string } }
+  | { type: 'changed'; entity: 'stats'; id: null; data: Statistics | null }
+
+export const CHANGES_EVENT = 'methodjs:changes'
+
 export interface Statistics {
   total_contents: number
   total_labels: number
   pending_today: number
   completed_reviews: number
   total_reviews: number
+  // Já incluídos em total_contents
+  archived_contents: number
+}
+
+export interface Profiles {
+  active: string
+  // 'default' primeiro
+  profiles: string[]
+}
+
+export interface ProfileResult {
+  name: string
+  error?: string
+}
+
+export interface AllStatistics {
+  profiles: Record<string, Statistics>
+  total: Statistics
+}
+
+export interface ReviewForecast {
+  overdue: number
+  days: { date: string; pending: number }[]
+  peak: { date: string; pending: number } | null
+  daily_cap: number | null
+  error?: string
+}
+
+export interface BackupResult {
+  path: string
+  bytes: number
+  pages: number
+  seconds: number
+  error?: string
+}
+
+// Registros por tipo (export_data) ou gravados (restore_data)
+export type TransferResult = Record<string, number> & { error?: string }
+
+export interface ArchiveResult {
+  archived: number
+  reviews: number
+}
+
+// Formato colunar das listagens grandes (ver backend/columnar.py): nomes das
+// colunas uma vez, um array por coluna, labels em uma tabela e datas como
+// diferença de dias para o valor anterior
+export interface ColumnarPayload {
+  format: 'columnar/1'
+  length: number
+  columns: string[]
+  data: unknown[][]
+  labels: [number, string, string][]
+  deltas: string[]
+  enums: Record<string, string[]>
+  // Nessas colunas, null = chave ausente na linha
+  optional: string[]
+  // Linhas sem a chave, nas colunas que também têm null de verdade
+  missing: Record<string, number[]>
+}
+
+const DAY_MS = 24 * 60 * 60 * 1000
+
+export function isColumnar(value: unknown): value is ColumnarPayload {
+  return (
+    typeof value === 'object' &&
+    value !== null &&
+    (value as ColumnarPayload).format === 'columnar/1'
+  )
+}
+
+// Reconstrói a lista de objetos (mesmo resultado da chamada sem columnar)
+export function decodeColumnar<T>(payload: ColumnarPayload): T[] {
+  const rows: Record<string, unknown>[] = Array.from(
+    { length: payload.length },
+    () => ({}),
+  )
+  const deltas = new Set(payload.deltas)
+  const optional = new Set(payload.optional)
+
+  payload.columns.forEach((name, column) => {
+    let values = payload.data[column]
+    if (deltas.has(name)) {
+      let day = 0
+      values = values.map((value) => {
+        if (value === null) return null
+        day += value as number
+        return new Date(day * DAY_MS).toISOString().slice(0, 10)
+      })
+    } else if (payload.enums[name]) {
+      const table = payload.enums[name]
+      values = values.map((value) =>
+        value === null ? null : table[value as number],
+      )
+    }
+
+    const missing = new Set(payload.missing[name] ?? [])
+    const path = name.split('.')
+    const leaf = path[path.length - 1]
+    values.forEach((value, index) => {
+      if ((value === null && optional.has(name)) || missing.has(index)) return
+      const row = rows[index]
+      if (name === 'label') {
+        const [id, labelName, color] = payload.labels[value as number]
+        row.label_id = id
+        row.label_name = labelName
+        row.label_color = color
+        return
+      }
+      let target = row
+      for (const key of path.slice(0, -1)) {
+        if (target[key] === undefined) target[key] = {}
+        target = target[key] as Record<string, unknown>
+      }
+      target[leaf] = value
+    })
+  })
+  return rows as T[]
+}
+
+// Listas pedidas com columnar=true chegam compactadas; erros chegam como estão
+function decodeList<T>(result: T[] | ColumnarPayload | null): T[] {
+  if (isColumnar(result)) return decodeColumnar<T>(result)
+  return Array.isArray(result) ? result : []
 }
 
 // Classe API para gerenciar chamadas ao backend
@@ -109,6 +347,25 @@ class PythonAPI {
     }
   }
 
+  // ==================== CHANGES ====================
+
+  // Recebe os deltas enviados pelo Python; retorna a função que cancela
+  onChanges(handler: (events: ChangeEvent[]) => void): () => void {
+    const listener = (event: Event) => {
+      handler((event as CustomEvent<{ events: ChangeEvent[] }>).detail.events)
+    }
+    window.addEventListener(CHANGES_EVENT, listener)
+    return () => window.removeEventListener(CHANGES_EVENT, listener)
+  }
+
+  // ==================== BATCH ====================
+
+  // Várias chamadas em uma única travessia da ponte do pywebview
+  async batch(calls: BatchCall[]): Promise<BatchResult[]> {
+    const result = await this.call<BatchResult[]>('batch', calls)
+    return result || []
+  }
+
   // ==================== LABELS ====================
 
   async createLabel(name: string, color: string): Promise<Label | null> {
@@ -140,13 +397,60 @@ class PythonAPI {
     return this.call<Content>('create_content', title, labelId)
   }
 
-  async getContents(): Promise<Content[]> {
-    const result = await this.call<Content[]>('get_contents')
+  async getContents(includeArchived = false): Promise<Content[]> {
+    const result = await this.call<Content[] | ColumnarPayload>(
+      'get_contents',
+      includeArchived,
+      true,
+    )
+    return decodeList(result)
+  }
+
+  async getContentsPage({
+    cursor = null,
+    limit = 50,
+    labelId = null,
+    dateFrom = null,
+    dateTo = null,
+  }: ContentsPageParams = {}): Promise<ContentsPage> {
+    const result = await this.call<
+      Omit<ContentsPage, 'items'> & { items?: Content[] | ColumnarPayload }
+    >('get_contents_page', cursor, limit, labelId, dateFrom, dateTo, true)
+    if (!result) return { items: [], next_cursor: null }
+    return { ...result, items: decodeList(result.items ?? null) }
+  }
+
+  async importContents(items: ImportItem[]): Promise<ImportResult | null> {
+    return this.call<ImportResult>('import_contents', items)
+  }
+
+  async importContentsFile(path: string): Promise<ImportResult | null> {
+    return this.call<ImportResult>('import_contents_file', path)
+  }
+
+  async getImportProgress(): Promise<ImportProgress | null> {
+    return this.call<ImportProgress>('get_import_progress')
+  }
+
+  async searchContents(
+    query: string,
+    limit = 20,
+    labelId: number | null = null,
+  ): Promise<Content[]> {
+    const result = await this.call<Content[]>(
+      'search_contents',
+      query,
+      limit,
+      labelId,
+    )
     return result || []
   }
 
-  async getContent(contentId: number): Promise<Content | null> {
-    return this.call<Content>('get_content', contentId)
+  async getContent(
+    contentId: number,
+    includeArchived = false,
+  ): Promise<Content | null> {
+    return this.call<Content>('get_content', contentId, includeArchived)
   }
 
   async updateContent(
@@ -166,13 +470,52 @@ class PythonAPI {
   // ==================== REVIEWS ====================
 
   async getReviewsToday(): Promise<Review[]> {
-    const result = await this.call<Review[]>('get_reviews_today')
-    return result || []
+    const result = await this.call<Review[] | ColumnarPayload>(
+      'get_reviews_today',
+      true,
+    )
+    return decodeList(result)
   }
 
   async getReviewsByDate(date: string): Promise<Review[]> {
-    const result = await this.call<Review[]>('get_reviews_by_date', date)
-    return result || []
+    const result = await this.call<Review[] | ColumnarPayload>(
+      'get_reviews_by_date',
+      date,
+      true,
+    )
+    return decodeList(result)
+  }
+
+  // Revisões pendentes até hoje, paginadas (passe next_cursor para continuar)
+  async getOverdueReviews(
+    cursor: string | null = null,
+    limit = 50,
+    labelId: number | null = null,
+  ): Promise<OverduePage> {
+    const result = await this.call<
+      Omit<OverduePage, 'items'> & { items?: Review[] | ColumnarPayload }
+    >('get_overdue_reviews', cursor, limit, labelId, true)
+    if (!result) return { items: [], next_cursor: null, total: null }
+    return { ...result, items: decodeList(result.items ?? null) }
+  }
+
+  async getReviewsByRange(start: string, end: string): Promise<Review[]> {
+    const result = await this.call<Review[] | ColumnarPayload>(
+      'get_reviews_by_range',
+      start,
+      end,
+      true,
+    )
+    return decodeList(result)
+  }
+
+  async getReviewSummary(start: string, end: string): Promise<ReviewSummary> {
+    const result = await this.call<ReviewSummary>(
+      'get_review_summary',
+      start,
+      end,
+    )
+    return result || {}
   }
 
   async markReviewCompleted(
@@ -189,8 +532,119 @@ class PythonAPI {
     return this.call('unmark_review_completed', contentId, reviewType)
   }
 
+  // Várias revisões em uma única chamada e um único commit
+  async markReviewsCompleted(pairs: ReviewPair[]): Promise<ReviewPairResult[]> {
+    const result = await this.call<ReviewPairResult[]>(
+      'mark_reviews_completed',
+      pairs,
+    )
+    return result || []
+  }
+
+  async unmarkReviewsCompleted(
+    pairs: ReviewPair[],
+  ): Promise<ReviewPairResult[]> {
+    const result = await this.call<ReviewPairResult[]>(
+      'unmark_reviews_completed',
+      pairs,
+    )
+    return result || []
+  }
+
+  // Todas as revisões pendentes do dia (padrão: hoje)
+  async markReviewsCompletedByDate(
+    date?: string,
+  ): Promise<DayCompletionResult | null> {
+    return this.call<DayCompletionResult>(
+      'mark_reviews_completed_by_date',
+      date ?? null,
+    )
+  }
+
+  async unmarkReviewsCompletedByDate(
+    date?: string,
+  ): Promise<DayCompletionResult | null> {
+    return this.call<DayCompletionResult>(
+      'unmark_reviews_completed_by_date',
+      date ?? null,
+    )
+  }
+
+  // ==================== SCHEDULING ====================
+
+  async getSchedulers(): Promise<SchedulerInfo[]> {
+    const result = await this.call<SchedulerInfo[]>('get_schedulers')
+    return result || []
+  }
+
+  async setScheduler(
+    name: SchedulerInfo['name'],
+  ): Promise<{ success: boolean; scheduler: string; error?: string } | null> {
+    return this.call('set_scheduler', name)
+  }
+
+  // Limita as revisões novas por dia (null desliga); vale para criações e importações
+  async setLoadBalancing(
+    dailyCap: number | null,
+  ): Promise<{ success: boolean; daily_cap: number | null; error?: string } | null> {
+    return this.call('set_load_balancing', dailyCap)
+  }
+
+  // Revisões pendentes por dia nos próximos `days` dias
+  async getReviewForecast(days = 30): Promise<ReviewForecast | null> {
+    return this.call<ReviewForecast>('get_review_forecast', days)
+  }
+
+  // Recalcula as datas de todas as revisões pendentes com o algoritmo atual
+  async rescheduleReviews(): Promise<RescheduleResult | null> {
+    return this.call<RescheduleResult>('reschedule_reviews')
+  }
+
+  // ==================== ARCHIVE ====================
+
+  // O backend também arquiva sozinho a cada poucas horas
+  async archiveCompleted(): Promise<ArchiveResult | null> {
+    return this.call<ArchiveResult>('archive_completed')
+  }
+
+  // ==================== BACKUP ====================
+
+  // Sem caminho, grava em Documents/MethodJS/backups (mantém as 7 mais novas)
+  async backupDatabase(path?: string): Promise<BackupResult | null> {
+    return this.call<BackupResult>('backup_database', path ?? null)
+  }
+
+  async exportData(path: string): Promise<TransferResult | null> {
+    return this.call<TransferResult>('export_data', path)
+  }
+
+  // Só em um banco vazio
+  async restoreData(path: string): Promise<TransferResult | null> {
+    return this.call<TransferResult>('restore_data', path)
+  }
+
+  // ==================== PROFILES ====================
+
+  async getProfiles(): Promise<Profiles | null> {
+    return this.call<Profiles>('get_profiles')
+  }
+
+  // Nome: letras, números e . _ - @ (ex.: o e-mail do login)
+  async createProfile(name: string): Promise<ProfileResult | null> {
+    return this.call<ProfileResult>('create_profile', name)
+  }
+
+  async switchProfile(name: string): Promise<ProfileResult | null> {
+    return this.call<ProfileResult>('switch_profile', name)
+  }
+
   // ==================== STATISTICS ====================
 
+  // Soma de todos os perfis
+  async getAllStatistics(): Promise<AllStatistics | null> {
+    return this.call<AllStatistics>('get_all_statistics')
+  }
+
   async getStatistics(): Promise<Statistics | null> {
     return this.call<Statistics>('get_statistics')
   }